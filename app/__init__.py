@@ -28,17 +28,29 @@ def create_app(environment="development"):
     from app.blueprints import register_blueprints
     from app.models.user import Admin, Mentor, Student
     from app.models import storage
+    from app.utils.query_profiler import init_query_profiling
+    from app.utils.user_cache import init_user_cache, load_user
     
     @jwt.user_lookup_loader
     def user_loader_callback(_jwt_header, jwt_data):
         identity = jwt_data["sub"]
+        user = None
         if identity['role'] == 'admin':
-            return Admin.search(id=identity['id'])
+            user = load_user(Admin, 'admin', identity['id'])
         elif identity['role'] == 'mentor':
-            return Mentor.search(id=identity['id'])
+            user = load_user(Mentor, 'mentor', identity['id'])
         elif identity['role'] == 'student':
-            return Student.search(id=identity['id'])
-        return None
+            user = load_user(Student, 'student', identity['id'])
+        if user is None:
+            return None
+        # a refresh token survives claim changes, /refresh re-reads them,
+        # but not a password change or suspension (see User.end_sessions)
+        if jwt_data["type"] == "refresh":
+            return user if jwt_data.get("sver", 0) == user.session_version else None
+        # claims signed before the user last changed are no longer trusted
+        if jwt_data.get("ver", 0) != user.token_version:
+            return None
+        return user
     
     @app.before_request
     def create_session():
@@ -54,5 +66,7 @@ def create_app(environment="development"):
         except InterfaceError:
             print("Error with closing database session")
 
+    init_query_profiling(app)
+    init_user_cache(app)
     register_blueprints(app)
     return app
\ No newline at end of file
@@ -1,10 +1,10 @@
 from flask import request
 from flask_jwt_extended import jwt_required
 
-from app.utils.helpers import admin_required, format_json_responses, handle_endpoint_exceptions
+from app.utils.helpers import admin_required, conditional_get, format_json_responses, handle_endpoint_exceptions
 from .services import get_modules, append_projects_to_modules, get_project_data, get_extra_project_details
 from .services import get_projects, create_project, update_project, get_cohorts, get_mentors_with_assigned_cohorts
-from .services import assign_mentor_to_cohorts
+from .services import assign_mentor_to_cohorts, project_page_etag
 
 @jwt_required()
 @admin_required
@@ -42,6 +42,7 @@ def project_edit_page(project_id):
 @jwt_required()
 @admin_required
 @handle_endpoint_exceptions
+@conditional_get(project_page_etag)
 def single_project_page(project_id):
     project = get_project_data(project_id)
     project = get_extra_project_details(project)
@@ -62,9 +63,10 @@ def adminprojects_page(course_id):
 @handle_endpoint_exceptions
 def adminmentors_page():
     if request.method == "GET":
-        cohorts = get_cohorts()
-        mentors = get_mentors_with_assigned_cohorts()
-        return format_json_responses(data={"cohorts": cohorts, "mentors": mentors})
+        cohorts, next_cursor = get_cohorts()
+        mentors, mentors_next_cursor = get_mentors_with_assigned_cohorts()
+        return format_json_responses(data={"cohorts": cohorts, "mentors": mentors, "next_cursor": next_cursor,
+                                           "mentors_next_cursor": mentors_next_cursor})
     elif request.method == "PATCH":
         assign_mentor_to_cohorts()
         return format_json_responses(message="Record Updated Successfully")
@@ -1,12 +1,21 @@
 from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
+from app.models import storage
 from app.models.project import AdminProject
 from app.models.user import Admin, Mentor, MentorCohort
 from app.models.cohort import Cohort
 from app.models.course import Course
 from app.models.module import Module
 from app.utils.error_extensions import NotFound, InternalServerError, BadRequest
-from app.utils.helpers import retrieve_models_info, extract_request_data
+from app.utils.etags import compute_etag, version_of
+from app.utils.helpers import retrieve_models_info, extract_request_data, extract_pagination_args, encode_cursor
+from app.utils.schemas import ResponseSchema
+
+# list views leave the markdown out unless it is asked for with ?fields=
+PROJECT_LIST = ResponseSchema(AdminProject, exclude={"markdown_content"})
+MENTOR_LIST = ResponseSchema(Mentor)
 
 def delete_previously_assigned_cohorts(mentor_id: str):
     previously_assigned = MentorCohort.search(mentor_id=mentor_id)
@@ -36,25 +45,25 @@ def assign_mentor_to_cohorts():
             MentorCohort(mentor_id=mentor_id, cohort_id=cohort_id).save()
 
 def get_mentors_with_assigned_cohorts():
-    mentors = Mentor.all()
-    if not mentors: return []
+    """ One page of mentors with their cohorts and the cohorts' courses,
+        loaded with one query per table whatever the page size.
+        The page continues after the `mentors_cursor` query argument.
+    """
+    fields = MENTOR_LIST.requested_fields()
+    limit, cursor = extract_pagination_args("mentors_cursor")
+    mentors, next_cursor = Mentor.query().options(
+        MENTOR_LIST.load_only(fields),
+        selectinload(Mentor.cohorts).selectinload(MentorCohort.cohort).selectinload(Cohort.course),
+    ).paginate(limit, cursor)
 
-    if isinstance(mentors, Mentor): mentors = [mentors]
-    
     mentors_main = []
     for mentor in mentors:
-        cohorts = []
-        for cohort in mentor.cohorts:
-            cht = Cohort.search(id=cohort.cohort_id)
-            if not cht: continue
-            cohorts.append(cht)
-        cohorts = append_course_to_cohorts(cohorts)
-        mentor = mentor.to_dict()
-        mentor["cohorts"] = cohorts
-        del mentor["password"]
-        mentors_main.append(mentor)
-
-    return mentors_main
+        cohorts = [assigned.cohort for assigned in mentor.cohorts if assigned.cohort is not None]
+        mentor_dict = MENTOR_LIST.dump(mentor, fields)
+        mentor_dict["cohorts"] = append_course_to_cohorts(cohorts)
+        mentors_main.append(mentor_dict)
+
+    return mentors_main, encode_cursor(next_cursor)
 
 def append_course_to_cohorts(cohorts):
     chts = []
@@ -67,13 +76,10 @@ def append_course_to_cohorts(cohorts):
     return chts
 
 def get_cohorts():
-    cohorts = Cohort.all()
-    if not cohorts: return []
-    
-    if isinstance(cohorts, Cohort): cohorts = [cohorts]
-
-    cohorts = append_course_to_cohorts(cohorts)
-    return cohorts
+    limit, cursor = extract_pagination_args()
+    cohorts, next_cursor = Cohort.query().options(selectinload(Cohort.course))\
+        .paginate(limit, cursor)
+    return append_course_to_cohorts(cohorts), encode_cursor(next_cursor)
 
 def update_project(project_id):
     data = extract_request_data("json")
@@ -81,8 +87,10 @@ def update_project(project_id):
     if not pjt: raise NotFound("Project not found!")
     if isinstance(pjt, list): raise InternalServerError(f"Lots of projects with ID [{project_id}] found")
 
-    pjt.update(**data)
-    pjt.save()
+    # a move rewrites up to four rows, commit them together
+    with storage.transaction():
+        pjt.update(**data)
+        pjt.save()
 
 def create_project(course_id):
     data = extract_request_data("json")
@@ -92,16 +100,12 @@ def create_project(course_id):
     AdminProject(**data).save()
 
 def get_projects(course_id: str):
-    projects = AdminProject.search(course_id=course_id)
-    if not projects: return []
-    
-    if isinstance(projects, AdminProject):
-        projects = [projects]
-    
-    projects = AdminProject.sort_projects(projects)
+    fields = PROJECT_LIST.requested_fields()
+    projects = AdminProject.query().filter(course_id=course_id)\
+        .options(PROJECT_LIST.load_only(fields)).order_by(AdminProject.position).all()
     p_list = []
     for project in projects:
-        p_list.append(project.to_dict())
+        p_list.append(PROJECT_LIST.dump(project, fields))
     return p_list
 
 def get_extra_project_details(project):
@@ -110,9 +114,20 @@ def get_extra_project_details(project):
         project["author"] = author.to_dict()
     return project
 
+def project_page_etag(project_id):
+    """ Validator of the single project page: the projects and
+        modules of the project's course and the authors
+    """
+    course_id = select(AdminProject.course_id).where(AdminProject.id == project_id).scalar_subquery()
+    return compute_etag(
+        version_of(AdminProject, AdminProject.course_id == course_id),
+        version_of(Module, Module.course_id == course_id),
+        version_of(Admin),
+        scope=(project_id,))
+
 def get_project_data(project_id):
     if not project_id: return
-    project = AdminProject.search(id=project_id)
+    project = AdminProject.search_with_content(id=project_id)
     if not project: raise NotFound("Project not found")
     project_dict = project.to_dict()
 
@@ -135,14 +150,8 @@ def get_modules(course_id: str):
 
 def append_projects_to_modules(modules):
     for module in modules:
-        projects = AdminProject.search(module_id=module["id"])
-        if not projects:
-            module["projects"] = []
-            continue
-
-        if isinstance(projects, AdminProject):
-            projects = [projects]
-
+        projects = AdminProject.query().filter(module_id=module["id"])\
+            .order_by(AdminProject.position).all()
         projects = retrieve_models_info(projects)
         module["projects"] = projects
 
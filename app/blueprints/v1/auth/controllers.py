@@ -142,6 +142,8 @@ def logout():
 @jwt_required(refresh=True)
 def refresh():
     current_user = get_jwt_identity()
-    new_token = create_access_token(identity=current_user)
+    # claims are re-read from the user so a refresh picks up their changes
+    new_token = create_access_token(identity=current_user,
+                                    additional_claims=get_current_user().token_claims())
     return format_json_responses(data={"access_token": new_token},
                                  message="Token refreshed successfully!")
\ No newline at end of file
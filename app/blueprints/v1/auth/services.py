@@ -1,21 +1,25 @@
 import os
 from uuid import uuid4
 from flask_jwt_extended import create_access_token, create_refresh_token, current_user, get_jwt_header, get_jwt_identity
+from sqlalchemy import literal, select, union_all
 
 from app.models.user import Student, Admin, Mentor
 from app.models.cohort import Cohort
+from app.models import storage
 from app.utils.helpers import retrieve_model_info, extract_request_data
 from app.utils.error_extensions import BadRequest, InternalServerError, UnAuthenticated
 
 def check_specific_user_role():
     data = extract_request_data("args")
     user_id = data.get("id")
-    if Student.search(id=user_id) is not None:
-        return {"role": "student"}
-    if Mentor.search(id=user_id) is not None:
-        return {"role": "mentor"}
-    if Admin.search(id=user_id) is not None:
-        return {"role": "admin"}
+    # one round trip for the three user tables, in the order they used to be probed
+    stmt = union_all(*[
+        select(literal(role).label("role"), literal(position).label("probe_order")).where(cls.id == user_id)
+        for position, (role, cls) in enumerate((("student", Student), ("mentor", Mentor), ("admin", Admin)))
+    ]).order_by("probe_order").limit(1)
+    role = storage.execute(stmt).scalar()
+    if role is not None:
+        return {"role": role}
 
 def user_login(credentials):
     """
@@ -50,8 +54,10 @@ def user_login(credentials):
         if not user.cohort_id or not Cohort.search(id=user.cohort_id):
             raise BadRequest("Student not assigned to cohort")
 
-    access_token = create_access_token(identity={"id": user.id, "role": credentials.get("role")})
-    refresh_token = create_refresh_token(identity={"id": user.id, "role": credentials.get("role")})
+    identity = {"id": user.id, "role": credentials.get("role")}
+    claims = user.token_claims()
+    access_token = create_access_token(identity=identity, additional_claims=claims)
+    refresh_token = create_refresh_token(identity=identity, additional_claims=user.refresh_claims())
     basic_details = retrieve_model_info(user, ["id", "first_name", "last_name", "email", "username"])
     basic_details["role"] = credentials.get("role")
     basic_details["user_id"] = basic_details.get("id")
@@ -61,10 +67,10 @@ def user_login(credentials):
 def verify_is_admin():
     identity = get_jwt_identity()
     if not identity: raise UnAuthenticated()
-    
-    admin_id = identity["id"]
-    admin = Admin.search(id=admin_id)
-    if admin is None:
+
+    # the role is signed into the token and the user lookup already
+    # rejected tokens of deleted or changed accounts
+    if identity.get("role") != "admin":
         raise UnAuthenticated("Only Admins can register mentor accounts")
 
 def create_user(data: dict, role: str) -> dict:
@@ -35,18 +35,18 @@ def ud_cohort(cohort_id):
 @admin_required
 @handle_endpoint_exceptions
 def add_students_to_cohort(cohort_id):
-    iadd_students_to_cohort(cohort_id)
-    return format_json_responses(message="Record update successful!")
+    results = iadd_students_to_cohort(cohort_id)
+    return format_json_responses(data={"results": results}, message="Record update successful!")
 
 @jwt_required()
 @handle_endpoint_exceptions
 def get_cohort_students(cohort_id):
-    cohort_with_students = iget_cohort_students(cohort_id)
-    return format_json_responses(data={"cohort": cohort_with_students})
+    cohort_with_students, next_cursor = iget_cohort_students(cohort_id)
+    return format_json_responses(data={"cohort": cohort_with_students, "next_cursor": next_cursor})
 
 @jwt_required()
 @admin_required
 @handle_endpoint_exceptions
 def get_all_cohorts():
-    cohorts = iget_all_cohorts()
-    return format_json_responses(data={"cohorts": cohorts})
\ No newline at end of file
+    cohorts, next_cursor = iget_all_cohorts()
+    return format_json_responses(data={"cohorts": cohorts, "next_cursor": next_cursor})
\ No newline at end of file
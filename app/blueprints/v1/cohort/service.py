@@ -1,10 +1,19 @@
+from datetime import datetime, timezone
+
 from flask import request
+from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload
 
+from app.models import storage
 from app.models.cohort import Cohort
 from app.models.course import Course
 from app.models.user import Student, MentorCohort, Mentor
-from app.utils.helpers import extract_request_data, has_required_keys
+from app.utils.helpers import extract_request_data, has_required_keys, extract_pagination_args, encode_cursor
 from app.utils.error_extensions import BadRequest, NotFound
+from app.utils.user_cache import forget_after_commit
+
+# ids per IN (...) list, keeps statements well under driver parameter limits
+ENROLMENT_BATCH_SIZE = 1000
 
 
 def icreate_cohort():
@@ -30,49 +39,78 @@ def iget_cohort(cohort_id):
     return cohort_dict
 
 def iget_all_cohorts():
-    tmp = Cohort.all()
+    limit, cursor = extract_pagination_args()
+    tmp, next_cursor = Cohort.query().options(selectinload(Cohort.course))\
+        .paginate(limit, cursor)
     cohorts = []
 
-    if not tmp:
+    if not tmp and cursor is None:
         raise NotFound("No Cohorts found!")
-    if isinstance(tmp, Cohort):
-        course = Course.search(id=tmp.course_id)
-        tmp = tmp.to_dict()
-        tmp["course"] = course.to_dict()
-        cohorts.append(tmp)
-    if isinstance(tmp, list):
-        for cohort in tmp:
-            course = Course.search(id=cohort.course_id)
-            cohort = cohort.to_dict()
-            cohort["course"] = course.to_dict()
-            cohorts.append(cohort)
-    return cohorts
+    for cohort in tmp:
+        cohort_dict = cohort.to_dict()
+        cohort_dict["course"] = cohort.course.to_dict()
+        cohorts.append(cohort_dict)
+    return cohorts, encode_cursor(next_cursor)
 
 def get_students_for_cohort(cohort_id):
-    tmp = Student.search(cohort_id=cohort_id)
-    students = []
-    if isinstance(tmp, Student):
-        students.append(tmp.basic_info())
-    if isinstance(tmp, list):
-        for student in tmp:
-            students.append(student.basic_info())
-    return students
+    limit, cursor = extract_pagination_args()
+    tmp, next_cursor = Student.query().filter(cohort_id=cohort_id).paginate(limit, cursor)
+    students = [student.basic_info() for student in tmp]
+    return students, encode_cursor(next_cursor)
 
 def iadd_students_to_cohort(cohort_id):
     if not Cohort.search(id=cohort_id):
         raise NotFound(f"Cohort with ID {cohort_id} not found!")
-    student_ids = extract_request_data("form")[0].getlist("student_ids")
-    for student_id in student_ids:
-        student = Student.search(id=student_id)
-        if student:
-            student.cohort_id = cohort_id
-            student.status = "active"
-            student.save()
+    if request.is_json:
+        # large intakes: multipart forms are capped at 1000 fields
+        student_ids = extract_request_data("json").get("student_ids")
+        if not isinstance(student_ids, list):
+            raise BadRequest("student_ids must be a list")
+    else:
+        student_ids = extract_request_data("form")[0].getlist("student_ids")
+    if not all(isinstance(student_id, str) and student_id for student_id in student_ids):
+        raise BadRequest("student_ids must only contain non-empty strings")
+    student_ids = list(dict.fromkeys(student_ids))
+    return enrol_students(cohort_id, student_ids)
+
+def enrol_students(cohort_id, student_ids: list) -> list:
+    """
+        Move students into a cohort and activate them in one transaction::
+            one locking SELECT ... WHERE id IN (...) validates the ids and
+            one UPDATE ... WHERE id IN (...) enrols the ones that exist,
+            per ENROLMENT_BATCH_SIZE ids.
+        Access tokens already issued to the students carry their old
+        cohort and are revoked by bumping token_version, a refresh
+        issues new ones scoped to the cohort.
+        Returns one {"id", "status"} result per id, status being
+        "enrolled" or "not_found".
+    """
+    found = set()
+    now = datetime.now(timezone.utc)
+    with storage.transaction():
+        for i in range(0, len(student_ids), ENROLMENT_BATCH_SIZE):
+            batch = student_ids[i:i + ENROLMENT_BATCH_SIZE]
+            existing = storage.execute(
+                select(Student.id).where(Student.id.in_(batch)).with_for_update()
+            ).scalars().all()
+            if existing:
+                storage.execute(
+                    update(Student).where(Student.id.in_(existing))
+                    .values(cohort_id=cohort_id, status="active", updated_at=now,
+                            token_version=Student.token_version + 1)
+                )
+            found.update(existing)
+        for student_id in found:
+            forget_after_commit("student", student_id)
+    return [
+        {"id": student_id, "status": "enrolled" if student_id in found else "not_found"}
+        for student_id in student_ids
+    ]
 
 def iget_cohort_students(cohort_id):
     cohort = iget_cohort(cohort_id)
-    cohort["students"] = get_students_for_cohort(cohort_id)
-    return cohort
+    cohort["students"], next_cursor = get_students_for_cohort(cohort_id)
+    return cohort, next_cursor
 
 def iupdate_cohort(cohort_id):
     data = extract_request_data("json")
@@ -2,8 +2,8 @@ from flask import request
 from flask_jwt_extended import jwt_required
 
 from .service import icreate_course, iretrieve_all_courses, iretrieve_single_course, iretrieve_single_course_with_modules
-from .service import iretrieve_all_course_data, iupdate_course, idelete_course
-from app.utils.helpers import admin_required, handle_endpoint_exceptions, format_json_responses
+from .service import iretrieve_all_course_data, iupdate_course, idelete_course, all_course_data_etag
+from app.utils.helpers import admin_required, conditional_get, handle_endpoint_exceptions, format_json_responses
 
 @jwt_required()
 @admin_required
@@ -14,8 +14,8 @@ def create_course():
 
 @handle_endpoint_exceptions
 def retrieve_all_courses():
-    courses = iretrieve_all_courses()
-    return format_json_responses(data={"courses": courses})
+    courses, next_cursor = iretrieve_all_courses()
+    return format_json_responses(data={"courses": courses, "next_cursor": next_cursor})
 
 @jwt_required()
 @handle_endpoint_exceptions
@@ -40,6 +40,7 @@ def retrieve_single_course_with_modules(course_id):
     course_with_modules = iretrieve_single_course_with_modules(course_id)
     return format_json_responses(data={"course": course_with_modules})
 
+@conditional_get(all_course_data_etag)
 def retrieve_all_course_data(course_id):
     data = iretrieve_all_course_data(course_id)
     return format_json_responses(data={"course": data})
\ No newline at end of file
@@ -1,9 +1,13 @@
+from sqlalchemy import func, select
+
+from app.models import storage
 from app.models.user import Student
 from app.models.course import Course
 from app.models.cohort import Cohort
 from app.models.module import Module
 from app.models.project import AdminProject, CohortProject, StudentProject
-from app.utils.helpers import extract_request_data
+from app.utils.etags import compute_etag, version_of
+from app.utils.helpers import extract_request_data, extract_pagination_args, encode_cursor
 from app.utils.error_extensions import BadRequest, NotFound
 
 def icreate_course():
@@ -14,19 +18,17 @@ def icreate_course():
     Course(**data).save()
 
 def iretrieve_all_courses():
-    tmp = Course.all()
-    if not tmp: raise NotFound("No courses found")
-    if isinstance(tmp, Course):
-        course_dict = tmp.to_dict()
-        course_dict["cohorts"] = retrieve_cohorts_for_course(tmp.id)
-        return [course_dict]
-    
+    limit, cursor = extract_pagination_args()
+    tmp, next_cursor = Course.query().paginate(limit, cursor)
+    if not tmp and cursor is None: raise NotFound("No courses found")
+
+    cohorts = retrieve_cohorts_for_courses([course.id for course in tmp])
     courses_list = []
     for course in tmp:
         course_dict = course.to_dict()
-        course_dict["cohorts"] = retrieve_cohorts_for_course(course.id)
+        course_dict["cohorts"] = cohorts[course.id]
         courses_list.append(course_dict)
-    return courses_list
+    return courses_list, encode_cursor(next_cursor)
 
 def iretrieve_single_course(course_id):
     course = Course.search(id=course_id)
@@ -79,20 +81,41 @@ def idelete_course(course_id):
         raise NotFound(f"Course with ID [{course_id}] not found!")
     course.delete()
 
-def retrieve_cohorts_for_course(course_id):
-    tmp = Cohort.search(course_id=course_id)
-    cohorts = []
-    if isinstance(tmp, Cohort):
-        cohort_dict = tmp.to_dict()
-        cohort_dict["students"] = Student.count(cohort_id=tmp.id)
-        cohorts.append(cohort_dict)
-    if isinstance(tmp, list):
-        for cohort in tmp:
-            cohort_dict = cohort.to_dict()
-            cohort_dict["students"] = Student.count(cohort_id=cohort.id)
-            cohorts.append(cohort_dict)
+def retrieve_cohorts_for_courses(course_ids):
+    """ Cohorts of every course in course_ids with their student count,
+        loaded with two queries whatever the number of courses.
+    """
+    cohorts = {course_id: [] for course_id in course_ids}
+    if not course_ids: return cohorts
+
+    tmp = Cohort.query().filter(Cohort.course_id.in_(course_ids))\
+        .order_by(Cohort.position, Cohort.created_at, Cohort.id).all()
+    stmt = select(Student.cohort_id, func.count(Student.id))\
+        .where(Student.cohort_id.in_([cohort.id for cohort in tmp]))\
+        .group_by(Student.cohort_id)
+    students_count = dict(storage.execute(stmt).all()) if tmp else {}
+
+    for cohort in tmp:
+        cohort_dict = cohort.to_dict()
+        cohort_dict["students"] = students_count.get(cohort.id, 0)
+        cohorts[cohort.course_id].append(cohort_dict)
     return cohorts
 
+def retrieve_cohorts_for_course(course_id):
+    return retrieve_cohorts_for_courses([course_id])[course_id]
+
+def all_course_data_etag(course_id):
+    """Validator of iretrieve_all_course_data, from the rows it reads"""
+    modules = select(Module.id).where(Module.course_id == course_id)
+    cohorts = select(Cohort.id).where(Cohort.course_id == course_id)
+    return compute_etag(
+        version_of(Course, Course.id == course_id),
+        version_of(Module, Module.course_id == course_id),
+        version_of(AdminProject, AdminProject.module_id.in_(modules)),
+        version_of(Cohort, Cohort.course_id == course_id),
+        version_of(Student, Student.cohort_id.in_(cohorts)),
+        scope=(course_id,))
+
 def iretrieve_all_course_data(course_id):
     course = iretrieve_single_course_with_modules(course_id)
     modules = course["modules"]
@@ -19,8 +19,8 @@ def single_project_page(project_id):
 @admin_required
 @handle_endpoint_exceptions
 def all_mentors():
-    mentors = all_mentors_data()
-    return format_json_responses(200, data={"mentors": mentors})
+    mentors, next_cursor = all_mentors_data()
+    return format_json_responses(200, data={"mentors": mentors, "next_cursor": next_cursor})
 
 @handle_endpoint_exceptions
 def activate_account():
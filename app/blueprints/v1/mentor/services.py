@@ -1,10 +1,10 @@
-from flask_jwt_extended import get_jwt_identity
+from flask_jwt_extended import get_current_user
 
 from app.models.user import Mentor, MentorCohort, Admin
 from app.models.course import Course
 from app.models.project import AdminProject
 from app.models.module import Module
-from app.utils.helpers import retrieve_model_info, extract_request_data
+from app.utils.helpers import retrieve_model_info, extract_request_data, extract_pagination_args, encode_cursor
 from app.utils.error_extensions import BadRequest, NotFound, InternalServerError
 
 def get_extra_project_details(project):
@@ -15,7 +15,7 @@ def get_extra_project_details(project):
 
 def get_project_data(project_id):
     if not project_id: return
-    project = AdminProject.search(id=project_id)
+    project = AdminProject.search_with_content(id=project_id)
     if not project: raise NotFound("Project not found")
     project_dict = project.to_dict()
 
@@ -24,15 +24,15 @@ def get_project_data(project_id):
         project_dict["module"] = module.to_dict()
     return project_dict
 
+MENTOR_LIST_FIELDS = ["id", "first_name", "last_name", "email", "status", "username"]
+
 def all_mentors_data():
-    mentors = Mentor.all()
-    mentors_data = [retrieve_model_info(mentor, ["id", \
-        "first_name", "last_name",\
-        "email", "status",\
-        "username"])\
-        for mentor in mentors]
-    mentors_data = list(reversed(mentors_data))
-    return mentors_data
+    limit, cursor = extract_pagination_args()
+    # newest mentors first
+    mentors, next_cursor = Mentor.query().only(*MENTOR_LIST_FIELDS, "created_at")\
+        .paginate(limit, cursor, descending=True)
+    mentors_data = [retrieve_model_info(mentor, MENTOR_LIST_FIELDS) for mentor in mentors]
+    return mentors_data, encode_cursor(next_cursor)
 
 def activate_mentor_account():
     data = extract_request_data("json")
@@ -62,8 +62,8 @@ def activate_mentor_account():
     mentor.save()
 
 def imentor_assigned_cohorts():
-    mentor = Mentor.search(id=get_jwt_identity()["id"])
-    if not mentor:
+    mentor = get_current_user()
+    if not isinstance(mentor, Mentor):
         raise NotFound(f"Mentor account not found!")
     if not mentor.cohorts:
         raise NotFound(f"No assigned cohorts to mentor")
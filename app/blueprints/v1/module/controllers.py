@@ -1,7 +1,7 @@
 from flask_jwt_extended import jwt_required
 
-from .services import icreate_module, ifetch_modules, iupdate_module
-from app.utils.helpers import format_json_responses, handle_endpoint_exceptions, admin_required
+from .services import icreate_module, ifetch_modules, iupdate_module, modules_etag
+from app.utils.helpers import format_json_responses, handle_endpoint_exceptions, admin_required, conditional_get
 
 @jwt_required()
 @admin_required
@@ -19,6 +19,7 @@ def update_module(module_id):
 
 @jwt_required()
 @handle_endpoint_exceptions
+@conditional_get(modules_etag)
 def fetch_modules(course_id):
     modules = ifetch_modules(course_id)
     return format_json_responses(data={"modules": modules})
@@ -1,4 +1,5 @@
 from app.models.module import Module
+from app.utils.etags import compute_etag, version_of
 from app.utils.helpers import extract_request_data
 from app.utils.error_extensions import BadRequest, NotFound
 
@@ -11,6 +12,9 @@ def iupdate_module(module_id):
     module.update(**data)
     module.save()
 
+def modules_etag(course_id):
+    return compute_etag(version_of(Module, Module.course_id == course_id), scope=(course_id,))
+
 def ifetch_modules(course_id):
     mds = Module.search(course_id=course_id)
     if not mds:
@@ -2,13 +2,18 @@ from datetime import datetime, timezone
 
 from flask_jwt_extended import get_jwt_identity
 
+from app.models import storage
 from app.models.module import Module
 from app.models.course import Course
 from app.models.project import AdminProject, StudentProject, CohortProject
 from app.utils.helpers import extract_request_data
 from app.utils.error_extensions import BadRequest, NotFound
+from app.utils.schemas import ResponseSchema
 from app.models.user import Admin, Student
 
+# list views leave the markdown out unless it is asked for with ?fields=
+COHORT_PROJECT_LIST = ResponseSchema(CohortProject, exclude={"markdown_content"})
+
 
 def igrade_student_project():
     data = extract_request_data("json")
@@ -64,7 +69,7 @@ def iretrieve_projects_with_submissions(cohort_id):
 
 def iretrieve_assigned_project_submissions(project_id):
     mentor_id = get_jwt_identity()["id"]
-    project = AdminProject.search(id=project_id)
+    project = AdminProject.search_with_content(id=project_id)
     assigned_pjts = StudentProject.search(status="submitted", project_id=project_id, assigned_to=mentor_id)
 
     if not assigned_pjts:
@@ -105,7 +110,7 @@ def igenerate_project_submission(project_id):
         submitted_projects[0].save()
 
 def ifetch_project(project_id):
-    project = AdminProject.search(id=project_id)
+    project = AdminProject.search_with_content(id=project_id)
     if not project:
         raise NotFound(f"Project with ID {project_id} not found")
     
@@ -125,23 +130,18 @@ def ifetch_project(project_id):
 
 def ifetch_projects_for_cohort(course_id):
     module_id = extract_request_data("args").get('module_id')
+    fields = COHORT_PROJECT_LIST.requested_fields()
 
+    query = CohortProject.query().options(COHORT_PROJECT_LIST.load_only(fields)).order_by(CohortProject.position)
     if module_id:
-        projects = CohortProject.search(module_id=module_id)
+        projects = query.filter(module_id=module_id).all()
     else:
-        projects = CohortProject.search(course_id=course_id)
-
-    p_list = []
+        projects = query.filter(course_id=course_id).all()
 
-    if not projects or projects is None:
+    if not projects:
         raise NotFound("No projects found")
 
-    if isinstance(projects, list):
-        for project in projects:
-            p_list.append(project.to_dict())
-    elif isinstance(projects, CohortProject):
-        p_list = [projects.to_dict()]
-    return p_list
+    return [COHORT_PROJECT_LIST.dump(project, fields) for project in projects]
 
 def update_single_project_details(project_id):
     data = extract_request_data("json")
@@ -154,5 +154,6 @@ def update_single_project_details(project_id):
     data["status"] = status
     data["author_id"] = get_jwt_identity()["id"]
 
-    project.update(**data)
-    project.save()
+    with storage.transaction():
+        project.update(**data)
+        project.save()
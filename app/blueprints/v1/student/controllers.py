@@ -1,19 +1,20 @@
 from flask_jwt_extended import jwt_required
 
 from app.utils.helpers import format_json_responses, handle_endpoint_exceptions, admin_required, extract_request_data
+from app.utils.helpers import conditional_get
 from .services import count_completed_modules, count_completed_projects, submit_project
 from .services import iretrieve_students_with_no_cohort, student_create_new_account
 from .services import ifetch_current_projects, get_project_data, get_extra_project_details
-from .services import get_course_and_cohort_id, get_modules, append_projects_to_modules
-from .services import send_welcome_email_for_student
+from .services import get_course_and_cohort_id, get_modules_with_projects
+from .services import send_welcome_email_for_student, projects_page_etag, project_page_etag
 
 
 @jwt_required()
 @handle_endpoint_exceptions
+@conditional_get(projects_page_etag)
 def allprojects_page():
     course_id, cohort_id = get_course_and_cohort_id()
-    modules = get_modules(course_id)
-    modules = append_projects_to_modules(modules, cohort_id)
+    modules = get_modules_with_projects(course_id, cohort_id)
     return format_json_responses(data={"modules": modules})
 
 @jwt_required()
@@ -25,6 +26,7 @@ def submitProject(project_id):
 
 @jwt_required()
 @handle_endpoint_exceptions
+@conditional_get(project_page_etag)
 def single_project_page(project_id):
     """ Retrieve data for the single
         project view page for a student.
@@ -1,10 +1,14 @@
 from datetime import datetime, timezone
 
-from flask_jwt_extended import get_jwt_identity
+from flask_jwt_extended import get_current_user, get_jwt, get_jwt_identity
+from sqlalchemy import and_, distinct, func, select
+from sqlalchemy.orm import selectinload
 
+from app.utils.etags import compute_etag, version_of
 from app.utils.helpers import extract_request_data, retrieve_models_info
 from jobs.tasks.jobs import send_transactional_email
 from app.utils.error_extensions import BadRequest, NotFound, InternalServerError
+from app.models import storage
 from app.models.user import Student, Admin
 from app.models.module import Module
 from app.models.project import AdminProject, CohortProject, StudentProject
@@ -12,54 +16,72 @@ from app.models.course import Course
 from app.models.cohort import Cohort
 
 def get_course_and_cohort_id():
-    student_id = get_jwt_identity()["id"]
-    student = Student.search(id=student_id)
+    """ Read from the signed token claims (see Student.token_claims),
+        tokens issued before the claims existed fall back to the user
+    """
+    claims = get_jwt()
+    if "cohort_id" in claims:
+        return claims["course_id"], claims["cohort_id"]
+    student = get_current_user()
     return student.course_id, student.cohort_id
 
-def get_modules(course_id: str):
-    modules = Module.search(course_id=course_id, status="published")
-    if not modules:
-        return []
-
-    if isinstance(modules, Module):
-        modules = [modules.to_dict()]
-    elif isinstance(modules, list):
-        t_list = []
-        for module in modules:
-            t_list.append(module.to_dict())
-        modules = t_list
-
-    return modules
-
-def append_projects_statuses(projects):
-    for project in projects:
-        studentProject = StudentProject.search(cohort_project_id=project["id"])
-        if not studentProject: continue
-        project["status"] = studentProject.status
-    return projects
+def get_modules_with_projects(course_id: str, cohort_id: str):
+    """ Load the published modules of a course together with the
+        cohort's projects and the current student's submissions.
+        The number of statements does not depend on how many
+        modules or projects there are.
+    """
+    student_id = get_jwt_identity()["id"]
+    modules = Module.fetch(
+        selectinload(Module.cohort_projects.and_(CohortProject.cohort_id == cohort_id))
+            .selectinload(CohortProject.student_projects.and_(StudentProject.student_id == student_id)),
+        course_id=course_id, status="published")
 
-def append_projects_to_modules(modules, cohort_id):
+    modules_list = []
     for module in modules:
-        projects = CohortProject.search(cohort_id=cohort_id, module_id=module["id"])
-        if not projects:
-            module["projects"] = []
-            continue
-
-        if isinstance(projects, CohortProject):
-            projects = [projects]
-        
-        projects = retrieve_models_info(projects)
-        projects = append_projects_statuses(projects)
-        module["projects"] = projects
-        
-    return modules
+        module_dict = module.to_dict()
+        projects = []
+        for project in module.cohort_projects:
+            project_dict = project.to_dict()
+            if project.student_projects:
+                project_dict["status"] = project.student_projects[0].status
+            projects.append(project_dict)
+        module_dict["projects"] = projects
+        modules_list.append(module_dict)
+    return modules_list
+
+def projects_page_etag():
+    """ Validator of the projects page: the course's modules, the
+        cohort's projects and the student's submissions
+    """
+    course_id, cohort_id = get_course_and_cohort_id()
+    student_id = get_jwt_identity()["id"]
+    return compute_etag(
+        version_of(Module, Module.course_id == course_id),
+        version_of(CohortProject, CohortProject.cohort_id == cohort_id),
+        version_of(StudentProject, StudentProject.student_id == student_id,
+                   StudentProject.cohort_id == cohort_id),
+        scope=(student_id, cohort_id))
+
+def project_page_etag(project_id):
+    """ Validator of the single project page: the projects and
+        submissions of the project's cohort, the course's modules
+        and the authors
+    """
+    cohort_id = select(CohortProject.cohort_id).where(CohortProject.id == project_id).scalar_subquery()
+    course_id = select(CohortProject.course_id).where(CohortProject.id == project_id).scalar_subquery()
+    return compute_etag(
+        version_of(CohortProject, CohortProject.cohort_id == cohort_id),
+        version_of(StudentProject, StudentProject.cohort_id == cohort_id),
+        version_of(Module, Module.course_id == course_id),
+        version_of(Admin),
+        scope=(get_jwt_identity()["id"], project_id))
 
 def submit_project(project_id, data):
-    student = Student.search(id=get_jwt_identity()['id'])
-    data["cohort_id"] = student.cohort_id
+    _, data["cohort_id"] = get_course_and_cohort_id()
     data["status"] = "submitted"
     data["submitted_on"] = datetime.now(timezone.utc)
-    data["student_id"] = student.id
+    data["student_id"] = get_jwt_identity()["id"]
     data["cohort_project_id"] = project_id
     StudentProject(**data).save()
 
@@ -74,7 +96,7 @@ def get_extra_project_details(project):
 
 def get_project_data(project_id):
     if not project_id: return
-    cohortProject = CohortProject.search(id=project_id)
+    cohortProject = CohortProject.search_with_content(id=project_id)
     if not cohortProject: raise NotFound("Project not found")
     cohort_project_dict = cohortProject.to_dict()
     
@@ -90,40 +112,35 @@ def get_project_data(project_id):
     return cohort_project_dict
 
 def count_completed_modules():
+    """ A module is completed once the student has a submission for
+        every project in it. Computed with one grouped query so the
+        cost does not grow with the number of cohorts on the platform.
+    """
     student_id = get_jwt_identity()["id"]
-    student = Student.search(id=student_id)
-    all_modules = Module.search(course_id=student.course_id)
-    modules_count = Module.count(course_id=student.course_id)
-    completed_modules_count = 0
-    if not all_modules:
-        return {"completed": 0, "all": 0}
-    for module in all_modules:
-        projects = AdminProject.search(module_id=module.id)
-        if isinstance(projects, AdminProject): projects = [projects]
-        projects_count = len(projects) if projects else 0
-        projects_released = CohortProject.search()
-
-        if not projects or not projects_released: continue
-        project_ids = []
-        for project in projects_released:
-            project_ids.append(project.id)
-        completed_projects = StudentProject.count(cohort_project_id=tuple(pid for pid in project_ids),\
-            student_id=student_id, cohort_id=student.cohort_id)
-        if projects_count == completed_projects:
-            completed_modules_count += 1
-    return {"completed": completed_modules_count, "all": modules_count}
+    course_id, cohort_id = get_course_and_cohort_id()
+    stmt = select(Module.id,
+                  func.count(distinct(AdminProject.id)),
+                  func.count(distinct(StudentProject.id)))\
+        .outerjoin(AdminProject, AdminProject.module_id == Module.id)\
+        .outerjoin(CohortProject, and_(CohortProject.project_pool_id == AdminProject.id,
+                                       CohortProject.cohort_id == cohort_id))\
+        .outerjoin(StudentProject, and_(StudentProject.cohort_project_id == CohortProject.id,
+                                        StudentProject.student_id == student_id))\
+        .where(Module.course_id == course_id)\
+        .group_by(Module.id)
+    rows = storage.execute(stmt).all()
+    completed_modules_count = sum(1 for _, projects, completed in rows if projects and projects == completed)
+    return {"completed": completed_modules_count, "all": len(rows)}
 
 def count_completed_projects():
-    student_id = get_jwt_identity()["id"]
-    student = Student.search(id=student_id)
-    completed_projects = StudentProject.count(student_id=student_id, cohort_id=student.cohort_id)
-    all_projects = AdminProject.count(course_id=student.course_id)
+    course_id, cohort_id = get_course_and_cohort_id()
+    completed_projects = StudentProject.count(student_id=get_jwt_identity()["id"], cohort_id=cohort_id)
+    all_projects = AdminProject.count(course_id=course_id)
     return {"completed": completed_projects, "all": all_projects}
 
 def ifetch_current_projects():
-    student_id = get_jwt_identity()["id"]
-    student = Student.search(id=student_id)
-    projects = CohortProject.search(cohort_id=student.cohort_id, status=("released", "second-attempt"))
+    _, cohort_id = get_course_and_cohort_id()
+    projects = CohortProject.search(cohort_id=cohort_id, status=("released", "second-attempt"))
 
     if not projects: return []
 
@@ -184,7 +201,7 @@ def student_create_new_account():
         "status": "inactive",
     }
 
-    last_cohort = Cohort.search(course_id=student_details["course_id"], next_cohort_id=None)
+    last_cohort = Cohort.tail_of(Cohort.fetch(course_id=student_details["course_id"]))
     if not last_cohort:
         raise InternalServerError("No Cohorts assignable to student found")
     
@@ -1,4 +1,47 @@
-"""This module initializes the models package"""
-from app.models.engine.dbstorage import DBStorage
+"""This module initializes the models package
 
-storage = DBStorage()
+`storage` is created lazily: importing a model does not build the
+engine or open connections, the first attribute access does.
+After a fork (gunicorn --preload, Celery prefork workers) the child
+drops the pooled connections inherited from its parent and opens
+its own on first use.
+"""
+import os
+import threading
+
+
+class LazyStorage:
+    """
+    Class:
+        LazyStorage: stands in for the DBStorage instance and builds
+            it on first use, every attribute is forwarded to it
+    """
+
+    def __init__(self) -> None:
+        self._storage = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._storage is not None
+
+    def _load(self):
+        if self._storage is None:
+            with self._lock:
+                if self._storage is None:
+                    from app.models.engine.dbstorage import DBStorage
+                    self._storage = DBStorage()
+        return self._storage
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def after_fork(self) -> None:
+        if self._storage is not None:
+            self._storage.after_fork()
+
+
+storage = LazyStorage()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=storage.after_fork)
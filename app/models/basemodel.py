@@ -1,12 +1,14 @@
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Iterable, Optional
 from uuid import uuid4
-import copy
 
 from sqlalchemy import String, DateTime
+from sqlalchemy.dialects.mysql import DATETIME
 from sqlalchemy.orm import mapped_column
 from flask import g
 
+from app.models.serializer import serializer_for
+
 
 class BaseModel:
     """
@@ -22,7 +24,9 @@ class BaseModel:
     
     id = mapped_column(String(60), default=str(uuid4()),  primary_key=True, nullable=False, unique=True)
     created_at = mapped_column(DateTime, default=datetime.now(timezone.utc), nullable=False)
-    updated_at = mapped_column(DateTime, default=datetime.now(timezone.utc), nullable=False)
+    # microseconds on MySQL too: the ETags of app.utils.etags are derived from it
+    updated_at = mapped_column(DateTime().with_variant(DATETIME(fsp=6), "mysql"),
+                               default=datetime.now(timezone.utc), nullable=False)
 
     def __init__(self) -> None:
         self.id = str(uuid4())
@@ -73,14 +77,24 @@ class BaseModel:
     @classmethod
     def search(cls, **filters: dict) -> list:
         return g.db_storage.search(cls, **filters)
+
+    @classmethod
+    def query(cls):
+        return g.db_storage.query(cls)
+
+    @classmethod
+    def fetch(cls, *options, **filters: dict) -> list:
+        return g.db_storage.fetch(cls, *options, **filters)
     
-    def to_dict(self, strip: Optional[List[str]] = None) -> dict:
-        dict_repr = copy.deepcopy(self.__dict__)
-        if '_sa_instance_state' in dict_repr:
-            del dict_repr['_sa_instance_state']
-        if strip is not None:
-            return {key: value for key, value in dict_repr.items() if key not in strip}
-        return dict_repr
+    def to_dict(self, include: Optional[Iterable[str]] = None,
+                exclude: Optional[Iterable[str]] = None) -> dict:
+        """
+            The loaded column values of the object, see app.models.serializer
+            :params
+                @include: only serialize these columns
+                @exclude: leave these columns out
+        """
+        return serializer_for(type(self))(self, include, exclude)
 
     def __repr__(self) -> str:
         attrs = ", ".join([f"{key}={value}" for key, value in self.__dict__.items()])
@@ -1,17 +1,25 @@
 from datetime import date
 
-from sqlalchemy import String, ForeignKey, Date
+from flask import g
+from sqlalchemy import String, ForeignKey, Date, Index
 from sqlalchemy.orm import mapped_column, relationship
 from sqlalchemy.dialects.mysql import ENUM
 
 from app.models.base import Base
 from app.models.basemodel import BaseModel
+from app.models.ordering import PositionMixin, order_linked
 from app.utils.helpers import has_required_keys
 from app.utils.error_extensions import NotFound
 
 
-class Cohort(BaseModel, Base):
+class Cohort(PositionMixin, BaseModel, Base):
     __tablename__ = "cohorts"
+    __table_args__ = (
+        Index("ix_cohorts_course_id_position", "course_id", "position"),
+        # keyset pagination of the cohort list
+        Index("ix_cohorts_created_at_id", "created_at", "id"),
+    )
+    position_scope_keys = ("course_id",)
 
     # Example Cohort-1
     name = mapped_column(String(60), nullable=False)
@@ -44,54 +52,34 @@ class Cohort(BaseModel, Base):
         self.insert_cohort_at_correct_node(**kwargs)
 
     def insert_cohort_at_correct_node(self, **kwargs):
-        last_cohort = Cohort.search(course_id=kwargs["course_id"], next_cohort_id=None)
-
-        if last_cohort is None:
+        # append the cohort to its course, as one transaction holding
+        # a lock on the list so concurrent inserts cannot interleave
+        with g.db_storage.transaction():
+            last_cohort = Cohort.tail_of(self.lock_siblings())
+
+            if last_cohort is None:
+                self.place_between(None, None)
+                self.save()
+                return
+
+            self.prev_cohort_id = last_cohort.id
+            self.place_between(last_cohort, None)
             self.save()
-            return
-
-        self.prev_cohort_id = last_cohort.id
-        self.save()
-        last_cohort.next_cohort_id = self.id
-        last_cohort.save()
+            last_cohort.next_cohort_id = self.id
+            last_cohort.save()
 
     def sort_cohorts(cohorts):
         """
+            Order cohorts by walking their next/prev pointers,
+            see app.models.ordering.order_linked
             Note: This method only works for
                 cohorts from the same course
         """
         if cohorts is None or cohorts == []: return cohorts
         if not isinstance(cohorts, list): return cohorts
 
-        # Retrieve the head of the list
-        head = None
-        for cohort in cohorts:
-            if cohort.prev_cohort_id is None:
-                head = cohort
-                break
-
-            # Also account for if the list does not
-            # contain a head cohort but you want to
-            # choose the topmost cohort
-            is_head = True
-            prev_cohort_id = cohort.prev_cohort_id
-            for cohort in cohorts:
-                if cohort.id == prev_cohort_id:
-                    is_head = False
-                    break
-            if is_head:
-                head = cohort
-                break
-
-        # sorting process
-        tmp = head
-        tmp_list = [head]
-        while tmp is not None and tmp.cohort_id is not None:
-            for cohort in cohorts:
-                if cohort.id == tmp.next_cohort_id:
-                    tmp_list.append(cohort)
-                    tmp = cohort
-                    break
-
-        cohorts = tmp_list
-        return cohorts
\ No newline at end of file
+        return order_linked(cohorts, "prev_cohort_id", "next_cohort_id").nodes
+
+    @staticmethod
+    def sort_linked(cohorts):
+        return Cohort.sort_cohorts(cohorts)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import String, Index
 from sqlalchemy.orm import mapped_column, relationship
 from sqlalchemy.dialects.mysql import ENUM
 
@@ -9,6 +9,10 @@ from app.utils.helpers import has_required_keys
 
 class Course(BaseModel, Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        # keyset pagination of the course list
+        Index("ix_courses_created_at_id", "created_at", "id"),
+    )
 
     title = mapped_column(String(60), nullable=False)
     status = mapped_column(ENUM("deleted", "draft", "published"), default="published", nullable=False)
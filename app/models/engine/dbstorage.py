@@ -1,16 +1,19 @@
 """MODULE Documentation"""
 import os
+from contextlib import contextmanager
 
 from flask import g
 from sqlalchemy import create_engine, or_, select, text
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 from app.models.base import Base
+from app.models.engine.query import Query
 
-# Make sure every ORM mapped model is imported here
-# before calling Base.metadata.create_all()
+# Make sure every ORM mapped model is imported here so that
+# Base.metadata is complete for create_tables() and the baseline migration
 from app.models.user import Admin, Student, Mentor, MentorCohort
 from app.models.project import AdminProject, CohortProject, StudentProject
+from app.models.project_content import ProjectContent
 from app.models.module import Module
 from app.models.leaderboard import LeaderBoard
 from app.models.notification import Notification
@@ -34,10 +37,24 @@ class DBStorage:
         self.__engine = create_engine(DB_CONNECTION_STRING,
                                       pool_recycle=3600, pool_pre_ping=True,
                                       pool_size=20, max_overflow=40)
-        Base.metadata.create_all(self.__engine)
+        # the schema is managed by migrations (python -m migrations upgrade),
+        # nothing is created or reflected at startup
         session = sessionmaker(bind=self.__engine)
         self.__Session = scoped_session(session)
 
+    @property
+    def engine(self):
+        return self.__engine
+
+    def after_fork(self) -> None:
+        """
+            Called in a forked child: forget the pooled connections and
+            sessions inherited from the parent (without closing them,
+            the parent still uses them), new ones are opened on demand.
+        """
+        self.__engine.dispose(close=False)
+        self.__Session.registry.clear()
+
     def create_tables(self):
         Base.metadata.create_all(self.__engine)
 
@@ -98,18 +115,26 @@ class DBStorage:
                 g.db_session.rollback()
             return []
     
-    def count(self, cls, **filters):
-        try:
-            conditions = []
+    def build_conditions(self, cls, **filters) -> list:
+        """
+            Turns keyword filters into SQLAlchemy conditions::
+                a tuple value matches any of its items, every
+                other value is compared for equality
+        """
+        conditions = []
 
-            for key, value in filters.items():
-                field = getattr(cls, key)
+        for key, value in filters.items():
+            field = getattr(cls, key)
 
-                if isinstance(value, tuple):
-                    conditions.append(or_(*[field == v for v in value]))
-                else:
-                    conditions.append(field == value)
+            if isinstance(value, tuple):
+                conditions.append(or_(*[field == v for v in value]))
+            else:
+                conditions.append(field == value)
+        return conditions
 
+    def count(self, cls, **filters):
+        try:
+            conditions = self.build_conditions(cls, **filters)
             return g.db_session.query(cls).filter(*conditions).count()
         except Exception as e:
             print("Exception Occured When working with DataBase", e)
@@ -119,28 +144,91 @@ class DBStorage:
     
     def search(self, cls, **filters):
         try:
-            conditions = []
-
-            for key, value in filters.items():
-                field = getattr(cls, key)
-
-                if isinstance(value, tuple):
-                    conditions.append(or_(*[field == v for v in value]))
-                else:
-                    conditions.append(field == value)
+            conditions = self.build_conditions(cls, **filters)
             sh =  [obj for obj in g.db_session.scalars(select(cls).filter(*conditions))]
             return sh[0] if len(sh) == 1 else sh if len(sh) > 1 else None
         except Exception as e:
             return None
 
+    def query(self, cls) -> Query:
+        """
+            Start a chainable query, see app.models.engine.query
+        """
+        return Query(self, cls)
+
+    def fetch(self, cls, *options, **filters) -> list:
+        """
+            Like search but always returns a list and accepts loader
+            options (e.g. selectinload) so related rows can be loaded
+            in a fixed number of statements instead of one per object
+        """
+        try:
+            conditions = self.build_conditions(cls, **filters)
+            stmt = select(cls).filter(*conditions).options(*options)
+            return list(g.db_session.scalars(stmt).unique())
+        except Exception as e:
+            print("Exception Occured When working with DataBase", e)
+            if g.db_session.is_active:
+                g.db_session.rollback()
+            return []
+
+    def execute(self, statement, params=None):
+        """
+            Runs a Core statement (aggregates, set based updates)
+            in the current session and returns its result
+        """
+        try:
+            return g.db_session.execute(statement, params)
+        except Exception as e:
+            print("Exception Occured When working with DataBase", e)
+            if g.db_session.is_active:
+                g.db_session.rollback()
+            raise
+
+    @property
+    def in_transaction(self) -> bool:
+        return g.get("db_transaction_depth", 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """
+            Unit of work: every save() inside the block only flushes,
+            the outermost block commits once on exit or rolls
+            everything back if an exception escapes it::
+
+                with storage.transaction():
+                    project.update(**data)
+                    project.save()
+
+            Blocks can be nested, only the outermost one commits.
+        """
+        depth = g.get("db_transaction_depth", 0)
+        g.db_transaction_depth = depth + 1
+        try:
+            yield g.db_session
+            if depth == 0:
+                g.db_session.commit()
+        except Exception:
+            if depth == 0 and g.db_session.is_active:
+                g.db_session.rollback()
+            raise
+        finally:
+            g.db_transaction_depth = depth
+
     def save(self) -> None:
         try:
-            g.db_session.commit()
+            if self.in_transaction:
+                # flush keeps statements in order, the commit waits for the block
+                g.db_session.flush()
+            else:
+                g.db_session.commit()
             return True
         except Exception as e:
             print("Exception Occured When Saving To DataBase", e)
             if g.db_session.is_active:
                 g.db_session.rollback()
+            if self.in_transaction:
+                raise
             return False
 
     def refresh(self, obj) -> None:
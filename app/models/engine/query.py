@@ -0,0 +1,164 @@
+"""
+Chainable query builder returned by DBStorage.query
+
+Unlike DBStorage.search it never changes its return type with the
+number of rows: all() always returns a list and iter() streams rows.
+
+Example:
+    cohorts = Cohort.query().filter(course_id=course_id)\
+        .order_by(Cohort.created_at, Cohort.id).limit(20).all()
+"""
+from flask import g
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import load_only
+
+
+class Query:
+    """
+    Class:
+        Query: builds a SELECT over one mapped class
+
+        :methods
+            filter: add conditions (keyword filters behave like search)
+            order_by: add ORDER BY columns, use column.desc() for descending
+            limit / offset: bound the result
+            after: keyset pagination, continue after the given order_by values
+            paginate: one keyset page ordered by (created_at, id) and the next cursor
+            only: load only the given columns (the primary key is always loaded)
+            options: add loader options such as selectinload
+            for_update: lock the selected rows (SELECT ... FOR UPDATE) and reload them
+            all / first / iter / count: execute the query
+    """
+
+    def __init__(self, storage, cls) -> None:
+        self.storage = storage
+        self.cls = cls
+        self._conditions = []
+        self._order_by = []
+        self._options = []
+        self._limit = None
+        self._offset = None
+        self._for_update = False
+
+    def filter(self, *conditions, **filters) -> "Query":
+        self._conditions.extend(conditions)
+        self._conditions.extend(self.storage.build_conditions(self.cls, **filters))
+        return self
+
+    def order_by(self, *columns) -> "Query":
+        self._order_by.extend(columns)
+        return self
+
+    def limit(self, limit: int) -> "Query":
+        self._limit = limit
+        return self
+
+    def offset(self, offset: int) -> "Query":
+        self._offset = offset
+        return self
+
+    def options(self, *options) -> "Query":
+        self._options.extend(options)
+        return self
+
+    def only(self, *columns) -> "Query":
+        attrs = [getattr(self.cls, col) if isinstance(col, str) else col for col in columns]
+        self._options.append(load_only(*attrs))
+        return self
+
+    def for_update(self) -> "Query":
+        """
+            Lock the selected rows until the transaction ends.
+            Rows already in the session are overwritten with the
+            locked values so decisions are made on fresh data.
+        """
+        self._for_update = True
+        return self
+
+    def after(self, *values) -> "Query":
+        """
+            Keyset pagination: only keep rows that sort after `values`,
+            which are the order_by values of the last row already seen.
+            Each column is compared in its own direction, so mixed
+            orders such as (created_at DESC, id) are supported.
+        """
+        if len(values) != len(self._order_by):
+            raise ValueError("after() needs one value per order_by column")
+
+        columns = []
+        descending = []
+        for column in self._order_by:
+            modifier = getattr(column, "modifier", None)
+            if modifier is not None:
+                descending.append(modifier.__name__ == "desc_op")
+                column = column.element
+            else:
+                descending.append(False)
+            columns.append(column)
+
+        # (a > x) OR (a = x AND b > y) OR ..., with < for descending columns
+        clauses = []
+        for i, column in enumerate(columns):
+            equal = [columns[j] == values[j] for j in range(i)]
+            beyond = column < values[i] if descending[i] else column > values[i]
+            clauses.append(and_(*equal, beyond))
+        self._conditions.append(or_(*clauses))
+        return self
+
+    def paginate(self, limit: int, cursor: tuple = None, descending: bool = False) -> tuple:
+        """
+            Keyset page ordered by (created_at, id).
+            Returns the rows and the cursor of the next page,
+            or None when there are no more rows.
+        """
+        order = (self.cls.created_at, self.cls.id)
+        if descending:
+            order = tuple(column.desc() for column in order)
+        self.order_by(*order)
+        if cursor is not None:
+            self.after(*cursor)
+
+        rows = self.limit(limit + 1).all()
+        if len(rows) <= limit:
+            return rows, None
+        last = rows[limit - 1]
+        return rows[:limit], (last.created_at, last.id)
+
+    def statement(self):
+        stmt = select(self.cls).filter(*self._conditions).options(*self._options)
+        if self._order_by:
+            stmt = stmt.order_by(*self._order_by)
+        if self._limit is not None:
+            stmt = stmt.limit(self._limit)
+        if self._offset is not None:
+            stmt = stmt.offset(self._offset)
+        if self._for_update:
+            stmt = stmt.with_for_update().execution_options(populate_existing=True)
+        return stmt
+
+    def all(self) -> list:
+        return list(self._scalars(self.statement()).unique())
+
+    def first(self):
+        return self._scalars(self.statement().limit(1)).first()
+
+    def iter(self, batch_size: int = 500):
+        """Stream the rows, fetching `batch_size` of them at a time"""
+        stmt = self.statement().execution_options(yield_per=batch_size)
+        yield from self._scalars(stmt)
+
+    def count(self) -> int:
+        stmt = select(func.count()).select_from(self.cls).filter(*self._conditions)
+        return self._run(lambda: g.db_session.scalar(stmt))
+
+    def _scalars(self, stmt):
+        return self._run(lambda: g.db_session.scalars(stmt))
+
+    def _run(self, fn):
+        try:
+            return fn()
+        except Exception as e:
+            print("Exception Occured When working with DataBase", e)
+            if g.db_session.is_active:
+                g.db_session.rollback()
+            raise
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, String, Index
 from sqlalchemy.orm import mapped_column, relationship
 from sqlalchemy.dialects.mysql import ENUM
 
@@ -10,6 +10,9 @@ from app.utils.error_extensions import NotFound
 
 class Module(BaseModel, Base):
     __tablename__ = "modules"
+    __table_args__ = (
+        Index("ix_modules_course_id_status", "course_id", "status"),
+    )
 
     title = mapped_column(String(60), nullable=False)
     description = mapped_column(String(300))
@@ -17,6 +20,8 @@ class Module(BaseModel, Base):
 
     course_id = mapped_column(ForeignKey("courses.id"), nullable=False)
     course = relationship("Course", back_populates="modules")
+    # Read only, used to eager load a module's projects for a cohort
+    cohort_projects = relationship("CohortProject", viewonly=True, order_by="CohortProject.position")
 
     def __init__(self, **kwargs):
         """
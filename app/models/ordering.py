@@ -0,0 +1,191 @@
+"""
+Gap based ordering for the models that are kept as linked lists
+(AdminProject, CohortProject and Cohort).
+
+Every row carries an indexed integer `position`. Rows are read in
+order with a single ORDER BY position and a row is inserted or moved
+by giving it a position between its new neighbours. Positions are
+spaced POSITION_GAP apart so most writes only touch the moved row;
+when two neighbours run out of room the siblings are renumbered.
+The next/prev pointers are still maintained for API clients.
+
+order_linked rebuilds the order from those pointers in linear time.
+It is used for rows that have no position yet.
+"""
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import BigInteger
+from sqlalchemy.orm import mapped_column
+
+POSITION_GAP = 1024
+
+
+class LinkedOrder(NamedTuple):
+    """
+    Result of order_linked
+    Attributes:
+        nodes (list): every input node exactly once, in list order.
+        orphans (list): nodes that cannot be reached from the head of the list.
+        has_cycle (bool): True if following the next pointers loops back on itself.
+    """
+    nodes: list
+    orphans: list
+    has_cycle: bool
+
+
+def _stable_key(node):
+    created_at = getattr(node, "created_at", None)
+    if created_at is None:
+        created_at = datetime.min
+    elif isinstance(created_at, str):
+        # raw rows from some drivers come back as ISO strings
+        created_at = datetime.fromisoformat(created_at)
+    return (created_at.replace(tzinfo=None), node.id)
+
+def order_linked(nodes, prev_attr: str, next_attr: str) -> LinkedOrder:
+    """
+        Order `nodes` by following their next pointers, in O(n).
+
+        The head is the oldest node whose prev pointer is empty or
+        points outside `nodes`. Nodes that cannot be reached from it
+        (broken or cyclic lists) are appended fragment by fragment,
+        oldest fragment first, so the result is deterministic and
+        always contains every node once.
+    """
+    by_id = {node.id: node for node in nodes}
+    heads = sorted((node for node in nodes if getattr(node, prev_attr) not in by_id), key=_stable_key)
+
+    ordered = []
+    index = {}
+
+    def walk(node) -> bool:
+        """Append the fragment starting at node, True if it loops back on itself"""
+        start = len(ordered)
+        while node is not None and node.id not in index:
+            index[node.id] = len(ordered)
+            ordered.append(node)
+            node = by_id.get(getattr(node, next_attr))
+        return node is not None and index[node.id] >= start
+
+    has_cycle = False
+    reachable = 0
+    for i, head in enumerate(heads):
+        has_cycle = walk(head) or has_cycle
+        if i == 0:
+            reachable = len(ordered)
+
+    if len(ordered) < len(nodes):
+        # whatever is left only belongs to cycles without a head
+        has_cycle = True
+        for node in sorted(nodes, key=_stable_key):
+            if node.id not in index:
+                walk(node)
+
+    return LinkedOrder(ordered, ordered[reachable:], has_cycle)
+
+def position_between(before, after):
+    """
+        Position for a row placed between `before` and `after`
+        (either may be None at the ends of the list).
+        Returns None when there is no room left or a neighbour
+        has no position yet, the siblings must then be renumbered.
+    """
+    if (before is not None and before.position is None) or \
+            (after is not None and after.position is None):
+        return None
+    if before is None and after is None:
+        return POSITION_GAP
+    if before is None:
+        return after.position - POSITION_GAP
+    if after is None:
+        return before.position + POSITION_GAP
+    if after.position - before.position < 2:
+        return None
+    return (before.position + after.position) // 2
+
+
+class PositionMixin:
+    """
+    Class:
+        PositionMixin: adds the `position` column and the helpers to
+            place a row between two siblings
+
+        Models using it declare:
+            position_scope_keys: columns whose values select the siblings of a row
+            sort_linked: orders a list of siblings by walking the linked list,
+                the fallback of in_order for rows without a position
+    """
+    position = mapped_column(BigInteger, nullable=True)
+    position_scope_keys: tuple = ()
+
+    def position_scope(self) -> dict:
+        """Filters selecting the siblings of this object"""
+        return {key: getattr(self, key) for key in self.position_scope_keys}
+
+    def place_between(self, before, after) -> None:
+        """
+            Give the object a position between the `before` and
+            `after` siblings, renumbering the siblings if needed.
+        """
+        position = position_between(before, after)
+        if position is None:
+            self.renumber_siblings()
+            position = position_between(before, after)
+        self.position = position
+
+    @classmethod
+    def in_order(cls, siblings: list) -> list:
+        """
+            Siblings in list order: by position, walking the linked
+            list only when some of them have no position yet.
+        """
+        if all(item.position is not None for item in siblings):
+            return sorted(siblings, key=lambda item: item.position)
+        return cls.sort_linked(siblings)
+
+    @classmethod
+    def fetch_in_order(cls, *options, **filters) -> list:
+        """Rows matching `filters` read with ORDER BY position, see in_order"""
+        rows = cls.query().filter(**filters).options(*options).order_by(cls.position).all()
+        return cls.in_order(rows)
+
+    @classmethod
+    def head_of(cls, siblings: list):
+        """The sibling with the lowest position, None for an empty list"""
+        if not siblings:
+            return None
+        if all(item.position is not None for item in siblings):
+            return min(siblings, key=lambda item: item.position)
+        return cls.sort_linked(siblings)[0]
+
+    @classmethod
+    def tail_of(cls, siblings: list):
+        """The sibling with the highest position, None for an empty list"""
+        if not siblings:
+            return None
+        if all(item.position is not None for item in siblings):
+            return max(siblings, key=lambda item: item.position)
+        return cls.sort_linked(siblings)[-1]
+
+    def lock_siblings(self) -> list:
+        """
+            Lock every sibling row (SELECT ... FOR UPDATE) for the rest
+            of the current transaction and return them reloaded, by position.
+            Concurrent reorders of the same list then run one at a time.
+        """
+        cls = type(self)
+        return cls.query().filter(**self.position_scope()).order_by(cls.position).for_update().all()
+
+    def renumber_siblings(self) -> None:
+        """
+            Respace the positions of every sibling except this object.
+            Siblings without a position yet (rows created before
+            positions existed) are ordered by walking the linked list.
+        """
+        cls = type(self)
+        siblings = cls.fetch_in_order(**self.position_scope())
+        others = [item for item in siblings if item is not self]
+
+        for i, item in enumerate(others, 1):
+            item.position = i * POSITION_GAP
@@ -1,18 +1,22 @@
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Date, Integer, String, ForeignKey, Text, UniqueConstraint, Float
-from sqlalchemy.dialects.mysql import LONGTEXT, ENUM
-from sqlalchemy.orm import mapped_column, relationship
+from flask import g
+from sqlalchemy import DateTime, Date, Integer, String, ForeignKey, Text, UniqueConstraint, Float, Index, select
+from sqlalchemy.dialects.mysql import ENUM
+from sqlalchemy.orm import column_property, declared_attr, mapped_column, relationship, undefer, validates
 
 from app.models.base import Base
 from app.models.basemodel import BaseModel
+from app.models.ordering import PositionMixin, order_linked
+from app.models.project_content import ProjectContent
 from app.utils.helpers import has_required_keys
 from app.utils.error_extensions import NotFound
 
-class BaseProject(BaseModel):
+class BaseProject(PositionMixin, BaseModel):
     title = mapped_column(String(300), nullable=False)
     description = mapped_column(String(300))
-    markdown_content = mapped_column(LONGTEXT)
+    # The body lives in project_contents, see app.models.project_content
+    content_hash = mapped_column(String(64), nullable=True)
 
     module_id = mapped_column(ForeignKey("modules.id"), nullable=False)
     author_id = mapped_column(ForeignKey("admins.id"), nullable=False)
@@ -28,42 +32,51 @@ class BaseProject(BaseModel):
         if not accurate:
             raise ValueError(f"Missing required key(s): {', '.join(missing)}")
 
+    @declared_attr
+    def markdown_content(cls):
+        # read from the shared body, only by the views rendering it (see search_with_content)
+        return column_property(
+            select(ProjectContent.markdown_content)
+            .where(ProjectContent.content_hash == cls.content_hash)
+            .correlate_except(ProjectContent).scalar_subquery(),
+            deferred=True)
+
+    @validates("markdown_content")
+    def store_content(self, key, content):
+        # copy on write: a new body gets its own hash, shared bodies never change
+        self.content_hash = ProjectContent.store(content)
+        return content
+
+    @classmethod
+    def search_with_content(cls, **filters):
+        """
+            search() for the views rendering the project body: the
+            deferred markdown_content is loaded by the same query
+        """
+        projects = cls.fetch(undefer(cls.markdown_content), **filters)
+        return projects[0] if len(projects) == 1 else projects if projects else None
+
     def sort_projects(projects):
+        """
+            Order projects by walking their next/prev pointers,
+            see app.models.ordering.order_linked
+        """
         if projects is None or projects == []: return projects
         if not isinstance(projects, list): return projects
 
-        # Retrieve the head of the list
-        head = None
-        for project in projects:
-            if project.prev_project_id is None:
-                head = project
-                break
-
-            is_head = True
-            prev_project_id = project.prev_project_id
-            for project in projects:
-                if project.id == prev_project_id:
-                    is_head = False
-                    break
-            if is_head:
-                head = project
-                break
-
-        # sorting process
-        tmp = head
-        tmp_list = [head]
-        while tmp is not None and tmp.next_project_id is not None:
-            for project in projects:
-                if project.id == tmp.next_project_id:
-                    tmp_list.append(project)
-                    tmp = project
-                    break
-
-        projects = tmp_list
-        return projects
+        return order_linked(projects, "prev_project_id", "next_project_id").nodes
+
+    @staticmethod
+    def sort_linked(projects):
+        return BaseProject.sort_projects(projects)
 
 class AdminProject(BaseProject, Base):
     __tablename__ = "admin_projects"
+    __table_args__ = (
+        Index("ix_admin_projects_course_id_position", "course_id", "position"),
+        Index("ix_admin_projects_course_id_prev_project_id", "course_id", "prev_project_id"),
+    )
+    position_scope_keys = ("course_id",)
 
     status = mapped_column(ENUM("deleted", "draft", "published"), default="published", nullable=False)
     # How many days the project will last
@@ -93,45 +106,50 @@ class AdminProject(BaseProject, Base):
         self.insert_project_at_correct_node(**kwargs)
 
     def insert_project_at_correct_node(self, **kwargs):
-        # insert Project at the correct node
-        if AdminProject.search(course_id=kwargs["course_id"]) is None:
-            # list is empty therefore insert as head of the list
-            self.prev_project_id = None
-            self.next_project_id = None
+        # insert Project at the correct node, as one transaction holding
+        # a lock on the list so concurrent edits cannot interleave
+        with g.db_storage.transaction():
+            siblings = {project.id: project for project in self.lock_siblings()}
+            if not siblings:
+                # list is empty therefore insert as head of the list
+                self.prev_project_id = None
+                self.next_project_id = None
+                self.place_between(None, None)
+                self.save()
+                return
+
+            prev_project_id = kwargs.get("prev_project_id")
+            if not prev_project_id:
+                head_project = AdminProject.head_of(list(siblings.values()))
+
             self.save()
-            return
 
-        prev_project_id = kwargs.get("prev_project_id")
-        if not prev_project_id:
-            head_project = AdminProject.search(course_id=kwargs["course_id"], prev_project_id=None)
-        
-        self.save()
-        self.refresh()
-
-        if not prev_project_id:
-            # Make first project in list
-            head_project.prev_project_id = self.id
-            head_project.save()
-
-            self.next_project_id = head_project.id
-        else:
-            prev_project = AdminProject.search(id=prev_project_id)
-            if prev_project is None:
-                self.delete()
-                raise NotFound("Previous Project Not Found")
-
-            next_p_id = prev_project.next_project_id
-            prev_project.next_project_id = self.id
-            prev_project.save()
-            self.next_project_id = next_p_id
-
-            # Check if the next project exists
-            next_project = AdminProject.search(id=next_p_id)
-            if next_project:
-                next_project.prev_project_id = self.id
-                next_project.save()
+            if not prev_project_id:
+                # Make first project in list
+                head_project.prev_project_id = self.id
+                head_project.save()
 
-        self.save()
+                self.next_project_id = head_project.id
+                self.place_between(None, head_project)
+            else:
+                prev_project = siblings.get(prev_project_id)
+                if prev_project is None:
+                    # leaving the block rolls the insert back
+                    raise NotFound("Previous Project Not Found")
+
+                next_p_id = prev_project.next_project_id
+                prev_project.next_project_id = self.id
+                prev_project.save()
+                self.next_project_id = next_p_id
+
+                # Check if the next project exists
+                next_project = siblings.get(next_p_id)
+                if next_project:
+                    next_project.prev_project_id = self.id
+                    next_project.save()
+                self.place_between(prev_project, next_project)
+
+            self.save()
 
     def update(self, **kwargs: dict) -> None:
         """
@@ -152,10 +170,12 @@ class AdminProject(BaseProject, Base):
                 in the linked list.
 
             """
-            next_project = AdminProject.search(id=self.next_project_id)
-            prev_project = AdminProject.search(id=self.prev_project_id)
-            new_prev_project = AdminProject.search(id=kwargs.get("prev_project_id"))
-            head_project = AdminProject.search(course_id=self.course_id, prev_project_id=None)
+            # Locks are held until the caller's save() or transaction commits
+            siblings = {project.id: project for project in self.lock_siblings()}
+            next_project = siblings.get(self.next_project_id)
+            prev_project = siblings.get(self.prev_project_id)
+            new_prev_project = siblings.get(kwargs.get("prev_project_id"))
+            head_project = AdminProject.head_of(list(siblings.values()))
 
             # Detach connection from previous spot
             if next_project:
@@ -171,18 +191,27 @@ class AdminProject(BaseProject, Base):
                 self.prev_project_id = new_prev_project.id
                 self.next_project_id = new_prev_project.next_project_id
 
-                if new_prev_project.next_project:
-                    new_prev_project.next_project.prev_project_id = self.id
+                new_next_project = siblings.get(new_prev_project.next_project_id)
+                if new_next_project:
+                    new_next_project.prev_project_id = self.id
 
                 new_prev_project.next_project_id = self.id
+                self.place_between(new_prev_project, new_next_project)
             elif new_prev_project is None and head_project:
                 self.next_project_id = head_project.id
                 head_project.prev_project_id = self.id
+                self.place_between(None, head_project)
 
         super().update(**kwargs)
 
 class CohortProject(BaseProject, Base):
     __tablename__ = "cohort_projects"
+    __table_args__ = (
+        Index("ix_cohort_projects_cohort_id_position", "cohort_id", "position"),
+        Index("ix_cohort_projects_cohort_id_status", "cohort_id", "status"),
+        Index("ix_cohort_projects_cohort_id_next_project_id", "cohort_id", "next_project_id"),
+    )
+    position_scope_keys = ("cohort_id",)
 
     # first attempt and second attempt start date
     fa_start_date = mapped_column(Date, nullable=False)
@@ -197,6 +226,8 @@ class CohortProject(BaseProject, Base):
 
     next_project = relationship("CohortProject", remote_side="CohortProject.id", foreign_keys=[next_project_id])
     prev_project = relationship("CohortProject", remote_side="CohortProject.id", foreign_keys=[prev_project_id])
+    # Read only, used to eager load submissions alongside the project
+    student_projects = relationship("StudentProject", viewonly=True)
 
     def __init__(self, **kwargs):
         """
@@ -212,45 +243,50 @@ class CohortProject(BaseProject, Base):
         self.insert_project_at_correct_node(**kwargs)
 
     def insert_project_at_correct_node(self, **kwargs):
-        # insert Project at the correct node
-        if CohortProject.search(cohort_id=kwargs["cohort_id"]) is None:
-            # list is empty therefore insert as head of the list
-            self.prev_project_id = None
-            self.next_project_id = None
+        # insert Project at the correct node, as one transaction holding
+        # a lock on the list so concurrent edits cannot interleave
+        with g.db_storage.transaction():
+            siblings = {project.id: project for project in self.lock_siblings()}
+            if not siblings:
+                # list is empty therefore insert as head of the list
+                self.prev_project_id = None
+                self.next_project_id = None
+                self.place_between(None, None)
+                self.save()
+                return
+
+            prev_project_id = kwargs.get("prev_project_id")
+            if not prev_project_id:
+                head_project = CohortProject.head_of(list(siblings.values()))
+
             self.save()
-            return
 
-        prev_project_id = kwargs.get("prev_project_id")
-        if not prev_project_id:
-            head_project = CohortProject.search(cohort_id=kwargs["cohort_id"], prev_project_id=None)
-        
-        self.save()
-        self.refresh()
-
-        if not prev_project_id:
-            # Make first project in list
-            head_project.prev_project_id = self.id
-            head_project.save()
-
-            self.next_project_id = head_project.id
-        else:
-            prev_project = CohortProject.search(id=prev_project_id)
-            if prev_project is None:
-                self.delete()
-                raise NotFound("Previous Project Not Found")
-
-            next_p_id = prev_project.next_project_id
-            prev_project.next_project_id = self.id
-            prev_project.save()
-            self.next_project_id = next_p_id
-
-            # Check if the next project exists
-            next_project = CohortProject.search(id=next_p_id)
-            if next_project:
-                next_project.prev_project_id = self.id
-                next_project.save()
+            if not prev_project_id:
+                # Make first project in list
+                head_project.prev_project_id = self.id
+                head_project.save()
 
-        self.save()
+                self.next_project_id = head_project.id
+                self.place_between(None, head_project)
+            else:
+                prev_project = siblings.get(prev_project_id)
+                if prev_project is None:
+                    # leaving the block rolls the insert back
+                    raise NotFound("Previous Project Not Found")
+
+                next_p_id = prev_project.next_project_id
+                prev_project.next_project_id = self.id
+                prev_project.save()
+                self.next_project_id = next_p_id
+
+                # Check if the next project exists
+                next_project = siblings.get(next_p_id)
+                if next_project:
+                    next_project.prev_project_id = self.id
+                    next_project.save()
+                self.place_between(prev_project, next_project)
+
+            self.save()
 
     def update(self, **kwargs: dict) -> None:
         """
@@ -271,10 +307,12 @@ class CohortProject(BaseProject, Base):
                 in the linked list.
 
             """
-            next_project = CohortProject.search(id=self.next_project_id)
-            prev_project = CohortProject.search(id=self.prev_project_id)
-            new_prev_project = CohortProject.search(id=kwargs.get("prev_project_id"))
-            head_project = CohortProject.search(cohort_id=self.cohort_id, prev_project_id=None)
+            # Locks are held until the caller's save() or transaction commits
+            siblings = {project.id: project for project in self.lock_siblings()}
+            next_project = siblings.get(self.next_project_id)
+            prev_project = siblings.get(self.prev_project_id)
+            new_prev_project = siblings.get(kwargs.get("prev_project_id"))
+            head_project = CohortProject.head_of(list(siblings.values()))
 
             # Detach connection from previous spot
             if next_project:
@@ -290,13 +328,16 @@ class CohortProject(BaseProject, Base):
                 self.prev_project_id = new_prev_project.id
                 self.next_project_id = new_prev_project.next_project_id
 
-                if new_prev_project.next_project:
-                    new_prev_project.next_project.prev_project_id = self.id
+                new_next_project = siblings.get(new_prev_project.next_project_id)
+                if new_next_project:
+                    new_next_project.prev_project_id = self.id
 
                 new_prev_project.next_project_id = self.id
+                self.place_between(new_prev_project, new_next_project)
             elif new_prev_project is None and head_project:
                 self.next_project_id = head_project.id
                 head_project.prev_project_id = self.id
+                self.place_between(None, head_project)
 
         super().update(**kwargs)
 
@@ -305,6 +346,8 @@ class StudentProject(BaseModel, Base):
     __tablename__ = "student_projects"
     __table_args__ = (
         UniqueConstraint('student_id', 'cohort_project_id', name='unique_student_id__cohort_project_id'),
+        # mentor assignment and grading queues
+        Index("ix_student_projects_cohort_id_status_assigned_to", "cohort_id", "status", "assigned_to"),
     )
 
     cohort_id = mapped_column(ForeignKey("cohorts.id"), nullable=False)
@@ -0,0 +1,131 @@
+"""
+Content addressed storage of project bodies.
+
+Project bodies (markdown) are stored once per distinct content in
+project_contents, keyed by their sha256 `content_hash`. Admin and
+cohort projects only hold the hash, so releasing a project to 200
+cohorts shares one body instead of copying it 200 times. Bodies are
+never changed in place: writing a project's markdown_content stores
+the new body under its own hash (copy on write), which leaves every
+other project pointing at the old one untouched.
+
+Print how much storage the sharing saves with:
+
+    python -m app.models.project_content
+"""
+import hashlib
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from flask import g
+from sqlalchemy import Integer, String, func, select
+from sqlalchemy.dialects.mysql import LONGTEXT, insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import mapped_column
+
+from app.models.base import Base
+from app.models.basemodel import BaseModel
+from app.utils.helpers import has_required_keys
+
+
+def hash_content(content):
+    """sha256 hex digest of a project body, the ETag of its content"""
+    if content is None: return None
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+class ProjectContent(BaseModel, Base):
+    __tablename__ = "project_contents"
+
+    content_hash = mapped_column(String(64), nullable=False, unique=True)
+    markdown_content = mapped_column(LONGTEXT, nullable=False)
+    # size of the utf-8 encoded body in bytes
+    size = mapped_column(Integer, nullable=False)
+
+    def __init__(self, **kwargs):
+        """
+        """
+        super().__init__()
+        [setattr(self, key, value) for key, value in kwargs.items()]
+
+        required_keys = {"content_hash", "markdown_content", "size"}
+        accurate, missing = has_required_keys(kwargs, required_keys)
+        if not accurate:
+            raise ValueError(f"Missing required key(s): {', '.join(missing)}")
+
+    @classmethod
+    def store(cls, content):
+        """
+            Make sure `content` is stored and return its hash,
+            None for no content. Stored bodies are reused.
+        """
+        if content is None: return None
+        content_hash = hash_content(content)
+        session = g.db_session
+        with session.no_autoflush:
+            if session.scalar(select(cls.id).where(cls.content_hash == content_hash)) is None:
+                # another request may store the same body meanwhile: the unique
+                # content_hash turns the second insert into a no-op, not an error
+                now = datetime.now(timezone.utc)
+                session.execute(insert_ignoring_duplicates(cls.__table__, {
+                    "id": str(uuid4()), "created_at": now, "updated_at": now,
+                    "content_hash": content_hash, "markdown_content": content,
+                    "size": len(content.encode("utf-8")),
+                }))
+        return content_hash
+
+def insert_ignoring_duplicates(table, values: dict):
+    """INSERT of `values` that does nothing when a unique key already exists"""
+    if g.db_session.get_bind().dialect.name == "mysql":
+        stmt = mysql_insert(table).values(values)
+        return stmt.on_duplicate_key_update(content_hash=stmt.inserted.content_hash)
+    return sqlite_insert(table).values(values).on_conflict_do_nothing()
+
+def storage_report() -> dict:
+    """
+        Storage used by project bodies:
+            bodies / stored_bytes: distinct bodies and their total size
+            references / referenced_bytes: projects with a body and the
+                size they would take with a copy each
+            saved_bytes: referenced_bytes minus the stored bytes they share
+            unreferenced_bodies / unreferenced_bytes: bodies no project uses
+    """
+    from app.models.project import AdminProject, CohortProject
+
+    def references(cls):
+        stmt = select(func.count(), func.coalesce(func.sum(ProjectContent.size), 0))\
+            .select_from(cls).join(ProjectContent, ProjectContent.content_hash == cls.content_hash)
+        return g.db_session.execute(stmt).one()
+
+    bodies, stored_bytes = g.db_session.execute(
+        select(func.count(), func.coalesce(func.sum(ProjectContent.size), 0))).one()
+    used = select(AdminProject.content_hash).union(select(CohortProject.content_hash)).subquery()
+    unreferenced, unreferenced_bytes = g.db_session.execute(
+        select(func.count(), func.coalesce(func.sum(ProjectContent.size), 0))
+        .where(ProjectContent.content_hash.not_in(select(used.c.content_hash)
+                                                  .where(used.c.content_hash.is_not(None))))).one()
+    admin_refs, admin_bytes = references(AdminProject)
+    cohort_refs, cohort_bytes = references(CohortProject)
+
+    return {
+        "bodies": bodies,
+        "stored_bytes": int(stored_bytes),
+        "references": admin_refs + cohort_refs,
+        "referenced_bytes": int(admin_bytes + cohort_bytes),
+        "saved_bytes": int(admin_bytes + cohort_bytes) - (int(stored_bytes) - int(unreferenced_bytes)),
+        "unreferenced_bodies": unreferenced,
+        "unreferenced_bytes": int(unreferenced_bytes),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    from app import create_app
+    from app.models import storage
+
+    with create_app().app_context():
+        g.db_storage = storage
+        g.db_session = storage.load_session()
+        try:
+            print(json.dumps(storage_report(), indent=2))
+        finally:
+            storage.close()
@@ -0,0 +1,75 @@
+"""
+Column level serialization of models, used by BaseModel.to_dict
+
+A Serializer is built once per mapped class from the mapper's column
+list. It reads the loaded column values straight from the instance
+dictionary, so relationships, SQLAlchemy state and columns that were
+never loaded (deferred or left out by load_only) are skipped without
+a query, and nothing is deep copied: column values are immutable
+(strings, numbers, dates), only the values of a column type listed in
+CONVERTERS are converted.
+
+Example:
+    serializer = serializer_for(Cohort)
+    serializer(cohort, exclude={"position"})
+"""
+import enum
+from typing import Iterable, Optional
+
+from sqlalchemy import Enum, inspect
+
+
+def enum_value(value):
+    """Python enums (Enum columns with an enum_class) become their value"""
+    return value.value if isinstance(value, enum.Enum) else value
+
+# column type -> converter, dates and datetimes are left to the JSON provider
+CONVERTERS = {
+    Enum: enum_value,
+}
+
+_serializers = {}
+
+
+def converter_for(column_type):
+    for type_, converter in CONVERTERS.items():
+        if isinstance(column_type, type_) and (type_ is not Enum or column_type.enum_class):
+            return converter
+    return None
+
+
+class Serializer:
+    """
+    Class:
+        Serializer: turns instances of one mapped class into dictionaries
+
+        :attributes
+            fields: (attribute key, converter or None) per column, in mapper order
+    """
+
+    def __init__(self, cls) -> None:
+        self.fields = tuple(
+            (attr.key, converter_for(attr.columns[0].type))
+            for attr in inspect(cls).column_attrs
+        )
+
+    def __call__(self, obj, include: Optional[Iterable[str]] = None,
+                 exclude: Optional[Iterable[str]] = None) -> dict:
+        values = obj.__dict__
+        include = None if include is None else set(include)
+        exclude = set(exclude or ())
+        result = {}
+        for key, convert in self.fields:
+            if key not in values or key in exclude: continue
+            if include is not None and key not in include: continue
+            value = values[key]
+            result[key] = convert(value) if convert is not None and value is not None else value
+        return result
+
+
+def serializer_for(cls) -> Serializer:
+    """The serializer of `cls`, built on first use"""
+    serializer = _serializers.get(cls)
+    if serializer is None:
+        serializer = _serializers[cls] = Serializer(cls)
+    return serializer
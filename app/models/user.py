@@ -1,10 +1,11 @@
-from sqlalchemy import Integer, String, Enum, ForeignKey
+from sqlalchemy import Integer, String, Enum, ForeignKey, Index
 from sqlalchemy.orm import mapped_column, relationship
 from flask_bcrypt import generate_password_hash, check_password_hash
 
 from app.models.basemodel import BaseModel
 from app.models.base import Base
 from app.utils.helpers import has_required_keys
+from app.utils.user_cache import forget_after_commit
 
 
 class User(BaseModel):
@@ -27,6 +28,15 @@ class User(BaseModel):
     username = mapped_column(String(60), nullable=False, unique=True)
     phone = mapped_column(String(45))
     status = mapped_column(Enum("active", "inactive", "suspended", "deleted"), default="active", nullable=False)
+    # bumped whenever the claims embedded in issued tokens go stale, see token_claims
+    token_version = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # bumped when the user has to log in again, see refresh_claims
+    session_version = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    # changing any of these invalidates the access tokens already issued to the user
+    CLAIM_FIELDS = ("status",)
+    # statuses that end every session of the user
+    LOCKED_STATUSES = ("suspended", "deleted")
 
     def __init__(self, **kwargs):
         """
@@ -49,10 +59,53 @@ class User(BaseModel):
         self.password = generate_password_hash(self.password).decode()
 
     def update(self, **kwargs):
+        locked = kwargs.get("password") or (
+            kwargs.get("status") in self.LOCKED_STATUSES and kwargs["status"] != self.status)
+        stale = any(key in kwargs and kwargs[key] != getattr(self, key, None) for key in self.CLAIM_FIELDS)
         if kwargs.get("password"):
             setattr(self, "password", generate_password_hash(kwargs["password"]))
             del kwargs["password"]
         super().update(**kwargs)
+        if locked:
+            self.end_sessions()
+        elif stale:
+            self.revoke_tokens()
+        self.forget()
+
+    def revoke_tokens(self) -> None:
+        """Invalidate the access tokens issued so far, a refresh issues new ones with fresh claims"""
+        self.token_version = (self.token_version or 0) + 1
+
+    def end_sessions(self) -> None:
+        """Invalidate every token issued so far, refresh tokens included: the user has to log in again"""
+        self.revoke_tokens()
+        self.session_version = (self.session_version or 0) + 1
+
+    def token_claims(self) -> dict:
+        """
+        Claims signed into the user's tokens so requests can be
+        authorized and scoped without loading the user.
+
+        Returns:
+            dict: the token version and the user's status.
+        """
+        return {"ver": self.token_version or 0, "status": self.status}
+
+    def refresh_claims(self) -> dict:
+        """Claims signed into the user's refresh tokens: the session version"""
+        return {"sver": self.session_version or 0}
+
+    def save(self):
+        self.forget()
+        return super().save()
+
+    def delete(self):
+        self.forget()
+        return super().delete()
+
+    def forget(self) -> None:
+        """Drop this user from the JWT user cache once the change commits (see app.utils.user_cache)"""
+        forget_after_commit(type(self).__name__.lower(), self.id)
 
     def check_password(self, password: str) -> bool:
         """
@@ -143,6 +196,10 @@ class Mentor(User, Base):
         __init__(**kwargs): Initializes a Mentor instance with given keyword arguments.
     """
     __tablename__ = "mentors"
+    __table_args__ = (
+        # keyset pagination of the mentor list
+        Index("ix_mentors_created_at_id", "created_at", "id"),
+    )
     cohorts = relationship("MentorCohort", back_populates="mentor")
 
     def __init__(self, **kwargs):
@@ -164,12 +221,19 @@ class Student(User, Base):
         __init__(**kwargs): Initializes a new instance of the Student class.
     """
     __tablename__ = "students"
+    __table_args__ = (
+        # students of a cohort, in keyset pagination order
+        Index("ix_students_cohort_id_created_at_id", "cohort_id", "created_at", "id"),
+        Index("ix_students_course_id_cohort_id", "course_id", "cohort_id"),
+    )
     points = mapped_column(Integer, nullable=False, default=0)
     course_id = mapped_column(ForeignKey("courses.id"), nullable=False)
     cohort_id = mapped_column(ForeignKey("cohorts.id"))
 
     cohort = relationship("Cohort", back_populates="students")
 
+    CLAIM_FIELDS = User.CLAIM_FIELDS + ("course_id", "cohort_id")
+
     def __init__(self, **kwargs):
         """
         Initialize a new instance of the class.
@@ -182,4 +246,8 @@ class Student(User, Base):
         required_keys = {"course_id"}
         accurate, missing = has_required_keys(kwargs, required_keys)
         if not accurate:
-            raise ValueError(f"Missing required key(s): {', '.join(missing)}")
\ No newline at end of file
+            raise ValueError(f"Missing required key(s): {', '.join(missing)}")
+
+    def token_claims(self) -> dict:
+        """Adds the course and cohort the student's requests are scoped to"""
+        return {**super().token_claims(), "course_id": self.course_id, "cohort_id": self.cohort_id}
\ No newline at end of file
@@ -4,17 +4,27 @@ Functions:
     extract_request_data(type) -> dict or tuple:
     has_required_keys(dictionary: dict, required_keys: set) -> tuple:
     retrieve_model_info(obj: object, fields: list) -> dict:
-    format_json_responses(status_code=200, data=None, message=None) -> tuple:
+    format_json_responses(status_code=200, data=None, message=None, etag=None) -> tuple:
+    extract_pagination_args(cursor_arg: str) -> tuple:
+    encode_cursor(values: tuple) -> str:
+    decode_cursor(cursor: str) -> tuple:
+    conditional_get(validator: function) -> function:
     admin_required(f: function) -> function:
     handle_endpoint_exceptions(f: function) -> function:
 """
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
 from functools import wraps
 
-from flask import jsonify, request
+from flask import jsonify, make_response, request
 from flask_jwt_extended import current_user, get_jwt_identity
 
 from .error_extensions import BadRequest, NotFound, UnAuthenticated
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 
 def extract_request_data(type):
     """
@@ -32,6 +42,64 @@ def extract_request_data(type):
     else:
         return None
 
+def extract_pagination_args(cursor_arg: str = "cursor"):
+    """
+    Extract the `limit` and `cursor` query arguments of a paginated list endpoint.
+
+    Args:
+        cursor_arg (str): Name of the cursor argument, for pages listing more than one collection.
+
+    Returns:
+        tuple: The page size (capped at MAX_PAGE_SIZE) and the decoded cursor or None.
+
+    Raises:
+        BadRequest: If limit is not a positive integer or the cursor is malformed.
+    """
+    args = extract_request_data("args")
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise BadRequest("limit must be an integer")
+    if limit < 1:
+        raise BadRequest("limit must be greater than 0")
+    return min(limit, MAX_PAGE_SIZE), decode_cursor(args.get(cursor_arg))
+
+def encode_cursor(values):
+    """
+    Encode the (created_at, id) keyset of the last row of a page into an opaque string.
+
+    Args:
+        values (tuple): created_at and id of the last row, or None.
+
+    Returns:
+        str: The cursor clients send back to get the next page, None if there is no next page.
+    """
+    if values is None:
+        return None
+    created_at, id = values
+    return urlsafe_b64encode(json.dumps([created_at.isoformat(), id]).encode()).decode()
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): The cursor sent by the client, may be None.
+
+    Returns:
+        tuple: created_at and id of the last row of the previous page, None if no cursor was sent.
+
+    Raises:
+        BadRequest: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        created_at, id = json.loads(urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), id
+    except (ValueError, TypeError):
+        raise BadRequest("Invalid cursor")
+
 def has_required_keys(dictionary: dict, required_keys: set):
     """
     Check if a dictionary contains all required keys.
@@ -87,7 +155,7 @@ def retrieve_model_info(obj: object, fields: list) -> dict:
     """
     return {field: getattr(obj, field, None) for field in fields}
 
-def format_json_responses(status_code=200, data=None, message=None):
+def format_json_responses(status_code=200, data=None, message=None, etag=None):
     """
     Formats a JSON response for an HTTP request.
 
@@ -95,10 +163,15 @@ def format_json_responses(status_code=200, data=None, message=None):
         status_code (int, optional): The HTTP status code for the response. Defaults to 200.
         data (dict or list, optional): The data to include in the response. Defaults to None.
         message (str, optional): A message to include in the response. Defaults to None.
+        etag (str, optional): The ETag of the data. A request whose If-None-Match
+            matches it gets an empty 304 response instead. Defaults to None.
 
     Returns:
         tuple: A tuple containing the JSON response and the status code.
     """
+    if etag is not None and status_code == 200 and etag in request.if_none_match:
+        return _with_etag(make_response("", 304), etag), 304
+
     response = {
         "statusCode": status_code,
     }
@@ -106,8 +179,45 @@ def format_json_responses(status_code=200, data=None, message=None):
         response["data"] = data
     if message is not None:
         response["message"] = message
-    return jsonify(response), status_code
+    response = jsonify(response)
+    if etag is not None:
+        _with_etag(response, etag)
+    return response, status_code
+
+def _with_etag(response, etag):
+    response.set_etag(etag)
+    # the pages are per user: caches may keep them but must revalidate
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+def conditional_get(validator):
+    """
+    A decorator answering conditional GET requests before the view runs.
+
+    `validator` is called with the arguments of the view and returns the
+    ETag of the page, computed much more cheaply than the page itself
+    (see app.utils.etags). A request whose If-None-Match matches it gets
+    a 304 without the view running, other responses carry the ETag.
 
+    Args:
+        validator (function): Returns the ETag of the page.
+
+    Returns:
+        function: The decorator.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # computed before the payload: a change in between only costs a 200 later
+            etag = validator(*args, **kwargs)
+            if etag in request.if_none_match:
+                return format_json_responses(etag=etag)
+            response, status_code = f(*args, **kwargs)
+            if status_code == 200:
+                _with_etag(response, etag)
+            return response, status_code
+        return decorated_function
+    return decorator
 
 
 def admin_required(f):
@@ -0,0 +1,151 @@
+"""
+This module records the SQL statements run while serving a request.
+It is opt-in: set DB_QUERY_PROFILING=1 in the environment (or the
+DB_QUERY_PROFILING config key) to enable it.
+Every profiled request writes a JSON line to the `<app>.db_query_profile`
+logger: at INFO, or WARNING when it has N+1 queries. That logger is set
+to INFO unless a level was configured for it, and its records go to the
+handlers of the application logger.
+Functions:
+    fingerprint(statement: str) -> str:
+    init_query_profiling(app: Flask, engine: Engine = Engine) -> None:
+Classes:
+    QueryProfile: statement count, DB time and repeated statement shapes of one request.
+"""
+import os
+import re
+import json
+import logging
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|:\w+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape so that the same query run with
+    different parameters (or IN lists of different lengths) compares equal.
+
+    Args:
+        statement (str): The SQL statement sent to the database.
+
+    Returns:
+        str: The normalized statement.
+    """
+    shape = _STRING.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryProfile:
+    """
+    Statements run during a single request.
+    Attributes:
+        count (int): number of statements executed.
+        duration (float): total time spent in the database, in seconds.
+        fingerprints (Counter): how many times each statement shape ran.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[dict]:
+        """Statement shapes that ran more than `threshold` times (likely N+1 queries)"""
+        return [{"statement": shape, "count": count}
+                for shape, count in self.fingerprints.most_common() if count > threshold]
+
+    @property
+    def duration_ms(self) -> float:
+        return round(self.duration * 1000, 2)
+
+
+def _current_profile():
+    if not has_request_context():
+        return None
+    return g.get("query_profile")
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile()
+    if profile is None or not conn.info.get("query_start_time"):
+        return
+    profile.record(statement, time.perf_counter() - conn.info["query_start_time"].pop())
+
+def init_query_profiling(app, engine=Engine) -> None:
+    """
+    Register the engine listeners and request hooks that fill a QueryProfile
+    for every request, expose it through X-DB-* response headers and log
+    it as one JSON line.
+
+    Args:
+        app (Flask): The application to instrument.
+        engine (Engine): The engine to instrument. Defaults to the Engine
+            class, which covers every engine without creating one at startup.
+    """
+    app.config.setdefault("DB_QUERY_PROFILING", os.getenv("DB_QUERY_PROFILING") == "1")
+    app.config.setdefault("DB_N_PLUS_ONE_THRESHOLD", int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", 5)))
+
+    profile_logger = app.logger.getChild("db_query_profile")
+    if profile_logger.level == logging.NOTSET:
+        # the application logger only lets warnings through by default
+        profile_logger.setLevel(logging.INFO)
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def start_query_profile():
+        if app.config["DB_QUERY_PROFILING"]:
+            g.query_profile = QueryProfile()
+
+    @app.after_request
+    def add_query_profile_headers(response):
+        profile = g.get("query_profile")
+        if profile is None:
+            return response
+        threshold = app.config["DB_N_PLUS_ONE_THRESHOLD"]
+        response.headers["X-DB-Query-Count"] = str(profile.count)
+        response.headers["X-DB-Time-Ms"] = str(profile.duration_ms)
+        response.headers["X-DB-N-Plus-One"] = str(len(profile.repeated(threshold)))
+        return response
+
+    @app.teardown_request
+    def log_query_profile(exception=None):
+        profile = g.pop("query_profile", None)
+        if profile is None:
+            return
+        repeated = profile.repeated(app.config["DB_N_PLUS_ONE_THRESHOLD"])
+        line = json.dumps({
+            "event": "db_query_profile",
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "statements": profile.count,
+            "db_time_ms": profile.duration_ms,
+            "n_plus_one": repeated,
+        })
+        if repeated:
+            profile_logger.warning(line)
+        else:
+            profile_logger.info(line)
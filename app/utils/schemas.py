@@ -0,0 +1,87 @@
+"""
+Declarative response schemas with sparse fieldsets.
+
+A ResponseSchema lists the columns an endpoint may return and the ones
+it returns by default. Clients pick a subset with the `fields` query
+argument (e.g. ?fields=id,title), and the same selection decides which
+columns are loaded from the database, so payloads and queries shrink
+together. Sensitive columns can never be part of a schema, so they are
+neither loaded nor returned.
+
+Example:
+    PROJECT_LIST = ResponseSchema(AdminProject, exclude={"markdown_content"})
+
+    fields = PROJECT_LIST.requested_fields()
+    projects = AdminProject.query().options(PROJECT_LIST.load_only(fields)).all()
+    return [PROJECT_LIST.dump(project, fields) for project in projects]
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+from .error_extensions import BadRequest
+from .helpers import extract_request_data
+
+# columns no response may contain
+SENSITIVE_FIELDS = frozenset({"password", "token_version", "session_version"})
+
+
+class ResponseSchema:
+    """
+    Class:
+        ResponseSchema: the columns of one model an endpoint returns
+
+        :attributes
+            fields: the columns clients may request
+            default: the columns returned when `fields` is not sent
+            load: columns the service needs, always loaded but only
+                  returned when requested
+    """
+
+    def __init__(self, model, fields: Optional[Iterable[str]] = None,
+                 exclude: Iterable[str] = (), default: Optional[Iterable[str]] = None,
+                 load: Iterable[str] = ()) -> None:
+        """
+            @fields: allowed columns, all the model's columns if None
+            @exclude: columns left out of the default selection, still allowed
+            @default: the default selection, `fields` minus `exclude` if None
+        """
+        # mapper.columns does not configure the mappers, schemas can be declared at import time
+        columns = set(inspect(model).columns.keys())
+        self.model = model
+        self.fields = frozenset(columns if fields is None else fields) - SENSITIVE_FIELDS
+        self.default = frozenset(default if default is not None else self.fields - set(exclude))
+        self.load = frozenset(load)
+
+        unknown = (self.fields | self.default | self.load) - columns
+        if unknown:
+            raise ValueError(f"{model.__name__} has no column(s): {', '.join(sorted(unknown))}")
+        if (self.default | self.load) & SENSITIVE_FIELDS or not self.default <= self.fields:
+            raise ValueError("default and load fields must be allowed, non sensitive fields")
+
+    def requested_fields(self) -> frozenset:
+        """
+            The columns selected by the `fields` query argument (comma
+            separated), the default ones if it is not sent.
+
+            Raises:
+                BadRequest: If a requested field is not part of the schema.
+        """
+        args = extract_request_data("args")
+        requested = args.get("fields") if args else None
+        if not requested:
+            return self.default
+        fields = {field.strip() for field in requested.split(",") if field.strip()}
+        unknown = fields - self.fields
+        if unknown:
+            raise BadRequest(f"Unknown field(s): {', '.join(sorted(unknown))}")
+        return frozenset(fields | {"id"})
+
+    def load_only(self, fields: Iterable[str]):
+        """Loader option loading the selected and the needed columns only"""
+        keys = sorted(set(fields) | self.load | {"id"})
+        return load_only(*[getattr(self.model, key) for key in keys])
+
+    def dump(self, obj, fields: Iterable[str]) -> dict:
+        return obj.to_dict(include=fields)
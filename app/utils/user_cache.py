@@ -0,0 +1,160 @@
+"""
+This module resolves the user of an authenticated request without
+querying the database more than once per request.
+
+Users are cached per request in `g`, and optionally across requests
+in a small process level cache keyed by (role, id). The process cache
+is off by default: set USER_CACHE_TTL (seconds) in the environment or
+config to enable it. It only holds column values, so a cached user is
+re-attached to the request session without loading the row. Entries are
+dropped once a change to the user commits in this process (see
+forget_after_commit), so a rolled back or not yet committed change never
+empties the cache early; other worker processes see the change once the
+TTL runs out.
+The columns in FRESH_COLUMNS are never cached: they are read with one
+primary key lookup on every request, so a token or session version
+bumped by any worker (see User.revoke_tokens) takes effect everywhere
+at once. A cache hit therefore still costs one query per authenticated
+request: the cache saves loading the whole user row, not the round
+trip to the database.
+Functions:
+    init_user_cache(app: Flask) -> None:
+    load_user(cls: type, role: str, user_id: str) -> User | None:
+    forget_user(role: str, user_id: str) -> None:
+    forget_after_commit(role: str, user_id: str) -> None:
+"""
+import os
+import time
+import threading
+
+from flask import current_app, g
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+MAX_ENTRIES = 10_000
+# decide whether a token is still valid, read fresh on every request
+FRESH_COLUMNS = ("token_version", "session_version")
+
+_users = {}
+_lock = threading.Lock()
+
+
+def _snapshot(user) -> dict:
+    """Column values of a loaded user, safe to share between sessions"""
+    return {attr.key: user.__dict__[attr.key] for attr in inspect(type(user)).column_attrs
+            if attr.key in user.__dict__ and attr.key not in FRESH_COLUMNS}
+
+def _fresh_values(cls, user_id: str):
+    """The FRESH_COLUMNS of the user, None if it no longer exists"""
+    stmt = select(*[getattr(cls, key) for key in FRESH_COLUMNS]).where(cls.id == user_id)
+    row = g.db_session.execute(stmt).first()
+    return None if row is None else dict(row._mapping)
+
+def _restore(cls, values: dict):
+    """Attach a user rebuilt from a snapshot to the request session"""
+    user = cls.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(user, key, value)
+    make_transient_to_detached(user)
+    return g.db_session.merge(user, load=False)
+
+def _remember(key: tuple, user, ttl: float) -> None:
+    now = time.monotonic()
+    with _lock:
+        if len(_users) >= MAX_ENTRIES:
+            for stale in [k for k, (expires, _) in _users.items() if expires <= now]:
+                del _users[stale]
+            if len(_users) >= MAX_ENTRIES:
+                _users.clear()
+        _users[key] = (now + ttl, _snapshot(user))
+
+def _recall(key: tuple):
+    with _lock:
+        entry = _users.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
+
+def _forget_committed_users(session) -> None:
+    for role, user_id in session.info.pop("forget_users", ()):
+        forget_user(role, user_id)
+
+def _discard_pending_users(session) -> None:
+    # nothing reached the database, the cached values are still right
+    session.info.pop("forget_users", None)
+
+def init_user_cache(app) -> None:
+    """
+    Read the cache settings of the application, evict changed users
+    when their session commits and reset the per request cache at
+    the start of every request.
+
+    Args:
+        app (Flask): The application whose JWT user lookup is cached.
+    """
+    app.config.setdefault("USER_CACHE_TTL", float(os.getenv("USER_CACHE_TTL", 0)))
+
+    if not event.contains(Session, "after_commit", _forget_committed_users):
+        event.listen(Session, "after_commit", _forget_committed_users)
+        event.listen(Session, "after_rollback", _discard_pending_users)
+
+    @app.before_request
+    def reset_request_users():
+        # users of a previous request belong to its (closed) session
+        g.pop("current_users", None)
+
+def load_user(cls, role: str, user_id: str):
+    """
+    Return the `cls` user with `user_id`, resolving it at most once per request.
+
+    Args:
+        cls (type): Admin, Mentor or Student.
+        role (str): The role claim of the token, part of the cache key.
+        user_id (str): The id of the user.
+
+    Returns:
+        The user attached to the request session, or None if it does not exist.
+    """
+    key = (role, user_id)
+    request_users = g.setdefault("current_users", {})
+    if key in request_users:
+        return request_users[key]
+
+    ttl = current_app.config.get("USER_CACHE_TTL", 0)
+    values = _recall(key) if ttl else None
+    fresh = _fresh_values(cls, user_id) if values is not None else None
+    if values is not None and fresh is None:
+        forget_user(role, user_id)
+        user = None
+    elif values is not None:
+        user = _restore(cls, {**values, **fresh})
+    else:
+        user = cls.search(id=user_id)
+        if isinstance(user, cls) and ttl:
+            _remember(key, user, ttl)
+
+    request_users[key] = user
+    return user
+
+def forget_user(role: str, user_id: str) -> None:
+    """
+    Drop a user from the process cache, call it whenever the user changes.
+
+    Args:
+        role (str): admin, mentor or student.
+        user_id (str): The id of the user.
+    """
+    with _lock:
+        _users.pop((role, user_id), None)
+
+def forget_after_commit(role: str, user_id: str) -> None:
+    """
+    Drop a user from the process cache once the request session commits,
+    call it whenever the user changes. A rollback keeps the entry.
+
+    Args:
+        role (str): admin, mentor or student.
+        user_id (str): The id of the user.
+    """
+    g.db_session.info.setdefault("forget_users", set()).add((role, user_id))
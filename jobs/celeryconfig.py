@@ -1,8 +1,25 @@
+import os
+from datetime import timedelta
+
+from celery.exceptions import ImproperlyConfigured
 from celery.schedules import crontab
+from dotenv import load_dotenv
+
+load_dotenv()
 
 
 broker = 'pyamqp://guest@localhost//'
-result_backend = 'rpc://'
+# chords (the release fan-out) need a result backend that supports them,
+# the rpc backend does not: by default results are stored in the application
+# database, in the celery_taskmeta and celery_tasksetmeta tables (see jobs/README.md)
+if os.getenv("CELERY_RESULT_BACKEND"):
+    result_backend = os.getenv("CELERY_RESULT_BACKEND")
+elif os.getenv("DB_CONNECTION_STRING"):
+    result_backend = f"db+{os.getenv('DB_CONNECTION_STRING')}"
+else:
+    raise ImproperlyConfigured(
+        "Set CELERY_RESULT_BACKEND, or DB_CONNECTION_STRING to keep task results in the application database")
+result_expires = timedelta(days=1)
 timezone = "Africa/Lagos"
 enable_utc = False
 
@@ -25,6 +42,8 @@ task_routes = {
     'review-ongoing-projects': {'queue': 'daily_run'},
     'release-projects': {'queue': 'daily_run'},
     'start-cohorts': {'queue': 'daily_run'},
+    'release-cohorts': {'queue': 'daily_run'},
+    'release-summary': {'queue': 'daily_run'},
     'send-transactional-email': {'queue': 'mailing_service'},
     'send-batch-transactional-email': {'queue': 'mailing_service'},
 },
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Flask application and database sessions for Celery tasks.
+
+Each worker process builds the Flask application once, when Celery
+sends worker_process_init after forking it (or on the first task for
+pools that do not fork). Tasks then only check out a session:
+
+    @app.task(name="some-task")
+    def some_task():
+        with task_session():
+            ...
+
+The session is rolled back if the task raises and is always closed
+and removed when the block exits.
+"""
+import threading
+from contextlib import contextmanager
+
+from celery.signals import worker_process_init
+from flask import g
+
+from app.models import storage
+
+_flask_app = None
+_lock = threading.Lock()
+
+
+def get_flask_app():
+    """The Flask application of this worker process, built on first use"""
+    global _flask_app
+    if _flask_app is None:
+        with _lock:
+            if _flask_app is None:
+                from app import create_app
+                _flask_app = create_app()
+    return _flask_app
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    get_flask_app()
+
+@contextmanager
+def task_session():
+    """
+        Push an application context holding a fresh database session
+        in g, like a request does, and clean it up afterwards.
+    """
+    with get_flask_app().app_context():
+        g.db_storage = storage
+        g.db_session = storage.load_session()
+        try:
+            yield g.db_session
+        except Exception:
+            if g.db_session.is_active:
+                g.db_session.rollback()
+            raise
+        finally:
+            storage.close()
@@ -1,86 +1,110 @@
 import os
-import json
 from datetime import date
 
 import requests
+from celery import chord
+from celery.utils.log import get_task_logger
+from celery.utils.time import get_exponential_backoff_interval
+from sqlalchemy.exc import OperationalError
 
-from app import create_app, g
-from app.models import storage
 from jobs.celery import app
-from jobs.tasks.utils.utils import release_projects_recursively
+from jobs.tasks.context import task_session
+from jobs.tasks.utils.utils import release_batches, release_cohort_batch, merge_release_summaries
 from jobs.tasks.utils.utils import get_active_cohorts, review_projects
-from jobs.tasks.utils.utils import notify_students_of_released_projects
 from jobs.tasks.utils.utils import get_pending_cohorts
+from jobs.tasks.utils import zeptomail
+
+logger = get_task_logger(__name__)
+
+# 429 and 5xx responses and network errors are retried with exponential
+# backoff and jitter, 4xx responses are returned as failed deliveries
+MAIL_RETRY_POLICY = dict(
+    autoretry_for=(zeptomail.RetryableDeliveryError, requests.ConnectionError, requests.Timeout),
+    max_retries=5, retry_backoff=5, retry_backoff_max=300, retry_jitter=True,
+)
 
 
 @app.task(name="start-cohorts")
 def start_cohorts():
     # change cohorts status when
     # their start dates is reached
-    flask_app = create_app()
-    with flask_app.app_context():
-        g.db_storage = storage
-        g.db_session = storage.load_session()
-
+    with task_session():
+        cohort_ids = []
         cohorts = get_pending_cohorts()
         for cohort in cohorts:
-            if cohort.start_date < date.today(): continue
+            if cohort.start_date > date.today(): continue
             cohort.status = "in-progress"
             cohort.save()
-            cohort.refresh()
-            released_projects = release_projects_recursively(cohort)
-            notify_students_of_released_projects(released_projects, cohort)
+            cohort_ids.append(cohort.id)
+    return dispatch_release(cohort_ids)
 
 
 @app.task(name="review-ongoing-projects")
 def review_ongoing_projects():
     # update projects status from released to second-attempt to completed
-    flask_app = create_app()
-    with flask_app.app_context():
-        g.db_storage = storage
-        g.db_session = storage.load_session()
-
-        cohorts = get_active_cohorts()
-
-        for cohort in cohorts:
-            review_projects(cohort)
+    with task_session():
+        counts = review_projects()
+    logger.info("review-ongoing-projects: %s", counts)
+    return counts
 
 @app.task(name="release-projects")
 def release_projects():
-    flask_app = create_app()
-    with flask_app.app_context():
-        g.db_storage = storage
-        g.db_session = storage.load_session()
+    # release every project due on or before today, catching up on missed runs
+    with task_session():
+        cohort_ids = [cohort.id for cohort in get_active_cohorts()]
+    return dispatch_release(cohort_ids)
 
-        cohorts = get_active_cohorts()
-        if not cohorts: return
-
-        for cohort in cohorts:
-            released_projects = release_projects_recursively(cohort)
-            notify_students_of_released_projects(released_projects, cohort)
-
-@app.task(name="send-transactional-email")
+def dispatch_release(cohort_ids: list) -> dict:
+    """
+    Fan the release of `cohort_ids` out to one release-cohorts subtask
+    per batch, with release-summary as the chord callback.
+    """
+    batches = release_batches(cohort_ids)
+    if batches:
+        today = date.today().isoformat()
+        chord(release_cohorts.s(batch, today) for batch in batches)(release_summary.s())
+    return {"cohorts": len(cohort_ids), "batches": len(batches)}
+
+@app.task(name="release-cohorts", bind=True, max_retries=3,
+          autoretry_for=(OperationalError,), retry_backoff=30, retry_backoff_max=600, retry_jitter=True)
+def release_cohorts(self, cohort_ids, today, summary=None):
+    """
+    Release the due projects of a batch of cohorts. Cohorts that fail
+    are retried with exponential backoff, carrying the summary of the
+    ones already released; after the last retry they are reported as
+    failed.
+    """
+    batch = release_cohort_batch(cohort_ids, date.fromisoformat(today))
+    if summary:
+        batch = merge_release_summaries([summary, batch])
+    if batch["failed"] and self.request.retries < self.max_retries:
+        failed = batch["failed"]
+        done = {**batch, "cohorts": batch["cohorts"] - len(failed), "failed": []}
+        countdown = get_exponential_backoff_interval(
+            factor=self.retry_backoff, retries=self.request.retries,
+            maximum=self.retry_backoff_max, full_jitter=self.retry_jitter)
+        raise self.retry(args=(failed, today, done), countdown=countdown)
+    return batch
+
+@app.task(name="release-summary")
+def release_summary(summaries):
+    summary = merge_release_summaries(summaries)
+    logger.info("release: %s", summary)
+    return summary
+
+@app.task(name="send-transactional-email", **MAIL_RETRY_POLICY)
 def send_transactional_email(subject, htmlBody, receipient_email):
-    url = "https://api.zeptomail.com/v1.1/email"
-
     payload = {
         "from": {"address": os.getenv("ZOHO_NOREPLY_EMAIL"), "name": os.getenv("APPLICATION_NAME")},
         "to": [{"email_address": {"address": receipient_email}}],
         "subject": subject,
         "htmlbody": htmlBody
     }
-    payload = json.dumps(payload)
-    headers = {
-        'accept': "application/json",
-        'content-type': "application/json",
-        'authorization': os.getenv("ZOHO_ZEPTOMAIL_MAIL_TOKEN"),
-    }
-
-    response = requests.request("POST", url, data=payload, headers=headers)
+    result = zeptomail.send("/email", payload)
+    logger.info("send-transactional-email: %s", result)
+    return result
 
-    print(response.text)
-
-@app.task(name="send-batch-transactional-email")
+@app.task(name="send-batch-transactional-email", **MAIL_RETRY_POLICY)
 def send_batch_transactional_email(subject, receipients, htmlBody, mergeInfo=None):
     """
     Send transactional emails to multiple users / email accounts. 
@@ -124,8 +148,6 @@ def send_batch_transactional_email(subject, receipients, htmlBody, mergeInfo=Non
         "company" : "Z fashions" }
         }
     """
-    url = "https://api.zeptomail.com/v1.1/email/batch"
-
     payload = {
         "from": {"address": os.getenv("ZOHO_NOREPLY_EMAIL"), "name": os.getenv("APPLICATION_NAME")},
         "to": receipients,
@@ -134,13 +156,6 @@ def send_batch_transactional_email(subject, receipients, htmlBody, mergeInfo=Non
     }
     if mergeInfo:
         payload["merge_info"] = mergeInfo
-    payload = json.dumps(payload)
-    headers = {
-        'accept': "application/json",
-        'content-type': "application/json",
-        'authorization': os.getenv("ZOHO_ZEPTOMAIL_MAIL_TOKEN"),
-    }
-
-    response = requests.request("POST", url, data=payload, headers=headers)
-
-    print(response.text)
\ No newline at end of file
+    result = zeptomail.send("/email/batch", payload)
+    logger.info("send-batch-transactional-email: %s", result)
+    return result
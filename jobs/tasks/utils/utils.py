@@ -1,28 +1,61 @@
+import math
 import os
-from datetime import date, timedelta
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
 
+from celery.utils.log import get_task_logger
+from sqlalchemy import select, update
+
+from app.models import storage
 from app.models.project import AdminProject, CohortProject
 from app.models.user import Student
 from app.models.course import Course
 from app.models.cohort import Cohort
 
+logger = get_task_logger(__name__)
 
-def update_project_status(pjt: CohortProject):
-    today = date.today()
-    if pjt.sa_start_date <= today:
-        pjt.update(status='second-attempt')
-    if pjt.end_date <= today:
-        pjt.update(status='completed')
-    pjt.save()
+# cohorts released per subtask and subtasks dispatched per run
+RELEASE_BATCH_SIZE = 50
+RELEASE_MAX_BATCHES = 8
+# ZeptoMail accepts at most 500 recipients per batch request
+MAIL_BATCH_SIZE = 500
+# batch requests a worker process sends per second, after a burst of MAIL_BURST
+MAIL_REQUESTS_PER_SECOND = 2
+MAIL_BURST = 5
 
-def review_projects(cohort: Cohort):
-    cohort_projects = CohortProject.search(cohort_id=cohort.id, status=('released', 'second-attempt'))
-    if not cohort_projects: return
-    
-    if isinstance(cohort_projects, CohortProject): cohort_projects = [cohort_projects]
 
-    for pjt in cohort_projects:
-        update_project_status(pjt)
+def review_projects(today: date = None) -> dict:
+    """
+    Move the projects of every in-progress cohort to their next status
+    with two set based UPDATE statements and a single commit:
+        released or second-attempt -> completed when end_date is reached
+        released -> second-attempt when sa_start_date is reached
+    Completed projects are updated first so a project past both dates
+    is counted once.
+    Returns the number of projects moved to each status.
+    """
+    today = today or date.today()
+    now = datetime.now(timezone.utc)
+    active_cohorts = select(Cohort.id).where(Cohort.status == "in-progress")
+    with storage.transaction():
+        completed = storage.execute(
+            update(CohortProject)
+            .where(CohortProject.cohort_id.in_(active_cohorts),
+                   CohortProject.status.in_(("released", "second-attempt")),
+                   CohortProject.end_date <= today)
+            .values(status="completed", updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        second_attempt = storage.execute(
+            update(CohortProject)
+            .where(CohortProject.cohort_id.in_(active_cohorts),
+                   CohortProject.status == "released",
+                   CohortProject.sa_start_date <= today)
+            .values(status="second-attempt", updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    return {"second-attempt": second_attempt, "completed": completed}
 
 def get_pending_cohorts():
     cohorts = Cohort.search(status="pending")
@@ -36,83 +69,218 @@ def get_active_cohorts():
     if isinstance(cohorts, Cohort): return [cohorts]
     return cohorts
 
-def release_first_project_for_cohort(cohort: Cohort):
-    # Retrieve the first project in the course
-    project = AdminProject.search(course_id=cohort.course_id, status="published", prev_project_id=None)
-    if not project: return
+def due_releases(sequence: list, released: dict, start_date: date, today: date) -> list:
+    """
+    Compute the projects of a cohort that are due for release.
+
+    The first project is due on the cohort's start date and every
+    following one `release_range` days after the release of the
+    project before it. Projects already released keep their own
+    fa_start_date as the anchor of the next release date, so a missed
+    run is caught up on the dates the schedule intended.
+
+    Args:
+        sequence (list): The published admin projects of the course, in order.
+        released (dict): fa_start_date of every released project, by project_pool_id.
+        start_date (date): The start date of the cohort.
+        today (date): Projects due after this date are not released yet.
+
+    Returns:
+        list: (admin project, release date) tuples, in release order.
+    """
+    due = []
+    anchor = None
+    for project in sequence:
+        if project.id in released:
+            anchor = released[project.id]
+            continue
+        release_date = start_date if anchor is None else anchor + timedelta(days=project.release_range)
+        if release_date > today:
+            break
+        due.append((project, release_date))
+        anchor = release_date
+    return due
+
+def get_project_sequence(course_id: str) -> list:
+    """The published admin projects of a course, in release order"""
+    projects = AdminProject.fetch_in_order(course_id=course_id)
+    return [project for project in projects if project.status == "published"]
+
+def release_due_projects(cohort_id: str, today: date = None, sequences: dict = None) -> list:
+    """
+    Release every project of an in-progress cohort whose release date
+    is on or before today, in one transaction.
 
-    return release_project_for_cohort(project, cohort)
+    The cohort row is locked for the transaction, so concurrent runs
+    release one after the other and the second one finds nothing due:
+    running it again is a no-op.
 
+    Args:
+        cohort_id (str): The id of the cohort.
+        today (date): Defaults to the current date.
+        sequences (dict): Cache of project sequences by course_id,
+                          shared by the cohorts of a batch.
 
-def release_projects_recursively(cohort: Cohort):
-    # release first project for cohort if there are no previously released projects
+    Returns:
+        list: The released cohort projects as dictionaries.
+    """
+    today = today or date.today()
+    sequences = {} if sequences is None else sequences
     released_projects = []
-    cohort_projects = CohortProject.search(cohort_id=cohort.id)
-    if not cohort_projects:
-        released_projects.append(release_first_project_for_cohort(cohort))
-    
-    # get the last released project
-    lr_project = CohortProject.search(cohort_id=cohort.id, next_project_id=None)
-    if not lr_project: return released_projects
-    if not isinstance(lr_project, CohortProject): return released_projects
-
-    pool_project = AdminProject.search(id=lr_project.project_pool_id)
-    next_project = pool_project.next_project
-    if not next_project: return released_projects
-
-    next_project_release_date = lr_project.fa_start_date + timedelta(days=next_project.release_range)
-    while next_project and next_project_release_date == date.today():
-        released_projects.append(release_project_for_cohort(next_project, cohort))
-        lr_project = next_project
-        next_project = lr_project.next_project
-        if next_project:
-            next_project_release_date = lr_project.fa_start_date + timedelta(days=next_project.release_range)
+    with storage.transaction():
+        cohort = Cohort.query().filter(id=cohort_id).for_update().first()
+        if cohort is None or cohort.status != "in-progress":
+            return released_projects
+
+        if cohort.course_id not in sequences:
+            sequences[cohort.course_id] = get_project_sequence(cohort.course_id)
+        cohort_projects = CohortProject.fetch_in_order(cohort_id=cohort.id)
+        released = {pjt.project_pool_id: pjt.fa_start_date for pjt in cohort_projects}
+        last_project = cohort_projects[-1] if cohort_projects else None
+
+        for project, release_date in due_releases(sequences[cohort.course_id], released, cohort.start_date, today):
+            sa_start_date = release_date + timedelta(days=project.fa_duration)
+            new_project = CohortProject(
+                title=project.title,
+                description=project.description,
+                content_hash=project.content_hash,
+                module_id=project.module_id,
+                author_id=project.author_id,
+                course_id=project.course_id,
+                cohort_id=cohort.id,
+                project_pool_id=project.id,
+                status="released",
+                fa_start_date=release_date,
+                sa_start_date=sa_start_date,
+                end_date=sa_start_date + timedelta(days=project.sa_duration),
+                prev_project_id=last_project.id if last_project else None,
+            )
+            released_projects.append(new_project.to_dict())
+            last_project = new_project
     return released_projects
 
+def release_cohort_batch(cohort_ids: list, today: date = None, notify: bool = True) -> dict:
+    """
+    Release the due projects of a batch of cohorts with one session,
+    one transaction per cohort. A failing cohort is rolled back and
+    reported without stopping the rest of the batch.
+
+    Returns:
+        dict: {"cohorts", "released", "failed"} summary of the batch.
+    """
+    from jobs.tasks.context import task_session
+
+    summary = {"cohorts": len(cohort_ids), "released": 0, "failed": []}
+    sequences = {}
+    with task_session():
+        for cohort_id in cohort_ids:
+            try:
+                released_projects = release_due_projects(cohort_id, today, sequences)
+            except Exception:
+                logger.exception("Releasing projects for cohort %s failed", cohort_id)
+                summary["failed"].append(cohort_id)
+                continue
+            summary["released"] += len(released_projects)
+            if not notify or not released_projects: continue
+            try:
+                notify_students_of_released_projects(released_projects, Cohort.search(id=cohort_id))
+            except Exception:
+                logger.exception("Notifying cohort %s of released projects failed", cohort_id)
+    return summary
+
+def merge_release_summaries(summaries) -> dict:
+    """Add up the summaries of several release batches"""
+    total = {"cohorts": 0, "released": 0, "failed": []}
+    for summary in summaries:
+        total["cohorts"] += summary["cohorts"]
+        total["released"] += summary["released"]
+        total["failed"].extend(summary["failed"])
+    return total
+
+def release_batches(cohort_ids: list, batch_size: int = RELEASE_BATCH_SIZE,
+                    max_batches: int = RELEASE_MAX_BATCHES) -> list:
+    """
+    Split cohorts into batches of at least `batch_size` cohorts and at
+    most `max_batches` batches, which bounds the subtasks (and database
+    connections) a single run puts in flight.
+    """
+    if not cohort_ids: return []
+    batch_size = max(batch_size, math.ceil(len(cohort_ids) / max_batches))
+    return [cohort_ids[i:i + batch_size] for i in range(0, len(cohort_ids), batch_size)]
+
+
+class TokenBucket:
+    """
+    Token bucket that schedules instead of blocking: reserve() takes a
+    token and returns how many seconds to wait before spending it, so
+    callers can enqueue work with that countdown right away.
+    `capacity` requests may go out at once, then `rate` per second.
+    """
+    def __init__(self, rate: float, capacity: int, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # a negative balance is the backlog of reservations still to be served
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+# shared by every notification sent from this worker process
+mail_bucket = TokenBucket(MAIL_REQUESTS_PER_SECOND, MAIL_BURST)
+
+def iter_recipients(cohort_id: str, page_size: int = MAIL_BATCH_SIZE):
+    """
+    Stream the batch mail recipients of a cohort's students from the
+    database, `page_size` rows at a time, skipping repeated addresses.
+    """
+    seen = set()
+    students = Student.query().filter(cohort_id=cohort_id)\
+        .only("email", "first_name").order_by(Student.created_at, Student.id)
+    for student in students.iter(page_size):
+        address = (student.email or "").strip()
+        if not address or address.lower() in seen: continue
+        seen.add(address.lower())
+        yield {
+            "email_address": {
+                "address": address,
+            },
+            "merge_info": {
+                "first_name": student.first_name,
+            },
+        }
+
+def chunked(items, size: int):
+    """Group an iterable into lists of at most `size` items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
-def release_project_for_cohort(project: AdminProject, cohort: Cohort):
-    project_dict = project.to_dict()
-
-    
-    # Add attributes needed by CohortProject
-    project_dict["project_pool_id"] = project_dict["id"]
-    project_dict["cohort_id"] = cohort.id
-    project_dict["status"] = "released"
-    project_dict['fa_start_date'] = date.today()
-    project_dict['sa_start_date'] = date.today() + timedelta(days=int(project_dict["fa_duration"]))
-    project_dict['end_date'] = project_dict['sa_start_date'] + timedelta(days=int(project_dict["sa_duration"]))
-    project_dict['prev_project_id'] = None
-    project_dict['next_project_id'] = None
-    
-    # Remove attributes not needed by CohortProject
-    del project_dict["id"]
-    del project_dict["created_at"]
-    del project_dict["updated_at"]
-    del project_dict["fa_duration"]
-    del project_dict["sa_duration"]
-    del project_dict["release_range"]
-    
-    
-    last_project = CohortProject.search(cohort_id=cohort.id, next_project_id=None)
-    # Create a new CohortProject instance
-    new_project = CohortProject(**project_dict)
-    new_project.save()
-    new_project.refresh()
-    if last_project:
-        last_project.next_project = new_project.id
-        new_project.prev_project_id = last_project.id
-        last_project.save()
-        new_project.save()
-
-    return project_dict
-
-def notify_students_of_released_projects(released_projects, cohort):
+def notify_students_of_released_projects(released_projects, cohort, bucket: TokenBucket = None) -> list:
+    """
+    Email the students of a cohort about newly released projects, one
+    send-batch-transactional-email task per MAIL_BATCH_SIZE recipients,
+    each delayed by the token bucket so the provider quota is respected.
+
+    Returns:
+        list: One outcome per chunk: {"chunk", "recipients", "countdown",
+              "status": "queued" | "failed", "task_id" or "error"}
+    """
     from jobs.tasks.jobs import send_batch_transactional_email
 
-    students = Student.search(cohort_id=cohort.id)
-    if not students: return
-    if isinstance(students, Student): students = [students]
-    
+    bucket = bucket or mail_bucket
     project_section = ""
     for project in released_projects:
         pjt = f"""
@@ -123,17 +291,6 @@ def notify_students_of_released_projects(released_projects, cohort):
         """
         project_section += pjt
 
-    receipients = []
-    for student in students:
-        tmp = {
-            "email_address": {
-                "address": student.email,
-            },
-            "merge_info" : { 
-                "first_name" : student.first_name,
-            }
-        },
-        receipients.append(tmp)
     subject = "🚀 New Project(s) Alert!"
     htmlBody = f"""
     <b>Hi {{first_name}},</b>
@@ -145,4 +302,16 @@ def notify_students_of_released_projects(released_projects, cohort):
     The Pylearn Team</br>
     {os.getenv("SUPPORT_EMAIL")}
     """
-    send_batch_transactional_email.delay(subject, receipients, htmlBody)
\ No newline at end of file
+    outcomes = []
+    for i, receipients in enumerate(chunked(iter_recipients(cohort.id), MAIL_BATCH_SIZE)):
+        countdown = round(bucket.reserve(), 3)
+        outcome = {"chunk": i, "recipients": len(receipients), "countdown": countdown}
+        try:
+            result = send_batch_transactional_email.apply_async(
+                (subject, receipients, htmlBody), countdown=countdown)
+            outcome.update(status="queued", task_id=result.id)
+        except Exception as e:
+            logger.exception("Queueing notification chunk %s of cohort %s failed", i, cohort.id)
+            outcome.update(status="failed", error=str(e))
+        outcomes.append(outcome)
+    return outcomes
@@ -0,0 +1,89 @@
+"""
+ZeptoMail client shared by the mailing tasks of a worker process.
+
+Every process keeps one pooled requests.Session, so consecutive sends
+reuse kept-alive connections instead of opening a new one per email.
+Requests have bounded connect and read timeouts. Responses are turned
+into a structured delivery result, and the ones worth retrying (429
+and 5xx) raise RetryableDeliveryError so Celery can retry the task.
+ZEPTOMAIL_API_URL overrides the API location, e.g. for a stub server.
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_API_URL = "https://api.zeptomail.com/v1.1"
+# (connect, read) seconds
+TIMEOUT = (3.05, 15)
+POOL_SIZE = 10
+
+_session = None
+_lock = threading.Lock()
+
+
+class RetryableDeliveryError(Exception):
+    """ZeptoMail was rate limited or failed on its side, the send can be retried"""
+    def __init__(self, status_code: int, body: str):
+        # keep the constructor arguments as args so the error pickles
+        super().__init__(status_code, body)
+        self.status_code = status_code
+        self.body = body
+
+    def __str__(self) -> str:
+        return f"ZeptoMail responded with {self.status_code}: {self.body[:200]}"
+
+
+def get_http_session() -> requests.Session:
+    """The pooled session of this process, created on first use"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "accept": "application/json",
+                    "content-type": "application/json",
+                })
+                _session = session
+    return _session
+
+def reset_http_session() -> None:
+    """Forget the session, a forked child must not share the parent's sockets"""
+    global _session
+    _session = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_http_session)
+
+def send(path: str, payload: dict) -> dict:
+    """
+    POST `payload` to the ZeptoMail endpoint `path` (e.g. "/email").
+
+    Raises:
+        RetryableDeliveryError: on 429 and 5xx responses.
+        requests.ConnectionError, requests.Timeout: when ZeptoMail is unreachable.
+
+    Returns:
+        dict: {"status": "sent" | "failed", "status_code", "response"}
+    """
+    url = os.getenv("ZEPTOMAIL_API_URL", DEFAULT_API_URL).rstrip("/") + path
+    response = get_http_session().post(url, json=payload, timeout=TIMEOUT, headers={
+        "authorization": os.getenv("ZOHO_ZEPTOMAIL_MAIL_TOKEN"),
+    })
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableDeliveryError(response.status_code, response.text)
+
+    try:
+        body = response.json()
+    except ValueError:
+        body = response.text
+    return {
+        "status": "sent" if response.ok else "failed",
+        "status_code": response.status_code,
+        "response": body,
+    }
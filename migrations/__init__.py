@@ -0,0 +1,93 @@
+"""
+Schema migrations
+
+Every module in migrations/versions is one revision. It defines:
+    revision (str): identifier of the revision
+    down_revision (str): revision it must be applied after, None for the first one
+    upgrade(connection): applies the change, safe to run more than once
+
+Revisions form a single chain starting at the 0000 baseline. Applied
+revisions are recorded in the schema_migrations table, so upgrade()
+only runs the pending ones. The application never creates or reflects
+the schema at startup, run the migrations before deploying:
+
+    python -m migrations upgrade
+
+MySQL commits DDL implicitly, which is why every revision must be
+idempotent: a revision interrupted halfway is simply run again.
+A single revision can still be run on its own:
+
+    python -m migrations.versions.v0001_ordering_positions
+"""
+import os
+import pkgutil
+import importlib
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, Column, DateTime, MetaData, String, Table, select
+
+VERSION_TABLE = Table(
+    "schema_migrations", MetaData(),
+    Column("revision", String(32), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def get_engine():
+    """Engine for the database named by DB_CONNECTION_STRING (.env is loaded first)"""
+    load_dotenv()
+    return create_engine(os.environ["DB_CONNECTION_STRING"])
+
+def run(upgrade) -> None:
+    """Apply one revision's upgrade in a single transaction"""
+    with get_engine().begin() as connection:
+        upgrade(connection)
+
+def load_revisions() -> list:
+    """
+        Revision modules of migrations/versions in the order they apply.
+        Raises RuntimeError if they do not form a single chain.
+    """
+    from migrations import versions
+    modules = [importlib.import_module(f"{versions.__name__}.{info.name}")
+               for info in pkgutil.iter_modules(versions.__path__)]
+
+    by_parent = {module.down_revision: module for module in modules}
+    if len(by_parent) != len(modules):
+        raise RuntimeError("Two revisions have the same down_revision")
+
+    ordered = []
+    parent = None
+    while parent in by_parent:
+        ordered.append(by_parent[parent])
+        parent = ordered[-1].revision
+    if len(ordered) != len(modules):
+        raise RuntimeError("Revisions are not a single chain starting from down_revision None")
+    return ordered
+
+def applied_revisions(engine) -> list:
+    """Revisions recorded in schema_migrations, oldest first"""
+    VERSION_TABLE.create(engine, checkfirst=True)
+    with engine.connect() as connection:
+        stmt = select(VERSION_TABLE.c.revision).order_by(VERSION_TABLE.c.applied_at, VERSION_TABLE.c.revision)
+        return list(connection.execute(stmt).scalars())
+
+def upgrade(engine=None) -> list:
+    """
+        Apply every pending revision, each in its own transaction,
+        and return the identifiers of the revisions applied.
+    """
+    engine = engine or get_engine()
+    done = set(applied_revisions(engine))
+
+    applied = []
+    for module in load_revisions():
+        if module.revision in done:
+            continue
+        with engine.begin() as connection:
+            module.upgrade(connection)
+            connection.execute(VERSION_TABLE.insert().values(
+                revision=module.revision, applied_at=datetime.now(timezone.utc)))
+        applied.append(module.revision)
+    return applied
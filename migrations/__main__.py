@@ -0,0 +1,29 @@
+"""
+Command line entry point of the migrations, run from the root of the repository:
+
+    python -m migrations upgrade    apply the pending revisions
+    python -m migrations current    list the applied revisions
+    python -m migrations history    list every revision in order
+"""
+import argparse
+
+from migrations import applied_revisions, get_engine, load_revisions, upgrade
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m migrations")
+    parser.add_argument("command", choices=("upgrade", "current", "history"))
+    command = parser.parse_args(argv).command
+
+    if command == "upgrade":
+        applied = upgrade()
+        print(f"Applied: {', '.join(applied)}" if applied else "Database is up to date")
+    elif command == "current":
+        print("\n".join(applied_revisions(get_engine())) or "No revision applied")
+    else:
+        for module in load_revisions():
+            print(f"{module.revision}  {module.__name__.rsplit('.', 1)[-1]}")
+
+
+if __name__ == "__main__":
+    main()
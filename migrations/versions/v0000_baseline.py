@@ -0,0 +1,145 @@
+"""
+Baseline: the schema as it was before migrations existed, frozen here
+so this revision never changes with the models. Databases created
+before migrations existed already have these tables, so for those this
+revision only records the starting point. Every later change to the
+schema is a revision of its own.
+"""
+from sqlalchemy import (Column, Date, DateTime, Enum, Float, ForeignKey, Integer, MetaData,
+                        String, Table, Text, UniqueConstraint)
+from sqlalchemy.dialects.mysql import ENUM, LONGTEXT
+
+revision = "0000"
+down_revision = None
+
+metadata = MetaData()
+
+
+def base_columns():
+    """Columns every model had through BaseModel"""
+    return [
+        Column("id", String(60), primary_key=True, nullable=False, unique=True),
+        Column("created_at", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+    ]
+
+def user_columns():
+    return [
+        *base_columns(),
+        Column("first_name", String(60), nullable=False),
+        Column("last_name", String(60), nullable=False),
+        Column("password", String(300), nullable=False),
+        Column("email", String(255), nullable=False, unique=True),
+        Column("username", String(60), nullable=False, unique=True),
+        Column("phone", String(45)),
+        Column("status", Enum("active", "inactive", "suspended", "deleted"), nullable=False),
+    ]
+
+def project_columns():
+    return [
+        *base_columns(),
+        Column("title", String(300), nullable=False),
+        Column("description", String(300)),
+        Column("markdown_content", LONGTEXT),
+        Column("module_id", String(60), ForeignKey("modules.id"), nullable=False),
+        Column("author_id", String(60), ForeignKey("admins.id"), nullable=False),
+        Column("course_id", String(60), ForeignKey("courses.id"), nullable=False),
+    ]
+
+
+Table("courses", metadata, *base_columns(),
+      Column("title", String(60), nullable=False),
+      Column("status", ENUM("deleted", "draft", "published"), nullable=False),
+      Column("communication_channel", String(255), nullable=False))
+
+Table("cohorts", metadata, *base_columns(),
+      Column("name", String(60), nullable=False),
+      Column("status", ENUM("pending", "in-progress", "completed"), nullable=False),
+      Column("course_id", String(60), ForeignKey("courses.id"), nullable=False),
+      Column("start_date", Date, nullable=False),
+      Column("next_cohort_id", String(60), ForeignKey("cohorts.id"), nullable=True),
+      Column("prev_cohort_id", String(60), ForeignKey("cohorts.id"), nullable=True))
+
+Table("modules", metadata, *base_columns(),
+      Column("title", String(60), nullable=False),
+      Column("description", String(300)),
+      Column("status", ENUM("deleted", "draft", "published"), nullable=False),
+      Column("course_id", String(60), ForeignKey("courses.id"), nullable=False))
+
+Table("admins", metadata, *user_columns())
+
+Table("mentors", metadata, *user_columns())
+
+Table("students", metadata, *user_columns(),
+      Column("points", Integer, nullable=False),
+      Column("course_id", String(60), ForeignKey("courses.id"), nullable=False),
+      Column("cohort_id", String(60), ForeignKey("cohorts.id")))
+
+Table("mentor_cohort", metadata, *base_columns(),
+      Column("mentor_id", String(60), ForeignKey("mentors.id"), primary_key=True),
+      Column("cohort_id", String(60), ForeignKey("cohorts.id"), primary_key=True))
+
+Table("admin_projects", metadata, *project_columns(),
+      Column("status", ENUM("deleted", "draft", "published"), nullable=False),
+      Column("fa_duration", Integer, nullable=False),
+      Column("sa_duration", Integer, nullable=False),
+      Column("release_range", Integer, nullable=False),
+      Column("next_project_id", String(60), ForeignKey("admin_projects.id"), nullable=True),
+      Column("prev_project_id", String(60), ForeignKey("admin_projects.id"), nullable=True))
+
+Table("cohort_projects", metadata, *project_columns(),
+      Column("fa_start_date", Date, nullable=False),
+      Column("sa_start_date", Date, nullable=False),
+      Column("end_date", Date, nullable=False),
+      Column("status", ENUM("released", "second-attempt", "completed"), nullable=False),
+      Column("cohort_id", String(60), ForeignKey("cohorts.id"), nullable=False),
+      Column("project_pool_id", String(60), ForeignKey("admin_projects.id"), nullable=False),
+      Column("next_project_id", String(60), ForeignKey("cohort_projects.id"), nullable=True),
+      Column("prev_project_id", String(60), ForeignKey("cohort_projects.id"), nullable=True))
+
+Table("student_projects", metadata, *base_columns(),
+      Column("cohort_id", String(60), ForeignKey("cohorts.id"), nullable=False),
+      Column("student_id", String(60), ForeignKey("students.id"), nullable=False),
+      Column("cohort_project_id", String(60), ForeignKey("cohort_projects.id"), nullable=False),
+      Column("status", ENUM("submitted", "graded", "verified"), nullable=False),
+      Column("submission_file", String(300)),
+      Column("submitted_on", DateTime),
+      Column("assigned_to", String(60), ForeignKey("mentors.id")),
+      Column("graded_on", DateTime),
+      Column("graded_by", String(60), ForeignKey("mentors.id")),
+      Column("grade", Float),
+      Column("feedback", Text),
+      UniqueConstraint("student_id", "cohort_project_id", name="unique_student_id__cohort_project_id"))
+
+Table("leaderboards", metadata, *base_columns(),
+      Column("level", Enum("wood", "silver", "gold", "diamond"), nullable=False))
+
+Table("leaderboard_students", metadata, *base_columns(),
+      Column("student_id", String(60), ForeignKey("students.id"), nullable=False, unique=True),
+      Column("leaderboard_id", String(60), ForeignKey("leaderboards.id"), nullable=False))
+
+Table("notifications", metadata, *base_columns(),
+      Column("student_id", String(60), ForeignKey("students.id"), nullable=False),
+      Column("message", String(300), nullable=False),
+      Column("source", Enum("message", "point", "streak", "project", "module", "other"), nullable=False),
+      Column("source_id", String(60)))
+
+Table("points", metadata, *base_columns(),
+      Column("student_id", String(60), ForeignKey("students.id"), nullable=False),
+      Column("source", Enum("project", "practice", "streak"), nullable=False),
+      Column("source_id", String(60)),
+      Column("value", Integer, nullable=False))
+
+Table("streaks", metadata, *base_columns(),
+      Column("student_id", String(60), ForeignKey("students.id"), nullable=False),
+      Column("frequency", Integer, nullable=False),
+      Column("count", Integer, nullable=False))
+
+
+def upgrade(connection) -> None:
+    metadata.create_all(connection, checkfirst=True)
+
+
+if __name__ == "__main__":
+    from migrations import run
+    run(upgrade)
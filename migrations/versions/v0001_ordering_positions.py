@@ -0,0 +1,82 @@
+"""
+Add the `position` ordering column to admin_projects, cohort_projects
+and cohorts, index it with the list scope, and backfill it by walking
+the existing next/prev linked lists.
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+revision = "0001"
+down_revision = "0000"
+
+POSITION_GAP = 1024
+
+# table, column scoping one list, prev pointer, next pointer
+ORDERED_TABLES = (
+    ("admin_projects", "course_id", "prev_project_id", "next_project_id"),
+    ("cohort_projects", "cohort_id", "prev_project_id", "next_project_id"),
+    ("cohorts", "course_id", "prev_cohort_id", "next_cohort_id"),
+)
+
+
+def created_key(row):
+    created_at = row.created_at
+    if created_at is None:
+        created_at = datetime.min
+    elif isinstance(created_at, str):
+        # raw rows from some drivers come back as ISO strings
+        created_at = datetime.fromisoformat(created_at)
+    return (created_at.replace(tzinfo=None), row.id)
+
+def linked_order(rows, prev_key, next_key) -> list:
+    """
+        Rows of one list in the order of their next pointers. Rows
+        that cannot be reached from the oldest head (broken or cyclic
+        lists) follow fragment by fragment, oldest first.
+    """
+    by_id = {row.id: row for row in rows}
+    heads = sorted((row for row in rows if getattr(row, prev_key) not in by_id), key=created_key)
+    ordered, seen = [], set()
+    for start in heads + sorted(rows, key=created_key):
+        row = start
+        while row is not None and row.id not in seen:
+            seen.add(row.id)
+            ordered.append(row)
+            row = by_id.get(getattr(row, next_key))
+    return ordered
+
+def backfill_positions(connection, table, scope, prev_key, next_key) -> None:
+    rows = connection.execute(
+        text(f"SELECT id, {scope}, {prev_key}, {next_key}, created_at FROM {table}")
+    ).all()
+
+    lists = defaultdict(list)
+    for row in rows:
+        lists[getattr(row, scope)].append(row)
+
+    updates = []
+    for nodes in lists.values():
+        for i, node in enumerate(linked_order(nodes, prev_key, next_key), 1):
+            updates.append({"id": node.id, "position": i * POSITION_GAP})
+    if updates:
+        connection.execute(text(f"UPDATE {table} SET position = :position WHERE id = :id"), updates)
+
+def upgrade(connection) -> None:
+    inspector = inspect(connection)
+    for table, scope, prev_key, next_key in ORDERED_TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "position" not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN position BIGINT NULL"))
+
+        index = f"ix_{table}_{scope}_position"
+        if index not in {ix["name"] for ix in inspector.get_indexes(table)}:
+            connection.execute(text(f"CREATE INDEX {index} ON {table} ({scope}, position)"))
+
+        backfill_positions(connection, table, scope, prev_key, next_key)
+
+
+if __name__ == "__main__":
+    from migrations import run
+    run(upgrade)
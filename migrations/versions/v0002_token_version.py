@@ -0,0 +1,23 @@
+"""
+Add the `token_version` counter to the user tables. Tokens carry it as
+the `ver` claim and are rejected once it no longer matches.
+"""
+from sqlalchemy import inspect, text
+
+revision = "0002"
+down_revision = "0001"
+
+USER_TABLES = ("admins", "mentors", "students")
+
+
+def upgrade(connection) -> None:
+    inspector = inspect(connection)
+    for table in USER_TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "token_version" not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0"))
+
+
+if __name__ == "__main__":
+    from migrations import run
+    run(upgrade)
@@ -0,0 +1,37 @@
+"""
+Create the secondary indexes behind the queries the services and the
+Celery jobs run most. On MySQL they are built online (in place, without
+locking writes) so the migration can run against a live database.
+"""
+from sqlalchemy import inspect, text
+
+revision = "0003"
+down_revision = "0002"
+
+# table, index name, columns
+INDEXES = (
+    ("admin_projects", "ix_admin_projects_course_id_prev_project_id", ("course_id", "prev_project_id")),
+    ("cohort_projects", "ix_cohort_projects_cohort_id_status", ("cohort_id", "status")),
+    ("cohort_projects", "ix_cohort_projects_cohort_id_next_project_id", ("cohort_id", "next_project_id")),
+    ("student_projects", "ix_student_projects_cohort_id_status_assigned_to", ("cohort_id", "status", "assigned_to")),
+    ("students", "ix_students_cohort_id_created_at_id", ("cohort_id", "created_at", "id")),
+    ("students", "ix_students_course_id_cohort_id", ("course_id", "cohort_id")),
+    ("modules", "ix_modules_course_id_status", ("course_id", "status")),
+    ("cohorts", "ix_cohorts_created_at_id", ("created_at", "id")),
+    ("courses", "ix_courses_created_at_id", ("created_at", "id")),
+    ("mentors", "ix_mentors_created_at_id", ("created_at", "id")),
+)
+
+
+def upgrade(connection) -> None:
+    inspector = inspect(connection)
+    online = " ALGORITHM=INPLACE LOCK=NONE" if connection.dialect.name == "mysql" else ""
+    for table, name, columns in INDEXES:
+        if name in {ix["name"] for ix in inspector.get_indexes(table)}:
+            continue
+        connection.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)}){online}"))
+
+
+if __name__ == "__main__":
+    from migrations import run
+    run(upgrade)
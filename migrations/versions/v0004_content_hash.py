@@ -0,0 +1,47 @@
+"""
+Add `content_hash` next to the markdown_content of the project tables:
+the sha256 of the body, which the API uses as its ETag without loading
+the (now deferred) LONGTEXT column. Existing rows are backfilled in
+batches.
+"""
+import hashlib
+
+from sqlalchemy import inspect, text
+
+revision = "0004"
+down_revision = "0003"
+
+PROJECT_TABLES = ("admin_projects", "cohort_projects")
+BATCH_SIZE = 500
+
+
+def upgrade(connection) -> None:
+    inspector = inspect(connection)
+    for table in PROJECT_TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "content_hash" not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN content_hash VARCHAR(64) NULL"))
+        # the bodies moved to project_contents in 0005
+        if "markdown_content" in columns:
+            backfill(connection, table)
+
+def backfill(connection, table) -> None:
+    select_missing = text(
+        f"SELECT id, markdown_content FROM {table} WHERE content_hash IS NULL"
+        f" AND markdown_content IS NOT NULL AND id > :after ORDER BY id LIMIT {BATCH_SIZE}")
+    set_hash = text(f"UPDATE {table} SET content_hash = :hash WHERE id = :id")
+    after = ""
+    while True:
+        rows = connection.execute(select_missing, {"after": after}).all()
+        if not rows:
+            return
+        connection.execute(set_hash, [
+            {"id": id, "hash": hashlib.sha256(content.encode("utf-8")).hexdigest()}
+            for id, content in rows
+        ])
+        after = rows[-1][0]
+
+
+if __name__ == "__main__":
+    from migrations import run
+    run(upgrade)
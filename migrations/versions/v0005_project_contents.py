@@ -0,0 +1,76 @@
+"""
+Move project bodies into the content addressed `project_contents`
+table: every distinct markdown_content of admin_projects and
+cohort_projects is stored once under its sha256, the projects keep
+only their content_hash, and the copied markdown_content columns are
+dropped. Rows are moved in batches.
+"""
+import hashlib
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, bindparam, inspect, text
+from sqlalchemy.dialects.mysql import LONGTEXT
+
+revision = "0005"
+down_revision = "0004"
+
+PROJECT_TABLES = ("admin_projects", "cohort_projects")
+BATCH_SIZE = 500
+
+PROJECT_CONTENTS = Table(
+    "project_contents", MetaData(),
+    Column("id", String(60), primary_key=True, nullable=False, unique=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("content_hash", String(64), nullable=False, unique=True),
+    Column("markdown_content", LONGTEXT, nullable=False),
+    Column("size", Integer, nullable=False),
+)
+
+
+def upgrade(connection) -> None:
+    PROJECT_CONTENTS.create(connection, checkfirst=True)
+    inspector = inspect(connection)
+    for table in PROJECT_TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "markdown_content" in columns:
+            move_bodies(connection, table)
+            connection.execute(text(f"ALTER TABLE {table} DROP COLUMN markdown_content"))
+
+def move_bodies(connection, table) -> None:
+    select_bodies = text(
+        f"SELECT id, markdown_content FROM {table} WHERE markdown_content IS NOT NULL"
+        f" AND id > :after ORDER BY id LIMIT {BATCH_SIZE}")
+    set_hash = text(f"UPDATE {table} SET content_hash = :hash WHERE id = :id")
+    insert_body = text(
+        "INSERT INTO project_contents (id, created_at, updated_at, content_hash, markdown_content, size)"
+        " VALUES (:id, :now, :now, :hash, :content, :size)")
+    after = ""
+    while True:
+        rows = connection.execute(select_bodies, {"after": after}).all()
+        if not rows:
+            return
+        hashes = [(id, content, hashlib.sha256(content.encode("utf-8")).hexdigest()) for id, content in rows]
+        bodies = {content_hash: content for _, content, content_hash in hashes}
+        stored = stored_hashes(connection, list(bodies))
+        now = datetime.now(timezone.utc)
+        missing = [
+            {"id": str(uuid4()), "now": now, "hash": content_hash,
+             "content": content, "size": len(content.encode("utf-8"))}
+            for content_hash, content in bodies.items() if content_hash not in stored
+        ]
+        if missing:
+            connection.execute(insert_body, missing)
+        connection.execute(set_hash, [{"id": id, "hash": content_hash} for id, _, content_hash in hashes])
+        after = rows[-1][0]
+
+def stored_hashes(connection, hashes) -> set:
+    stmt = text("SELECT content_hash FROM project_contents WHERE content_hash IN :hashes")\
+        .bindparams(bindparam("hashes", expanding=True))
+    return set(connection.execute(stmt, {"hashes": hashes}).scalars())
+
+
+if __name__ == "__main__":
+    from migrations import run
+    run(upgrade)
@@ -0,0 +1,32 @@
+"""
+Store updated_at with microseconds on MySQL (DATETIME(6)) so two
+saves within the same second still change the ETag of the pages
+built from the row. Other databases already keep fractional seconds.
+"""
+from sqlalchemy import inspect, text
+
+revision = "0006"
+down_revision = "0005"
+
+
+TABLES = (
+    "courses", "cohorts", "modules", "admins", "mentors", "students", "mentor_cohort",
+    "admin_projects", "cohort_projects", "student_projects", "project_contents",
+    "leaderboards", "leaderboard_students", "notifications", "points", "streaks",
+)
+
+
+def upgrade(connection) -> None:
+    if connection.dialect.name != "mysql":
+        return
+    inspector = inspect(connection)
+    for table in TABLES:
+        column = {c["name"]: c for c in inspector.get_columns(table)}["updated_at"]
+        if getattr(column["type"], "fsp", None) == 6:
+            continue
+        connection.execute(text(f"ALTER TABLE {table} MODIFY updated_at DATETIME(6) NOT NULL"))
+
+
+if __name__ == "__main__":
+    from migrations import run
+    run(upgrade)
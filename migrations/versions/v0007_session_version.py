@@ -0,0 +1,25 @@
+"""
+Add the `session_version` counter to the user tables. Refresh tokens
+carry it as the `sver` claim and are rejected once it no longer
+matches, which logs the user out on a password change or suspension.
+Other claim changes only bump token_version, so a refresh picks them up.
+"""
+from sqlalchemy import inspect, text
+
+revision = "0007"
+down_revision = "0006"
+
+USER_TABLES = ("admins", "mentors", "students")
+
+
+def upgrade(connection) -> None:
+    inspector = inspect(connection)
+    for table in USER_TABLES:
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "session_version" not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN session_version INTEGER NOT NULL DEFAULT 0"))
+
+
+if __name__ == "__main__":
+    from migrations import run
+    run(upgrade)
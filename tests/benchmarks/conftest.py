@@ -0,0 +1,18 @@
+"""
+Benchmarks are slow and seed a lot of data, they only run when
+RUN_BENCHMARKS=1 is set:
+
+    RUN_BENCHMARKS=1 pytest tests/benchmarks -s
+"""
+import os
+
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="set RUN_BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if "benchmarks" in item.nodeid:
+            item.add_marker(skip)
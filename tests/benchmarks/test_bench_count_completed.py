@@ -0,0 +1,33 @@
+"""
+Latency of /api/v1/student/count/completed must not grow with the
+number of cohort projects that belong to other cohorts.
+"""
+from datetime import date
+
+from app.models.cohort import Cohort
+from app.models.project import AdminProject
+from tests.benchmarks.utils import bulk_create_cohort_projects, median_time, report
+from tests.utils import create_modules_with_projects
+
+
+def test_count_completed_latency_is_flat(app, client, admin, student, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        create_modules_with_projects(student, admin, 8, 3)
+        other_cohort = Cohort(name="Cohort-2", course_id=student.course_id,
+            status="in-progress", start_date=str(date.today()))
+        other_cohort.refresh()
+        pool_project = AdminProject.fetch(course_id=student.course_id)[0]
+
+        auth_r = auth.login(student.username, "test_password", "student")
+        headers = {"Authorization": f"Bearer {auth_r.json['data']['access_token']}"}
+        request = lambda: client.get("/api/v1/student/count/completed", headers=headers)
+
+        baseline = median_time(request)
+        bulk_create_cohort_projects(5000, other_cohort.id, pool_project.id,
+            pool_project.module_id, admin.id, student.course_id)
+        seeded = median_time(request)
+
+        report("count_completed", baseline_ms=round(baseline * 1000, 2),
+               with_5000_cohort_projects_ms=round(seeded * 1000, 2))
+        assert seeded < baseline * 3
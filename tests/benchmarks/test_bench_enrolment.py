@@ -0,0 +1,40 @@
+"""
+Enrolling an intake into a cohort must be a handful of set based
+statements, not two round trips and a commit per student.
+"""
+import time
+from datetime import date
+
+from app.models.cohort import Cohort
+from app.models.user import Student
+from tests.benchmarks.utils import bulk_create_students, report
+from tests.utils import count_statements
+
+
+def test_enrol_5000_students(app, client, admin, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        course = Course(title="Software Engineering", status="published",
+            communication_channel="https://discord.com/invite")
+        course.save()
+        course.refresh()
+        cohort = Cohort(name="Cohort-1", course_id=course.id,
+            status="in-progress", start_date=str(date.today()))
+        cohort.refresh()
+        cohort_id = cohort.id
+        student_ids = bulk_create_students(5000, course.id)
+
+        auth_r = auth.login(admin.username, "test_password", "admin")
+        headers = {"Authorization": f"Bearer {auth_r.json['data']['access_token']}"}
+        start = time.perf_counter()
+        with count_statements() as statements:
+            response = client.post(f"/api/v1/cohort/{cohort_id}/add-students",
+                headers=headers, json={"student_ids": student_ids})
+        duration = time.perf_counter() - start
+
+        report("enrol_students", students=5000, statements=len(statements),
+               duration_ms=round(duration * 1000, 2))
+        assert response.status_code == 200
+        assert Student.count(cohort_id=cohort_id, status="active") == 5000
+        assert len(statements) < 30
@@ -0,0 +1,32 @@
+"""
+order_linked must stay linear: ordering 10k shuffled nodes is a
+dictionary build and a single walk.
+"""
+import random
+from types import SimpleNamespace
+
+from app.models.ordering import order_linked
+from tests.benchmarks.utils import median_time, report
+
+
+def make_shuffled_chain(count):
+    nodes = [SimpleNamespace(id=f"n{i}", prev_project_id=None, next_project_id=None, created_at=None)
+             for i in range(count)]
+    for prev, node in zip(nodes, nodes[1:]):
+        prev.next_project_id = node.id
+        node.prev_project_id = prev.id
+    random.Random(0).shuffle(nodes)
+    return nodes
+
+def test_order_linked_10k_nodes():
+    small = make_shuffled_chain(1_000)
+    large = make_shuffled_chain(10_000)
+
+    small_time = median_time(lambda: order_linked(small, "prev_project_id", "next_project_id"))
+    large_time = median_time(lambda: order_linked(large, "prev_project_id", "next_project_id"))
+
+    report("order_linked", nodes_1k_ms=round(small_time * 1000, 2),
+           nodes_10k_ms=round(large_time * 1000, 2))
+    assert len(order_linked(large, "prev_project_id", "next_project_id").nodes) == 10_000
+    # linear: 10x the nodes must cost well under 100x the time
+    assert large_time < small_time * 30
@@ -0,0 +1,68 @@
+"""
+Listing the projects of a course with large markdown bodies, with the
+body deferred (the default) and loaded eagerly as it used to be.
+Reports the peak memory of the load and the bytes the database sends.
+"""
+import tracemalloc
+from datetime import date
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+
+from app.models.project import AdminProject
+from app.models.project_content import ProjectContent
+from tests.benchmarks.utils import report
+
+PROJECTS = 1_000
+BODY = "# Project\n" + "lorem ipsum dolor sit amet " * 2_000  # ~54KB
+
+
+def bulk_create_admin_projects(count, module_id, author_id, course_id):
+    from app.models import storage
+    today = date.today()
+    content_hash = ProjectContent.store(BODY)
+    rows = [{
+        "id": str(uuid4()), "created_at": today, "updated_at": today,
+        "title": f"Bulk Project {i}", "module_id": module_id, "author_id": author_id,
+        "course_id": course_id, "status": "published", "fa_duration": 2, "sa_duration": 1,
+        "release_range": 3, "content_hash": content_hash,
+    } for i in range(count)]
+    storage.execute(AdminProject.__table__.insert(), rows)
+    storage.save()
+
+def transferred_bytes(stmt) -> int:
+    """Size of the column values the database returns for `stmt`"""
+    from app.models import storage
+    with storage.engine.connect() as connection:
+        rows = connection.execute(stmt).all()
+    return sum(len(str(value)) for row in rows for value in row if value is not None)
+
+def load(course_id, *options):
+    from flask import g
+    g.db_session.expunge_all()
+    tracemalloc.start()
+    projects = AdminProject.fetch(*options, course_id=course_id)
+    dicts = [project.to_dict() for project in projects]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return len(dicts), peak
+
+def test_deferred_markdown_content(app, admin, create_module):
+    course, module = create_module
+    with app.test_request_context():
+        app.preprocess_request()
+        bulk_create_admin_projects(PROJECTS, module["id"], admin.id, course["id"])
+        stmt = select(AdminProject).where(AdminProject.course_id == course["id"])
+
+        eager_rows, eager_peak = load(course["id"], undefer(AdminProject.markdown_content))
+        deferred_rows, deferred_peak = load(course["id"])
+        eager_bytes = transferred_bytes(stmt.options(undefer(AdminProject.markdown_content)))
+        deferred_bytes = transferred_bytes(stmt)
+
+        report("project_content", projects=PROJECTS,
+               eager_peak_kb=eager_peak // 1024, deferred_peak_kb=deferred_peak // 1024,
+               eager_transfer_kb=eager_bytes // 1024, deferred_transfer_kb=deferred_bytes // 1024)
+        assert eager_rows == deferred_rows == PROJECTS
+        assert deferred_bytes * 10 < eager_bytes
+        assert deferred_peak * 5 < eager_peak
@@ -0,0 +1,40 @@
+"""
+Storage used by the bodies of 40 projects released to 200 cohorts:
+with the content addressed store each body is kept once, however many
+cohorts it is released to.
+"""
+from datetime import date
+
+from app.models.cohort import Cohort
+from app.models.project_content import ProjectContent, storage_report
+from tests.benchmarks.utils import bulk_create_cohort_projects, report
+
+COHORTS = 200
+PROJECTS = 40
+BODY = "# Project {}\n" + "lorem ipsum dolor sit amet " * 800  # ~21KB
+
+
+def test_shared_project_bodies(app, admin, create_project):
+    from app.models import storage
+    course, module, project = create_project
+    with app.test_request_context():
+        app.preprocess_request()
+        hashes = [ProjectContent.store(BODY.format(i)) for i in range(PROJECTS)]
+        storage.save()
+        fields = dict(project_pool_id=project["id"], module_id=module["id"],
+                      author_id=admin.id, course_id=course["id"])
+        for i in range(COHORTS):
+            cohort = Cohort(name=f"Cohort-{i}", course_id=course["id"], start_date=date.today())
+            cohort.refresh()
+            for content_hash in hashes:
+                bulk_create_cohort_projects(1, cohort.id, content_hash=content_hash, **fields)
+
+        usage = storage_report()
+
+        report("project_storage", cohorts=COHORTS, projects=PROJECTS,
+               stored_kb=usage["stored_bytes"] // 1024,
+               copied_kb=usage["referenced_bytes"] // 1024,
+               saved_kb=usage["saved_bytes"] // 1024)
+        assert usage["bodies"] == PROJECTS
+        assert usage["references"] == COHORTS * PROJECTS
+        assert usage["stored_bytes"] * COHORTS == usage["referenced_bytes"]
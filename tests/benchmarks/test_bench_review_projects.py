@@ -0,0 +1,39 @@
+"""
+The daily review must stay two UPDATE statements however many
+cohort projects are running.
+"""
+import time
+from datetime import date, timedelta
+
+from app.models.cohort import Cohort
+from app.models.project import CohortProject
+from tests.benchmarks.utils import bulk_create_cohort_projects, report
+from tests.utils import count_statements
+
+
+def test_review_100k_cohort_projects(app, admin, create_project):
+    from jobs.tasks.utils.utils import review_projects
+    course, module, project = create_project
+    today = date.today()
+    with app.test_request_context():
+        app.preprocess_request()
+        cohort = Cohort(name="Cohort-1", course_id=course["id"],
+            status="in-progress", start_date=today - timedelta(days=30))
+        cohort.refresh()
+        fields = dict(cohort_id=cohort.id, project_pool_id=project["id"],
+            module_id=module["id"], author_id=admin.id, course_id=course["id"])
+        # (sa_start_date, end_date) offsets: not due, second attempt, completed, not due
+        for sa_start_in, end_in in ((1, 2), (0, 1), (-2, -1), (3, 4)):
+            bulk_create_cohort_projects(25_000, **fields,
+                sa_start_date=today + timedelta(days=sa_start_in), end_date=today + timedelta(days=end_in))
+
+        start = time.perf_counter()
+        with count_statements() as statements:
+            counts = review_projects()
+        duration = time.perf_counter() - start
+
+        report("review_projects", cohort_projects=100_000, statements=len(statements),
+               duration_ms=round(duration * 1000, 2), **counts)
+        assert counts == {"second-attempt": 25_000, "completed": 25_000}
+        assert CohortProject.count(status="released") == 50_000
+        assert len(statements) == 2
@@ -0,0 +1,45 @@
+"""
+Worker boot must stay cheap: create_app() in a fresh interpreter may
+not build the storage or open a database connection, and must stay
+under STARTUP_BUDGET_SECONDS.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from tests.benchmarks.utils import report
+
+STARTUP_BUDGET_SECONDS = 3.0
+
+PROBE = """
+import json, time
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+connections = []
+event.listen(Pool, "connect", lambda *args: connections.append(1))
+
+start = time.perf_counter()
+from app import create_app
+create_app("testing")
+duration = time.perf_counter() - start
+
+from app.models import storage
+print(json.dumps({"seconds": duration, "connections": len(connections), "storage_loaded": storage.loaded}))
+"""
+
+def run_probe():
+    result = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True,
+                            check=True, env=os.environ.copy(), cwd=os.getcwd())
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_create_app_startup():
+    runs = [run_probe() for _ in range(3)]
+    seconds = sorted(run["seconds"] for run in runs)[1]
+
+    report("create_app startup", median_ms=round(seconds * 1000, 2),
+           connections=runs[0]["connections"], storage_loaded=runs[0]["storage_loaded"])
+    assert all(run["connections"] == 0 for run in runs)
+    assert not any(run["storage_loaded"] for run in runs)
+    assert seconds < STARTUP_BUDGET_SECONDS
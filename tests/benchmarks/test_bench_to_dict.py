@@ -0,0 +1,37 @@
+"""
+Serializing 10k loaded rows with the column level serializer against
+the deepcopy of the instance dictionary it replaced.
+"""
+import copy
+from datetime import date
+
+from app.models.project import CohortProject
+from app.models.project_content import hash_content
+from tests.benchmarks.utils import bulk_create_cohort_projects, median_time, report
+
+
+def deepcopy_to_dict(obj, strip=None):
+    """BaseModel.to_dict before the column level serializer"""
+    skip = {'_sa_instance_state', *(strip or [])}
+    dict_repr = {key: value for key, value in obj.__dict__.items() if key not in skip}
+    return copy.deepcopy(dict_repr)
+
+def test_to_dict_10k_rows(app, admin, create_project):
+    from app.models.cohort import Cohort
+    course, module, project = create_project
+    with app.test_request_context():
+        app.preprocess_request()
+        cohort = Cohort(name="Cohort-1", course_id=course["id"], start_date=date.today())
+        cohort.refresh()
+        bulk_create_cohort_projects(10_000, cohort.id, project["id"], module["id"], admin.id,
+            course["id"], content_hash=hash_content("# Project\n" + "lorem ipsum " * 400))
+        projects = CohortProject.fetch(cohort_id=cohort.id)
+
+        deepcopy_time = median_time(lambda: [deepcopy_to_dict(p) for p in projects], repeat=3)
+        serializer_time = median_time(lambda: [p.to_dict() for p in projects], repeat=3)
+
+        report("to_dict", rows=len(projects), deepcopy_ms=round(deepcopy_time * 1000, 2),
+               serializer_ms=round(serializer_time * 1000, 2),
+               speedup=round(deepcopy_time / serializer_time, 1))
+        assert projects[0].to_dict() == deepcopy_to_dict(projects[0])
+        assert serializer_time < deepcopy_time
@@ -0,0 +1,38 @@
+"""
+Sends per second of one worker against a local stub of ZeptoMail,
+with the pooled session and with a new connection per send.
+"""
+import time
+
+import requests
+
+from tests.benchmarks.utils import report
+from tests.utils import stub_http_server
+
+SENDS = 500
+
+
+def test_sends_per_second(monkeypatch):
+    from jobs.celery import app as celery_app
+    from jobs.tasks.jobs import send_transactional_email
+    from jobs.tasks.utils import zeptomail
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    zeptomail.reset_http_session()
+
+    with stub_http_server() as server:
+        monkeypatch.setenv("ZEPTOMAIL_API_URL", server.url)
+        start = time.perf_counter()
+        for _ in range(SENDS):
+            send_transactional_email.delay("Welcome", "<b>Hi</b>", "student@email.com").get()
+        pooled = time.perf_counter() - start
+        pooled_connections = len({port for _, _, port in server.requests})
+
+        start = time.perf_counter()
+        for _ in range(SENDS):
+            requests.request("POST", f"{server.url}/email", json={})
+        unpooled = time.perf_counter() - start
+
+    zeptomail.reset_http_session()
+    report("zeptomail_sends", sends=SENDS, pooled_per_s=round(SENDS / pooled),
+           new_connection_per_s=round(SENDS / unpooled), pooled_connections=pooled_connections)
+    assert pooled_connections == 1
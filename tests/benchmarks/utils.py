@@ -0,0 +1,64 @@
+import statistics
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+
+def median_time(fn, repeat=5):
+    """Run fn `repeat` times and return the median duration in seconds"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+def report(name, **values):
+    print(f"\n[benchmark] {name}: " + ", ".join(f"{key}={value}" for key, value in values.items()))
+
+def bulk_create_cohort_projects(count, cohort_id, project_pool_id, module_id, author_id, course_id, **fields):
+    """Insert `count` cohort projects with one statement, bypassing the linked list bookkeeping"""
+    from app.models import storage
+    from app.models.project import CohortProject
+    today = date.today()
+    rows = [{
+        "id": str(uuid4()),
+        "created_at": today,
+        "updated_at": today,
+        "title": f"Bulk Project {i}",
+        "module_id": module_id,
+        "author_id": author_id,
+        "course_id": course_id,
+        "cohort_id": cohort_id,
+        "project_pool_id": project_pool_id,
+        "status": "released",
+        "fa_start_date": today,
+        "sa_start_date": today + timedelta(days=2),
+        "end_date": today + timedelta(days=3),
+        **fields,
+    } for i in range(count)]
+    storage.execute(CohortProject.__table__.insert(), rows)
+    storage.save()
+
+def bulk_create_students(count, course_id, **fields):
+    """Insert `count` students with one statement and return their ids"""
+    from app.models import storage
+    from app.models.user import Student
+    today = date.today()
+    rows = [{
+        "id": str(uuid4()),
+        "created_at": today,
+        "updated_at": today,
+        "first_name": "Bulk",
+        "last_name": f"Student {i}",
+        "email": f"bulk_student{i}@email.com",
+        "username": f"bulk_student{i}",
+        "password": "not-a-real-hash",
+        "status": "inactive",
+        "points": 0,
+        "course_id": course_id,
+        **fields,
+    } for i in range(count)]
+    storage.execute(Student.__table__.insert(), rows)
+    storage.save()
+    return [row["id"] for row in rows]
@@ -3,9 +3,19 @@ from datetime import date, timedelta
 
 import pytest
 
+# tasks run eagerly in the tests, their results are not kept
+os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
+
+
+@pytest.fixture(scope="session")
+def database_schema():
+    """Bring the test database up to date once per run, the way a deployment does"""
+    from app.models import storage
+    from migrations import upgrade
+    upgrade(storage.engine)
 
 @pytest.fixture
-def app():
+def app(database_schema):
     from app import create_app
     app = create_app("testing")
 
@@ -150,4 +150,52 @@ def test_mentor_page_patch_user_role_not_admin(app, client, student, auth):
 
         assert response.status_code == 403
         assert data.get("message")
-        assert data.get("data") is None
\ No newline at end of file
+        assert data.get("data") is None
+def test_mentor_page_get_never_loads_passwords(app, client, admin, auth):
+    from tests.utils import count_statements, create_mentors
+    with app.test_request_context():
+        app.preprocess_request()
+        create_mentors()
+
+        response = auth.login(admin.username, "test_password", "admin")
+        headers = {"Authorization": f"Bearer {response.json["data"]["access_token"]}"}
+        with count_statements() as statements:
+            response = client.get('/api/v1/admin/mentors?fields=first_name,email', headers=headers)
+        data = response.json
+
+        assert response.status_code == 200
+        assert set(data["data"]["mentors"][0]) == {"id", "first_name", "email", "cohorts"}
+        assert not [statement for statement in statements if "mentors.password" in statement]
+
+        response = client.get('/api/v1/admin/mentors?fields=password', headers=headers)
+        assert response.status_code == 400
+
+def test_mentor_page_paginates_mentors_with_a_bounded_number_of_queries(app, client, admin, auth):
+    from tests.utils import count_statements, create_cohorts, create_mentors, assign_mentor_to_cohorts
+    with app.test_request_context():
+        app.preprocess_request()
+        course, cohorts = create_cohorts()
+        mentors = create_mentors()
+        assign_mentor_to_cohorts(mentors[0], cohorts)
+        assign_mentor_to_cohorts(mentors[1], [cohorts[0]])
+
+        response = auth.login(admin.username, "test_password", "admin")
+        headers = {"Authorization": f"Bearer {response.json["data"]["access_token"]}"}
+        with count_statements() as statements:
+            response = client.get('/api/v1/admin/mentors?limit=1', headers=headers)
+        data = response.json["data"]
+
+        assert response.status_code == 200
+        assert [mentor["id"] for mentor in data["mentors"]] == [mentors[0]["id"]]
+        assert len(data["mentors"][0]["cohorts"]) == 2
+        assert data["mentors_next_cursor"]
+        # one query per table, never one per mentor or cohort
+        assert len([s for s in statements if "FROM cohorts" in s]) == 2
+        assert len([s for s in statements if "FROM courses" in s]) == 2
+
+        response = client.get(f'/api/v1/admin/mentors?limit=1&mentors_cursor={data["mentors_next_cursor"]}',
+            headers=headers)
+        data = response.json["data"]
+        assert [mentor["id"] for mentor in data["mentors"]] == [mentors[1]["id"]]
+        assert data["mentors"][0]["cohorts"][0]["course"]["id"] == course["id"]
+        assert data["mentors_next_cursor"] is None
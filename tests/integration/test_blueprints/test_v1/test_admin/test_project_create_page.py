@@ -223,4 +223,27 @@ def test_project_create_page_get_user_role_not_admin(app, client, student, auth)
         data = response.json
 
         assert response.status_code == 403
-        assert data.get("data") is None
\ No newline at end of file
+        assert data.get("data") is None
+def test_project_create_page_get_sparse_fields(app, client, admin, auth, create_projects):
+    from tests.utils import count_statements
+    course, _, _ = create_projects
+    auth_response = auth.login(admin.username, "test_password", "admin")
+    headers = {"Authorization": f"Bearer {auth_response.json.get("data").get("access_token")}"}
+
+    response = client.get(f"/api/v1/admin/{course["id"]}/project/new", headers=headers)
+    assert response.status_code == 200
+    assert all("markdown_content" not in project for project in response.json["data"]["projects"])
+
+    with count_statements() as statements:
+        response = client.get(f"/api/v1/admin/{course["id"]}/project/new?fields=title", headers=headers)
+    assert response.status_code == 200
+    assert [set(project) for project in response.json["data"]["projects"]] == [{"id", "title"}] * 2
+    project_query = next(statement for statement in statements if "FROM admin_projects" in statement)
+    assert "admin_projects.markdown_content" not in project_query
+    assert "admin_projects.release_range" not in project_query
+
+    response = client.get(f"/api/v1/admin/{course["id"]}/project/new?fields=title,markdown_content", headers=headers)
+    assert all("markdown_content" in project for project in response.json["data"]["projects"])
+
+    response = client.get(f"/api/v1/admin/{course["id"]}/project/new?fields=title,nope", headers=headers)
+    assert response.status_code == 400
@@ -89,3 +89,34 @@ def test_get_single_project_page_no_next_and_prev_project(app, client, admin, au
         assert data['data']['project']['author']['id'] == admin.id
         assert data['data']['next_project'] is None
         assert data['data']['prev_project'] is None
+
+def test_get_single_project_page_conditional_get(app, client, admin, auth, create_projects):
+    from app.models.project import AdminProject
+    _, _, projects = create_projects
+    token = auth.login(admin.username, "test_password", "admin").json['data']['access_token']
+    url = f"/api/v1/admin/project/{projects[0]['id']}"
+
+    response = client.get(url, headers={"Authorization": f"Bearer {token}"})
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+
+    response = client.get(url, headers={"Authorization": f"Bearer {token}", "If-None-Match": etag})
+    assert response.status_code == 304
+
+    with app.test_request_context():
+        app.preprocess_request()
+        project = AdminProject.search(id=projects[1]["id"])
+        project.update(markdown_content="# Edited")
+        project.save()
+
+    # a neighbour changed: next_project / prev_project are part of the page
+    response = client.get(url, headers={"Authorization": f"Bearer {token}", "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_get_single_project_page_not_found_has_no_etag(app, client, admin, auth):
+    token = auth.login(admin.username, "test_password", "admin").json['data']['access_token']
+    response = client.get("/api/v1/admin/project/missing", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
@@ -0,0 +1,104 @@
+"""
+Test cases for the claims signed into access tokens
+"""
+from flask_jwt_extended import decode_token
+
+from tests.utils import count_statements
+
+
+def login(auth, student):
+    return auth.login(student.username, "test_password", "student").json["data"]
+
+def test_student_token_carries_scope_claims(app, auth, student):
+    tokens = login(auth, student)
+    with app.app_context():
+        claims = decode_token(tokens["access_token"])
+
+    assert claims["course_id"] == student.course_id
+    assert claims["cohort_id"] == student.cohort_id
+    assert claims["status"] == "active"
+    assert claims["ver"] == 0
+
+def test_scoped_endpoints_do_not_reload_the_student(app, client, auth, student):
+    app.config["USER_CACHE_TTL"] = 60
+    headers = {"Authorization": f"Bearer {login(auth, student)['access_token']}"}
+    client.get("/api/v1/student/count/completed", headers=headers)
+
+    with count_statements() as statements:
+        response = client.get("/api/v1/student/projects/current", headers=headers)
+
+    assert response.status_code == 200
+    # the token version is checked, the student row is not reloaded
+    selects = [s for s in statements if "FROM students" in s]
+    assert len(selects) == 1 and "cohort_id" not in selects[0]
+
+def update_student(app, student_id, **kwargs):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.user import Student
+        user = Student.search(id=student_id)
+        user.update(**kwargs)
+        user.save()
+
+def test_changing_the_cohort_revokes_access_tokens(app, client, auth, student):
+    tokens = login(auth, student)
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.cohort import Cohort
+        cohort = Cohort(name="Cohort-2", course_id=student.course_id,
+            status="in-progress", start_date="2030-01-01")
+        cohort_id = cohort.id
+    update_student(app, student.id, cohort_id=cohort_id)
+
+    response = client.get("/api/v1/auth/basic_user_details",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == 401
+
+    # the session survives: a refresh signs the new cohort in
+    response = client.get("/api/v1/auth/refresh",
+        headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 200
+    access_token = response.json["data"]["access_token"]
+    with app.app_context():
+        claims = decode_token(access_token)
+    assert claims["cohort_id"] == cohort_id and claims["ver"] == 1
+    response = client.get("/api/v1/auth/basic_user_details",
+        headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == 200
+
+def test_password_change_and_suspension_end_the_session(app, client, auth, student):
+    tokens = login(auth, student)
+    update_student(app, student.id, password="new_password")
+
+    response = client.get("/api/v1/auth/basic_user_details",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    assert response.status_code == 401
+    response = client.get("/api/v1/auth/refresh",
+        headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 401
+
+    tokens = auth.login(student.username, "new_password", "student").json["data"]
+    update_student(app, student.id, status="suspended")
+    response = client.get("/api/v1/auth/refresh",
+        headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 401
+
+def test_refresh_reissues_claims(app, client, auth, student):
+    tokens = login(auth, student)
+    response = client.get("/api/v1/auth/refresh",
+        headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+
+    assert response.status_code == 200
+    with app.app_context():
+        claims = decode_token(response.json["data"]["access_token"])
+    assert claims["cohort_id"] == student.cohort_id
+
+def test_specific_user_role_is_one_statement(app, student):
+    from app.blueprints.v1.auth.services import check_specific_user_role
+    with app.test_request_context(query_string={"id": student.id}):
+        app.preprocess_request()
+        with count_statements() as statements:
+            role = check_specific_user_role()
+
+    assert role == {"role": "student"}
+    assert len(statements) == 1
@@ -43,7 +43,7 @@ def test_add_students_success(app, client, admin, auth):
         data = response.json
 
         assert response.status_code == 200
-        assert data.get("data") is None
+        assert data["data"]["results"] == [{"id": student_id, "status": "enrolled"}]
         student = Student.search(id=student_id)
         assert student.cohort_id == cohort_id
         assert student.status == "active"
@@ -175,3 +175,71 @@ def test_add_students_user_role_not_admin(app, client, student, auth):
         student = Student.search(id=student_id)
         assert student.cohort_id is None
         assert student.status == "inactive"
+
+def test_add_students_bulk_reports_missing_ids(app, client, admin, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        from app.models.cohort import Cohort
+        from app.models.user import Student
+        from tests.utils import count_statements
+        course = Course(title="Software Engineering", status="published",\
+            communication_channel="https://discord.com/invite")
+        course.save()
+        course.refresh()
+        course_id = course.id
+        cohort = Cohort(name="Cohort-1", status="in-progress", course_id=course_id,\
+            start_date=str(date.today() + timedelta(days=14)))
+        cohort.refresh()
+        cohort_id = cohort.id
+        student_ids = []
+        for i in range(20):
+            student = Student(first_name="Test", last_name="Last", email=f"student{i}@email.com",
+                username=f"test_student{i}", password="test_password", status="inactive",
+                course_id=course_id)
+            student.save()
+            student_ids.append(student.id)
+
+        auth_r = auth.login(admin.username, "test_password", "admin")
+        with count_statements() as statements:
+            response = client.post(f"/api/v1/cohort/{cohort_id}/add-students",
+                headers={
+                    "Authorization": f"Bearer {auth_r.json['data']['access_token']}",
+                },
+                content_type='multipart/form-data',
+                data={'student_ids': student_ids + ["missing-student", student_ids[0]]},
+            )
+        data = response.json
+
+        assert response.status_code == 200
+        results = data["data"]["results"]
+        assert len(results) == 21
+        assert results[-1] == {"id": "missing-student", "status": "not_found"}
+        assert all(result["status"] == "enrolled" for result in results[:-1])
+        assert len([s for s in statements if s.lstrip().upper().startswith("UPDATE")]) == 1
+        assert Student.count(cohort_id=cohort_id, status="active") == 20
+
+def test_add_students_rejects_ids_that_are_not_strings(app, client, admin, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        from app.models.cohort import Cohort
+        course = Course(title="Software Engineering", status="published",\
+            communication_channel="https://discord.com/invite")
+        course.save()
+        course.refresh()
+        cohort = Cohort(name="Cohort-1", status="in-progress", course_id=course.id,\
+            start_date=str(date.today() + timedelta(days=14)))
+        cohort.refresh()
+        cohort_id = cohort.id
+
+        auth_r = auth.login(admin.username, "test_password", "admin")
+        headers = {"Authorization": f"Bearer {auth_r.json['data']['access_token']}"}
+        for student_ids in ([["nested"]], [{"id": "x"}], [42], [None], [""]):
+            response = client.post(f"/api/v1/cohort/{cohort_id}/add-students",
+                headers=headers, json={"student_ids": student_ids})
+            assert response.status_code == 400
+
+        response = client.post(f"/api/v1/cohort/{cohort_id}/add-students",
+            headers=headers, content_type='multipart/form-data', data={'student_ids': [""]})
+        assert response.status_code == 400
@@ -154,3 +154,50 @@ def test_get_all_cohorts_no_cohorts(app, client, admin, auth):
 
         assert response.status_code == 404
         assert data.get("data") is None
+
+def test_get_all_cohorts_paginated(app, client, admin, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        from app.models.cohort import Cohort
+        course = Course(title="Software Engineering", status="published", communication_channel="https://discord.com/invite")
+        course.save()
+        course.refresh()
+        cohort_ids = set()
+        for i in range(5):
+            cohort = Cohort(name=f"Cohort-{i}", course_id=course.id, status="pending",
+                start_date=str(date.today() + timedelta(days=34)))
+            cohort.refresh()
+            cohort_ids.add(cohort.id)
+
+        auth_r = auth.login(admin.username, "test_password", "admin")
+        headers = {"Authorization": f"Bearer {auth_r.json["data"]['access_token']}"}
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            query = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/api/v1/cohort/all", query_string=query, headers=headers)
+            assert response.status_code == 200
+            data = response.json["data"]
+            assert len(data["cohorts"]) <= 2
+            seen.extend(cohort["id"] for cohort in data["cohorts"])
+            pages += 1
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert pages == 3
+        assert len(seen) == 5
+        assert set(seen) == cohort_ids
+
+def test_get_all_cohorts_invalid_pagination_args(app, client, admin, auth):
+    auth_r = auth.login(admin.username, "test_password", "admin")
+    headers = {"Authorization": f"Bearer {auth_r.json["data"]['access_token']}"}
+
+    response = client.get("/api/v1/cohort/all?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+    response = client.get("/api/v1/cohort/all?limit=abc", headers=headers)
+    assert response.status_code == 400
+    response = client.get("/api/v1/cohort/all?limit=0", headers=headers)
+    assert response.status_code == 400
@@ -197,4 +197,38 @@ def test_get_cohort_students_user_logged_out(app, client):
         response = client.get(f'/api/v1/cohort/{cohort_id}/students')
         data = response.json
         assert response.status_code == 401
-        assert data.get("data") is None
\ No newline at end of file
+        assert data.get("data") is None
+
+def test_get_cohort_students_paginated(app, client, admin, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        from app.models.cohort import Cohort
+        from app.models.user import Student
+        course = Course(title="Software Engineering", status="published", communication_channel="https://discord.com/invite")
+        course.save()
+        course.refresh()
+        cohort = Cohort(name="Cohort-1", course_id=course.id, status="in-progress", start_date=str(date.today() + timedelta(days=34)))
+        cohort.refresh()
+        cohort_id = cohort.id
+        for i in range(3):
+            Student(first_name="John", last_name="Doe", email=f"student{i}@email.com",
+                cohort_id=cohort_id, course_id=course.id, password="test_password",
+                username=f"test_student{i}").save()
+
+        auth_r = auth.login(admin.username, 'test_password', "admin")
+        headers = {"Authorization": f"Bearer {auth_r.json['data']['access_token']}"}
+        response = client.get(f'/api/v1/cohort/{cohort_id}/students?limit=2', headers=headers)
+        data = response.json
+        assert response.status_code == 200
+        assert len(data['data']['cohort']['students']) == 2
+        assert data['data']['next_cursor'] is not None
+
+        response = client.get(f'/api/v1/cohort/{cohort_id}/students', headers=headers,
+            query_string={"limit": 2, "cursor": data['data']['next_cursor']})
+        next_page = response.json
+        assert response.status_code == 200
+        assert len(next_page['data']['cohort']['students']) == 1
+        assert next_page['data']['next_cursor'] is None
+        first_ids = {student['id'] for student in data['data']['cohort']['students']}
+        assert next_page['data']['cohort']['students'][0]['id'] not in first_ids
@@ -0,0 +1,31 @@
+"""
+Test cases for /api/v1/course/<course_id>/all endpoint
+"""
+from tests.utils import count_statements, create_cohorts
+
+
+def test_all_course_data_conditional_get(app, client):
+    from app.models.module import Module
+    with app.test_request_context():
+        app.preprocess_request()
+        course, cohorts = create_cohorts()
+    url = f"/api/v1/course/{course['id']}/all"
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+    assert len(response.json["data"]["course"]["cohorts"]) == 2
+
+    with count_statements() as statements:
+        response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert len(statements) == 1
+
+    with app.test_request_context():
+        app.preprocess_request()
+        Module(title="Module 1", course_id=course["id"]).save()
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json["data"]["course"]["modules"]) == 1
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,26 @@
+"""
+Test cases for /api/v1/course/all endpoint
+"""
+from tests.utils import create_cohorts
+
+
+def test_get_all_courses_success(app, client, student):
+    with app.test_request_context():
+        app.preprocess_request()
+        course, cohorts = create_cohorts()
+
+    response = client.get("/api/v1/course/all")
+    data = response.json
+
+    assert response.status_code == 200
+    courses = {course["id"]: course for course in data["data"]["courses"]}
+    assert len(courses) == 2
+    assert len(courses[course["id"]]["cohorts"]) == 2
+    assert [cohort["students"] for cohort in courses[course["id"]]["cohorts"]] == [0, 0]
+    assert [cohort["students"] for cohort in courses[student.course_id]["cohorts"]] == [1]
+
+def test_get_all_courses_no_courses(client):
+    response = client.get("/api/v1/course/all")
+
+    assert response.status_code == 404
+    assert response.json.get("data") is None
@@ -0,0 +1,96 @@
+"""
+Test cases for /api/v1/student/projects endpoint
+"""
+from tests.utils import count_statements, create_modules_with_projects
+
+
+def fetch_all_projects(client, token):
+    return client.get("/api/v1/student/projects", headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+def test_allprojects_page_success(app, client, admin, student, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        create_modules_with_projects(student, admin, 2, 2)
+
+        auth_r = auth.login(student.username, "test_password", "student")
+        response = fetch_all_projects(client, auth_r.json['data']['access_token'])
+        data = response.json
+
+        assert response.status_code == 200
+        modules = data['data']['modules']
+        assert len(modules) == 2
+        for module in modules:
+            assert len(module['projects']) == 2
+            statuses = sorted(project['status'] for project in module['projects'])
+            assert statuses == ["graded", "released"]
+
+def test_allprojects_page_no_modules(app, client, student, auth):
+    auth_r = auth.login(student.username, "test_password", "student")
+    response = fetch_all_projects(client, auth_r.json['data']['access_token'])
+    data = response.json
+
+    assert response.status_code == 200
+    assert data['data']['modules'] == []
+
+def test_allprojects_page_statement_count_is_constant(app, client, admin, student, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        auth_r = auth.login(student.username, "test_password", "student")
+        token = auth_r.json['data']['access_token']
+
+        create_modules_with_projects(student, admin, 1, 1)
+        with count_statements() as few:
+            response = fetch_all_projects(client, token)
+        assert response.status_code == 200
+
+        create_modules_with_projects(student, admin, 6, 3)
+        with count_statements() as many:
+            response = fetch_all_projects(client, token)
+        assert response.status_code == 200
+        assert len(response.json['data']['modules']) == 7
+
+        assert len(many) == len(few)
+
+def test_allprojects_page_user_not_logged_in(client):
+    response = client.get("/api/v1/student/projects")
+    data = response.json
+
+    assert response.status_code == 401
+    assert data.get("data") is None
+
+def test_allprojects_page_conditional_get(app, client, admin, student, auth):
+    from app.models.project import StudentProject
+    with app.test_request_context():
+        app.preprocess_request()
+        create_modules_with_projects(student, admin, 3, 2)
+    token = auth.login(student.username, "test_password", "student").json['data']['access_token']
+
+    with count_statements() as full:
+        response = fetch_all_projects(client, token)
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+
+    served_from_validator = 0
+    for _ in range(10):
+        with count_statements() as statements:
+            response = client.get("/api/v1/student/projects", headers={
+                "Authorization": f"Bearer {token}", "If-None-Match": etag})
+        if response.status_code == 304:
+            served_from_validator += 1
+        assert response.data == b""
+        assert len(statements) < len(full)
+        assert not any("cohort_projects.title" in statement for statement in statements)
+    assert served_from_validator == 10
+
+    with app.test_request_context():
+        app.preprocess_request()
+        submission = StudentProject.search(student_id=student.id)[0]
+        submission.update(status="submitted")
+        submission.save()
+
+    response = client.get("/api/v1/student/projects", headers={
+        "Authorization": f"Bearer {token}", "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,54 @@
+"""
+Test cases for /api/v1/student/count/completed endpoint
+"""
+from tests.utils import count_statements, create_modules_with_projects
+
+
+def fetch_completed_counts(client, token):
+    return client.get("/api/v1/student/count/completed", headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+def test_count_completed_success(app, client, admin, student, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        create_modules_with_projects(student, admin, 1, 2, submitted=2)
+        create_modules_with_projects(student, admin, 1, 2, submitted=1)
+        create_modules_with_projects(student, admin, 1, 0)
+
+        auth_r = auth.login(student.username, "test_password", "student")
+        response = fetch_completed_counts(client, auth_r.json['data']['access_token'])
+        data = response.json
+
+        assert response.status_code == 200
+        assert data['data']['modules'] == {"completed": 1, "all": 3}
+        assert data['data']['projects'] == {"completed": 3, "all": 4}
+
+def test_count_completed_no_modules(app, client, student, auth):
+    auth_r = auth.login(student.username, "test_password", "student")
+    response = fetch_completed_counts(client, auth_r.json['data']['access_token'])
+    data = response.json
+
+    assert response.status_code == 200
+    assert data['data']['modules'] == {"completed": 0, "all": 0}
+
+def test_count_completed_statement_count_is_constant(app, client, admin, student, auth):
+    with app.test_request_context():
+        app.preprocess_request()
+        auth_r = auth.login(student.username, "test_password", "student")
+        token = auth_r.json['data']['access_token']
+
+        create_modules_with_projects(student, admin, 1, 1)
+        with count_statements() as few:
+            fetch_completed_counts(client, token)
+
+        create_modules_with_projects(student, admin, 5, 2)
+        with count_statements() as many:
+            fetch_completed_counts(client, token)
+
+        assert len(many) == len(few)
+
+def test_count_completed_user_not_logged_in(client):
+    response = client.get("/api/v1/student/count/completed")
+
+    assert response.status_code == 401
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture
+def worker_app(app, monkeypatch):
+    """Make the test application the one of the current worker process"""
+    from jobs.tasks import context
+    monkeypatch.setattr(context, "_flask_app", app)
+    return app
@@ -0,0 +1,51 @@
+"""
+Test cases for the chunked, rate limited release notifications
+"""
+from datetime import date
+from types import SimpleNamespace
+
+from tests.benchmarks.utils import bulk_create_students
+
+
+def test_token_bucket_spaces_requests_after_a_burst():
+    from jobs.tasks.utils.utils import TokenBucket
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=3, clock=lambda: now[0])
+
+    assert [bucket.reserve() for _ in range(6)] == [0, 0, 0, 0.5, 1.0, 1.5]
+    now[0] = 10.0
+    assert bucket.reserve() == 0
+
+def test_notifications_are_chunked_deduplicated_and_rate_limited(app, create_course, monkeypatch):
+    from app.models.cohort import Cohort
+    from jobs.tasks import jobs
+    from jobs.tasks.utils.utils import TokenBucket, notify_students_of_released_projects
+    sent = []
+    def apply_async(args, countdown):
+        sent.append((args, countdown))
+        return SimpleNamespace(id=f"task-{len(sent)}")
+    monkeypatch.setattr(jobs.send_batch_transactional_email, "apply_async", apply_async)
+
+    with app.test_request_context():
+        app.preprocess_request()
+        cohort = Cohort(name="Cohort-1", course_id=create_course["id"],
+            status="in-progress", start_date=date.today())
+        cohort.refresh()
+        bulk_create_students(1200, create_course["id"], cohort_id=cohort.id)
+        # the same address again, with stray whitespace
+        bulk_create_students(1, create_course["id"], cohort_id=cohort.id,
+            email=" bulk_student0@email.com", username="bulk_duplicate")
+        project = {"title": "Test Project", "end_date": date.today()}
+        now = [0.0]
+
+        outcomes = notify_students_of_released_projects([project], cohort,
+            TokenBucket(rate=2, capacity=2, clock=lambda: now[0]))
+
+    assert [(o["chunk"], o["recipients"], o["countdown"], o["status"]) for o in outcomes] == [
+        (0, 500, 0.0, "queued"), (1, 500, 0.0, "queued"), (2, 200, 0.5, "queued")]
+    assert [o["task_id"] for o in outcomes] == ["task-1", "task-2", "task-3"]
+    receipients = [receipient for (_, chunk, _), _ in sent for receipient in chunk]
+    assert all(isinstance(receipient, dict) for receipient in receipients)
+    addresses = [receipient["email_address"]["address"] for receipient in receipients]
+    assert len(addresses) == len(set(addresses)) == 1200
+    assert receipients[0]["merge_info"] == {"first_name": "Bulk"}
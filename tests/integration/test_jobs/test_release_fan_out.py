@@ -0,0 +1,75 @@
+"""
+Test cases for the release fan-out, run with Celery in eager mode
+"""
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def eager(worker_app, monkeypatch):
+    from jobs.celery import app as celery_app
+    from jobs.tasks.utils import utils
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(utils, "notify_students_of_released_projects", lambda *args: None)
+    return worker_app
+
+def create_cohorts(app, course_id, count):
+    from app.models.cohort import Cohort
+    with app.test_request_context():
+        app.preprocess_request()
+        ids = []
+        for i in range(count):
+            cohort = Cohort(name=f"Cohort-{i}", course_id=course_id, status="in-progress",
+                start_date=date.today() - timedelta(days=10))
+            cohort.refresh()
+            ids.append(cohort.id)
+        return ids
+
+def released_count(app, cohort_id):
+    from app.models.project import CohortProject
+    with app.test_request_context():
+        app.preprocess_request()
+        return CohortProject.count(cohort_id=cohort_id)
+
+def test_release_fans_out_one_subtask_per_batch(eager, create_projects, monkeypatch):
+    from jobs.tasks import jobs
+    course, _, _ = create_projects
+    cohort_ids = create_cohorts(eager, course["id"], 3)
+    monkeypatch.setattr(jobs, "release_batches", lambda ids: [[cohort_id] for cohort_id in ids])
+    batches, summaries = [], []
+    original = jobs.release_cohort_batch
+    monkeypatch.setattr(jobs, "release_cohort_batch", lambda ids, today: batches.append(ids) or original(ids, today))
+    monkeypatch.setattr(jobs.logger, "info", lambda message, summary: summaries.append(summary))
+
+    assert jobs.release_projects() == {"cohorts": 3, "batches": 3}
+
+    assert sorted(batches) == sorted([cohort_id] for cohort_id in cohort_ids)
+    assert summaries == [{"cohorts": 3, "released": 6, "failed": []}]
+    assert [released_count(eager, cohort_id) for cohort_id in cohort_ids] == [2, 2, 2]
+
+def test_failed_cohorts_are_retried_then_reported(eager, create_projects, monkeypatch):
+    from jobs.tasks import jobs
+    from jobs.tasks.utils import utils
+    course, _, _ = create_projects
+    flaky, broken, healthy = create_cohorts(eager, course["id"], 3)
+    attempts = {flaky: 0, broken: 0, healthy: 0}
+    original = utils.release_due_projects
+    def release_due_projects(cohort_id, *args):
+        attempts[cohort_id] += 1
+        if cohort_id == broken or (cohort_id == flaky and attempts[flaky] == 1):
+            raise RuntimeError("lock wait timeout")
+        return original(cohort_id, *args)
+    monkeypatch.setattr(utils, "release_due_projects", release_due_projects)
+    summaries = []
+    monkeypatch.setattr(jobs.logger, "info", lambda message, summary: summaries.append(summary))
+    failures = []
+    monkeypatch.setattr(utils.logger, "exception", lambda message, cohort_id: failures.append(cohort_id))
+
+    jobs.dispatch_release([flaky, broken, healthy])
+
+    assert attempts == {flaky: 2, broken: 1 + jobs.release_cohorts.max_retries, healthy: 1}
+    assert summaries == [{"cohorts": 3, "released": 4, "failed": [broken]}]
+    assert sorted(failures) == sorted([flaky] + [broken] * attempts[broken])
+    assert released_count(eager, flaky) == 2
+    assert released_count(eager, broken) == 0
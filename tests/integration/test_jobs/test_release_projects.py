@@ -0,0 +1,81 @@
+"""
+Test cases for the catch-up project release engine
+"""
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+
+def create_cohort(course_id, name="Cohort-1", started_days_ago=10, status="in-progress"):
+    from app.models.cohort import Cohort
+    cohort = Cohort(name=name, course_id=course_id, status=status,
+        start_date=date.today() - timedelta(days=started_days_ago))
+    cohort.refresh()
+    return cohort.id
+
+def released_schedule(cohort_id):
+    from app.models.project import CohortProject
+    projects = CohortProject.fetch_in_order(cohort_id=cohort_id)
+    return [(pjt.project_pool_id, pjt.fa_start_date) for pjt in projects]
+
+def test_due_releases_follows_the_schedule():
+    from jobs.tasks.utils.utils import due_releases
+    start = date(2024, 1, 1)
+    sequence = [SimpleNamespace(id=str(i), release_range=3) for i in range(4)]
+
+    due = due_releases(sequence, {}, start, start + timedelta(days=7))
+    assert [(project.id, day) for project, day in due] == [
+        ("0", start), ("1", start + timedelta(days=3)), ("2", start + timedelta(days=6))]
+
+    # released projects anchor the next release date on their own start date
+    due = due_releases(sequence, {"0": start, "1": start + timedelta(days=5)}, start, start + timedelta(days=8))
+    assert [(project.id, day) for project, day in due] == [("2", start + timedelta(days=8))]
+
+    assert due_releases(sequence, {}, start, start - timedelta(days=1)) == []
+
+def test_release_catches_up_on_missed_days(app, create_projects):
+    from jobs.tasks.utils.utils import get_project_sequence, release_due_projects
+    course, _, _ = create_projects
+    with app.test_request_context():
+        app.preprocess_request()
+        cohort_id = create_cohort(course["id"])
+        first, second = get_project_sequence(course["id"])
+        start = date.today() - timedelta(days=10)
+
+        released = release_due_projects(cohort_id)
+
+        assert [project["project_pool_id"] for project in released] == [first.id, second.id]
+        assert released_schedule(cohort_id) == [
+            (first.id, start), (second.id, start + timedelta(days=second.release_range))]
+        assert released[1]["end_date"] == start + timedelta(
+            days=second.release_range + second.fa_duration + second.sa_duration)
+
+def test_release_is_idempotent(app, create_projects):
+    from jobs.tasks.utils.utils import release_due_projects
+    course, _, _ = create_projects
+    with app.test_request_context():
+        app.preprocess_request()
+        cohort_id = create_cohort(course["id"])
+        assert len(release_due_projects(cohort_id)) == 2
+        schedule = released_schedule(cohort_id)
+
+        assert release_due_projects(cohort_id) == []
+        assert released_schedule(cohort_id) == schedule
+
+def test_release_waits_for_the_release_date(app, create_projects):
+    from jobs.tasks.utils.utils import get_project_sequence, release_due_projects
+    course, _, _ = create_projects
+    with app.test_request_context():
+        app.preprocess_request()
+        cohort_id = create_cohort(course["id"], started_days_ago=0)
+        first, _ = get_project_sequence(course["id"])
+
+        released = release_due_projects(cohort_id)
+
+        assert [project["project_pool_id"] for project in released] == [first.id]
+        assert release_due_projects(create_cohort(course["id"], "Cohort-2", -1, "pending")) == []
+
+def test_release_batches_are_bounded():
+    from jobs.tasks.utils.utils import release_batches
+    assert release_batches([]) == []
+    assert release_batches(list(range(5)), batch_size=2) == [[0, 1], [2, 3], [4]]
+    assert [len(batch) for batch in release_batches(list(range(100)), batch_size=2, max_batches=4)] == [25] * 4
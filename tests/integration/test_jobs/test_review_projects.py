@@ -0,0 +1,54 @@
+"""
+Test cases for the daily status transitions of cohort projects
+"""
+from datetime import date, timedelta
+
+from tests.utils import count_statements
+
+
+def create_cohort_project(cohort, project, status, sa_start_in, end_in):
+    from app.models.project import CohortProject
+    today = date.today()
+    cohort_project = CohortProject(title=project["title"], module_id=project["module_id"],
+        author_id=project["author_id"], course_id=project["course_id"], cohort_id=cohort.id,
+        project_pool_id=project["id"], status=status, fa_start_date=today - timedelta(days=5),
+        sa_start_date=today + timedelta(days=sa_start_in), end_date=today + timedelta(days=end_in))
+    cohort_project.refresh()
+    return cohort_project.id
+
+def test_review_projects_moves_every_due_project(app, create_project):
+    from app.models.cohort import Cohort
+    from app.models.project import CohortProject
+    from jobs.tasks.utils.utils import review_projects
+    course, _, project = create_project
+    with app.test_request_context():
+        app.preprocess_request()
+        active = Cohort(name="Cohort-1", course_id=course["id"], status="in-progress",
+            start_date=date.today() - timedelta(days=10))
+        active.refresh()
+        ended = Cohort(name="Cohort-2", course_id=course["id"], status="completed",
+            start_date=date.today() - timedelta(days=90))
+        ended.refresh()
+        ids = {
+            "not_due": create_cohort_project(active, project, "released", 1, 2),
+            "second_attempt": create_cohort_project(active, project, "released", 0, 1),
+            "past_both": create_cohort_project(active, project, "released", -2, -1),
+            "sa_ended": create_cohort_project(active, project, "second-attempt", -1, 0),
+            "ended_cohort": create_cohort_project(ended, project, "released", -2, -1),
+        }
+
+        with count_statements() as statements:
+            counts = review_projects()
+
+        assert counts == {"second-attempt": 1, "completed": 2}
+        assert len(statements) == 2
+        statuses = {name: CohortProject.search(id=id).status for name, id in ids.items()}
+        assert statuses == {
+            "not_due": "released",
+            "second_attempt": "second-attempt",
+            "past_both": "completed",
+            "sa_ended": "completed",
+            "ended_cohort": "released",
+        }
+
+        assert review_projects() == {"second-attempt": 0, "completed": 0}
@@ -0,0 +1,55 @@
+"""
+Test cases for the Flask application and session shared by Celery tasks
+"""
+import pytest
+from flask import g
+
+
+def test_flask_app_is_built_once_per_process(monkeypatch):
+    import app as app_module
+    from jobs.tasks import context
+    built = []
+    monkeypatch.setattr(context, "_flask_app", None)
+    monkeypatch.setattr(app_module, "create_app", lambda: built.append(1) or object())
+
+    first = context.get_flask_app()
+    context.init_worker_process()
+
+    assert context.get_flask_app() is first
+    assert len(built) == 1
+
+def test_task_session_closes_the_session(worker_app):
+    from jobs.tasks.context import task_session
+    from app.models.course import Course
+
+    with task_session() as session:
+        assert g.db_session is session
+        Course(title="Task Course", status="published", communication_channel="https://discord.com/invite").save()
+        assert Course.count() == 1
+
+    assert not session.in_transaction()
+
+def test_task_session_rolls_back_on_error(worker_app):
+    from jobs.tasks.context import task_session
+    from app.models.course import Course
+
+    with pytest.raises(RuntimeError):
+        with task_session() as session:
+            session.add(Course(title="Never Saved", status="published", communication_channel="https://discord.com/invite"))
+            session.flush()
+            raise RuntimeError("task failed")
+
+    with task_session():
+        assert Course.count() == 0
+
+def test_tasks_run_in_a_task_session(worker_app, monkeypatch):
+    from jobs.tasks import jobs
+    sessions = []
+    monkeypatch.setattr(jobs, "get_pending_cohorts", lambda: sessions.append(g.db_session) or [])
+    monkeypatch.setattr(jobs, "get_active_cohorts", lambda: sessions.append(g.db_session) or [])
+
+    jobs.start_cohorts()
+    jobs.release_projects()
+
+    assert len(sessions) == 2
+    assert sessions[0] is not sessions[1]
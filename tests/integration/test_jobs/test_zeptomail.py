@@ -0,0 +1,77 @@
+"""
+Test cases for the mailing tasks, sent to a local stub of ZeptoMail
+"""
+from contextlib import ExitStack
+
+import pytest
+
+from tests.utils import stub_http_server
+
+
+@pytest.fixture
+def zeptomail_stub(monkeypatch):
+    from jobs.celery import app as celery_app
+    from jobs.tasks.utils import zeptomail
+    monkeypatch.setitem(celery_app.conf, "task_always_eager", True)
+    zeptomail.reset_http_session()
+
+    def start(*statuses):
+        server = stack.enter_context(stub_http_server(statuses))
+        monkeypatch.setenv("ZEPTOMAIL_API_URL", server.url)
+        return server
+
+    with ExitStack() as stack:
+        yield start
+    zeptomail.reset_http_session()
+
+def test_send_returns_a_delivery_result(zeptomail_stub):
+    from jobs.tasks.jobs import send_transactional_email
+    server = zeptomail_stub()
+
+    result = send_transactional_email.delay("Welcome", "<b>Hi</b>", "student@email.com").get()
+
+    assert result["status"] == "sent"
+    assert result["status_code"] == 200
+    path, payload, _ = server.requests[0]
+    assert path == "/email"
+    assert payload["to"] == [{"email_address": {"address": "student@email.com"}}]
+
+def test_sends_reuse_one_connection(zeptomail_stub):
+    from jobs.tasks.jobs import send_batch_transactional_email
+    server = zeptomail_stub()
+
+    for _ in range(5):
+        send_batch_transactional_email.delay("News", [], "<b>Hi</b>").get()
+
+    assert [path for path, _, _ in server.requests] == ["/email/batch"] * 5
+    assert len({port for _, _, port in server.requests}) == 1
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_rate_limits_and_server_errors_are_retried(zeptomail_stub, status):
+    from jobs.tasks.jobs import send_transactional_email
+    server = zeptomail_stub(status, status)
+
+    result = send_transactional_email.delay("Welcome", "<b>Hi</b>", "student@email.com").get()
+
+    assert result["status"] == "sent"
+    assert len(server.requests) == 3
+
+def test_client_errors_are_not_retried(zeptomail_stub):
+    from jobs.tasks.jobs import send_transactional_email
+    server = zeptomail_stub(400)
+
+    result = send_transactional_email.delay("Welcome", "<b>Hi</b>", "not-an-email").get()
+
+    assert result["status"] == "failed"
+    assert result["status_code"] == 400
+    assert len(server.requests) == 1
+
+def test_retries_give_up_after_max_retries(zeptomail_stub):
+    from jobs.tasks.jobs import send_transactional_email
+    from jobs.tasks.utils.zeptomail import RetryableDeliveryError
+    server = zeptomail_stub(*[503] * 10)
+
+    with pytest.raises(RetryableDeliveryError):
+        send_transactional_email.delay("Welcome", "<b>Hi</b>", "student@email.com").get()
+
+    assert len(server.requests) == 1 + send_transactional_email.max_retries
@@ -0,0 +1,69 @@
+"""
+Test cases for the migration runner
+"""
+from sqlalchemy import inspect
+
+from migrations import applied_revisions, load_revisions, upgrade
+
+
+def test_revisions_form_one_chain():
+    revisions = load_revisions()
+
+    assert revisions[0].revision == "0000"
+    assert revisions[0].down_revision is None
+    for parent, child in zip(revisions, revisions[1:]):
+        assert child.down_revision == parent.revision
+
+def test_revisions_do_not_import_the_application():
+    import inspect as source
+    for module in load_revisions():
+        # a revision is frozen once shipped: the models keep changing
+        assert "from app" not in source.getsource(module), module.__name__
+
+def test_upgrade_records_every_revision_once(app):
+    from app.models import storage
+
+    assert upgrade(storage.engine) == []
+    assert applied_revisions(storage.engine) == [module.revision for module in load_revisions()]
+
+def test_schema_matches_the_models(app):
+    from app.models import storage
+    from app.models.base import Base
+    inspector = inspect(storage.engine)
+
+    for table in Base.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert columns == set(table.columns.keys()), table.name
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        assert {index.name for index in table.indexes} <= indexes, table.name
+
+def test_storage_does_not_touch_the_schema(monkeypatch):
+    from app.models.base import Base
+    from app.models.engine.dbstorage import DBStorage
+    calls = []
+    monkeypatch.setattr(Base.metadata, "create_all", lambda *args, **kwargs: calls.append(args))
+
+    DBStorage()
+
+    assert calls == []
+
+def test_project_bodies_move_to_project_contents(app, create_projects):
+    from sqlalchemy import text
+    from app.models import storage
+    from app.models.project_content import hash_content
+    from migrations.versions import v0005_project_contents
+    _, _, projects = create_projects
+    with storage.engine.begin() as connection:
+        connection.execute(text("ALTER TABLE admin_projects ADD COLUMN markdown_content TEXT"))
+        connection.execute(text("UPDATE admin_projects SET markdown_content = '# Body', content_hash = NULL"))
+
+    with storage.engine.begin() as connection:
+        v0005_project_contents.upgrade(connection)
+        v0005_project_contents.upgrade(connection)
+        hashes = connection.execute(text("SELECT content_hash FROM admin_projects")).scalars().all()
+        bodies = connection.execute(text("SELECT content_hash, markdown_content, size FROM project_contents")).all()
+
+    assert len(hashes) == len(projects) and set(hashes) == {hash_content("# Body")}
+    assert [tuple(body) for body in bodies] == [(hash_content("# Body"), "# Body", 6)]
+    columns = {column["name"] for column in inspect(storage.engine).get_columns("admin_projects")}
+    assert "markdown_content" not in columns
@@ -0,0 +1,52 @@
+"""
+EXPLAIN based checks: the queries the services and the Celery jobs run
+most must be answered from an index, never by a full table scan.
+"""
+import pytest
+from sqlalchemy import func, select
+
+from tests.utils import full_table_scans
+
+
+def hot_queries():
+    from app.models.cohort import Cohort
+    from app.models.course import Course
+    from app.models.module import Module
+    from app.models.project import AdminProject, CohortProject, StudentProject
+    from app.models.user import Mentor, Student
+    return {
+        "current cohort projects": select(CohortProject).where(
+            CohortProject.cohort_id == "cohort", CohortProject.status.in_(("released", "second-attempt"))),
+        "last cohort project": select(CohortProject).where(
+            CohortProject.cohort_id == "cohort", CohortProject.next_project_id.is_(None)),
+        "admin project list head": select(AdminProject).where(
+            AdminProject.course_id == "course", AdminProject.prev_project_id.is_(None)),
+        "cohort students page": select(Student).where(Student.cohort_id == "cohort")
+            .order_by(Student.created_at, Student.id).limit(50),
+        "students without cohort": select(Student).where(
+            Student.course_id == "course", Student.cohort_id.is_(None)),
+        "published modules": select(Module).where(Module.course_id == "course", Module.status == "published"),
+        "unassigned submissions": select(StudentProject).where(
+            StudentProject.cohort_id == "cohort", StudentProject.status == "submitted",
+            StudentProject.assigned_to.is_(None)),
+        "completed projects count": select(func.count()).select_from(StudentProject).where(
+            StudentProject.student_id == "student", StudentProject.cohort_id == "cohort"),
+        "cohort list page": select(Cohort).order_by(Cohort.created_at, Cohort.id).limit(50),
+        "course list page": select(Course).order_by(Course.created_at, Course.id).limit(50),
+        "mentor list page": select(Mentor).order_by(Mentor.created_at.desc(), Mentor.id.desc()).limit(50),
+    }
+
+@pytest.mark.parametrize("name", [
+    "current cohort projects", "last cohort project", "admin project list head",
+    "cohort students page", "students without cohort", "published modules",
+    "unassigned submissions", "completed projects count", "cohort list page",
+    "course list page", "mentor list page",
+])
+def test_hot_query_uses_an_index(app, name):
+    with app.app_context():
+        assert full_table_scans(hot_queries()[name]) == []
+
+def test_harness_detects_full_scans(app):
+    with app.app_context():
+        from app.models.user import Student
+        assert full_table_scans(select(Student).where(Student.phone == "0800")) == ["students"]
@@ -0,0 +1,106 @@
+"""
+Test cases for the position ordering of linked list models
+"""
+from sqlalchemy import update
+
+
+def create_admin_project(admin, course, module, **kwargs):
+    from app.models.project import AdminProject
+    project = AdminProject(title="Test Project", module_id=module["id"], author_id=admin.id,
+        course_id=course["id"], fa_duration=2, sa_duration=1, release_range=3,
+        status="published", **kwargs)
+    project.refresh()
+    return project.id
+
+def linked_ids(course_id):
+    from app.models.project import AdminProject
+    projects = {project.id: project for project in AdminProject.fetch(course_id=course_id)}
+    node = next(project for project in projects.values() if project.prev_project_id is None)
+    ids = []
+    while node is not None:
+        ids.append(node.id)
+        node = projects.get(node.next_project_id)
+    return ids
+
+def positioned_ids(course_id):
+    from app.models.project import AdminProject
+    projects = AdminProject.query().filter(course_id=course_id).order_by(AdminProject.position).all()
+    return [project.id for project in projects]
+
+def test_positions_follow_inserts(app, admin, create_module):
+    with app.test_request_context():
+        app.preprocess_request()
+        course, module = create_module
+        p1 = create_admin_project(admin, course, module)
+        p2 = create_admin_project(admin, course, module)
+        p3 = create_admin_project(admin, course, module, prev_project_id=p1)
+        p4 = create_admin_project(admin, course, module, prev_project_id=p2)
+
+        assert positioned_ids(course["id"]) == [p2, p4, p1, p3]
+        assert linked_ids(course["id"]) == [p2, p4, p1, p3]
+
+def test_positions_are_renumbered_when_gap_runs_out(app, admin, create_module):
+    with app.test_request_context():
+        app.preprocess_request()
+        course, module = create_module
+        head = create_admin_project(admin, course, module)
+        create_admin_project(admin, course, module, prev_project_id=head)
+        for _ in range(15):
+            create_admin_project(admin, course, module, prev_project_id=head)
+
+        assert len(positioned_ids(course["id"])) == 17
+        assert positioned_ids(course["id"]) == linked_ids(course["id"])
+
+def test_positions_follow_moves(app, admin, create_module):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.project import AdminProject
+        course, module = create_module
+        p1 = create_admin_project(admin, course, module)
+        p2 = create_admin_project(admin, course, module, prev_project_id=p1)
+        p3 = create_admin_project(admin, course, module, prev_project_id=p2)
+
+        project = AdminProject.search(id=p3)
+        project.update(prev_project_id=p1)
+        project.save()
+        assert positioned_ids(course["id"]) == [p1, p3, p2]
+
+        project = AdminProject.search(id=p2)
+        project.update(prev_project_id=None)
+        project.save()
+        assert positioned_ids(course["id"]) == [p2, p1, p3]
+
+def test_migration_backfills_positions(app, admin, create_module):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models import storage
+        from app.models.project import AdminProject
+        from migrations.versions.v0001_ordering_positions import upgrade
+        course, module = create_module
+        p1 = create_admin_project(admin, course, module)
+        p2 = create_admin_project(admin, course, module)
+        p3 = create_admin_project(admin, course, module, prev_project_id=p2)
+        storage.execute(update(AdminProject).values(position=None))
+        storage.save()
+        storage.close()
+
+        with storage.engine.begin() as connection:
+            upgrade(connection)
+
+        app.preprocess_request()
+        assert positioned_ids(course["id"]) == [p2, p3, p1]
+
+def test_cohorts_are_appended_after_the_highest_position(app, create_module):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.cohort import Cohort
+        course, _ = create_module
+        ids = []
+        for i in range(3):
+            cohort = Cohort(name=f"Cohort-{i}", course_id=course["id"], start_date="2025-01-06")
+            ids.append(cohort.id)
+
+        cohorts = Cohort.query().filter(course_id=course["id"]).order_by(Cohort.position).all()
+        assert [cohort.id for cohort in cohorts] == ids
+        assert [cohort.next_cohort_id for cohort in cohorts] == ids[1:] + [None]
+        assert [cohort.prev_cohort_id for cohort in cohorts] == [None] + ids[:-1]
@@ -0,0 +1,145 @@
+"""
+Test cases for the deferred markdown_content of projects, its hash
+and the content addressed store sharing it
+"""
+from datetime import date, timedelta
+
+from app.models.project_content import hash_content
+from tests.utils import count_statements
+
+
+def test_content_hash_follows_the_content(app, create_project):
+    from app.models.project import AdminProject
+    _, _, project = create_project
+    with app.test_request_context():
+        app.preprocess_request()
+        admin_project = AdminProject.search(id=project["id"])
+        admin_project.update(markdown_content="# Version 1")
+        admin_project.save()
+        assert admin_project.content_hash == hash_content("# Version 1")
+
+        admin_project.update(markdown_content=None)
+        assert admin_project.content_hash is None
+
+def test_markdown_content_is_deferred(app, create_project):
+    from app.models.project import AdminProject
+    _, _, project = create_project
+    with app.test_request_context():
+        app.preprocess_request()
+        admin_project = AdminProject.search(id=project["id"])
+        admin_project.update(markdown_content="# Body")
+        admin_project.save()
+
+    with app.test_request_context():
+        app.preprocess_request()
+        with count_statements() as statements:
+            admin_project = AdminProject.search(id=project["id"])
+            project_dict = admin_project.to_dict()
+        assert "markdown_content" not in project_dict
+        assert project_dict["content_hash"] == hash_content("# Body")
+        assert "markdown_content" not in statements[0]
+
+    with app.test_request_context():
+        app.preprocess_request()
+        with count_statements() as statements:
+            admin_project = AdminProject.search_with_content(id=project["id"])
+            project_dict = admin_project.to_dict()
+        assert project_dict["markdown_content"] == "# Body"
+        assert len(statements) == 1
+
+def test_equal_bodies_are_stored_once(app, create_projects):
+    from app.models.project import AdminProject
+    from app.models.project_content import ProjectContent
+    _, _, projects = create_projects
+    with app.test_request_context():
+        app.preprocess_request()
+        for project in AdminProject.fetch():
+            project.update(markdown_content="# Shared")
+        AdminProject.fetch()[0].save()
+
+    with app.test_request_context():
+        app.preprocess_request()
+        assert ProjectContent.count() == 1
+        assert {p.markdown_content for p in AdminProject.fetch()} == {"# Shared"}
+
+def test_released_projects_share_the_body(app, create_projects):
+    from app.models.cohort import Cohort
+    from app.models.project import AdminProject, CohortProject
+    from app.models.project_content import ProjectContent, storage_report
+    from jobs.tasks.utils.utils import release_due_projects
+    course, _, projects = create_projects
+    with app.test_request_context():
+        app.preprocess_request()
+        admin_project = AdminProject.search(id=projects[0]["id"])
+        admin_project.update(markdown_content="# Shared")
+        admin_project.save()
+        cohort_ids = []
+        for name in ("Cohort-1", "Cohort-2", "Cohort-3"):
+            cohort = Cohort(name=name, course_id=course["id"], status="in-progress",
+                            start_date=date.today() - timedelta(days=10))
+            cohort.refresh()
+            cohort_ids.append(cohort.id)
+        for cohort_id in cohort_ids:
+            release_due_projects(cohort_id)
+
+    with app.test_request_context():
+        app.preprocess_request()
+        copies = CohortProject.fetch(project_pool_id=projects[0]["id"])
+        assert len(copies) == 3
+        assert {copy.markdown_content for copy in copies} == {"# Shared"}
+        assert ProjectContent.count() == 1
+        report = storage_report()
+        assert report["bodies"] == 1 and report["references"] == 4
+        assert report["saved_bytes"] == 3 * len("# Shared")
+
+def test_editing_a_copy_leaves_the_shared_body(app, create_project):
+    from app.models.cohort import Cohort
+    from app.models.project import AdminProject, CohortProject
+    from jobs.tasks.utils.utils import release_due_projects
+    course, _, project = create_project
+    with app.test_request_context():
+        app.preprocess_request()
+        admin_project = AdminProject.search(id=project["id"])
+        admin_project.update(markdown_content="# Shared")
+        admin_project.save()
+        cohort = Cohort(name="Cohort-1", course_id=course["id"], status="in-progress",
+                        start_date=date.today())
+        cohort.refresh()
+        cohort_id = cohort.id
+        release_due_projects(cohort_id)
+
+    with app.test_request_context():
+        app.preprocess_request()
+        copy = CohortProject.search(cohort_id=cohort_id)
+        copy.update(markdown_content="# Cohort specific")
+        copy.save()
+
+    with app.test_request_context():
+        app.preprocess_request()
+        assert CohortProject.search(cohort_id=cohort_id).markdown_content == "# Cohort specific"
+        assert AdminProject.search(id=project["id"]).markdown_content == "# Shared"
+
+def test_body_stored_concurrently_is_reused(app, create_project, monkeypatch):
+    from flask import g
+    from app.models import storage
+    from app.models.project import AdminProject
+    from app.models.project_content import ProjectContent
+    _, _, project = create_project
+    with app.test_request_context():
+        app.preprocess_request()
+        ProjectContent.store("# Shared")
+        storage.save()
+
+    with app.test_request_context():
+        app.preprocess_request()
+        admin_project = AdminProject.search(id=project["id"])
+        # another request stored the body after this one looked it up
+        monkeypatch.setattr(g.db_session, "scalar", lambda stmt: None)
+        admin_project.update(markdown_content="# Shared")
+        monkeypatch.undo()
+        admin_project.save()
+
+    with app.test_request_context():
+        app.preprocess_request()
+        assert ProjectContent.count() == 1
+        assert AdminProject.search_with_content(id=project["id"]).markdown_content == "# Shared"
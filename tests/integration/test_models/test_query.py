@@ -0,0 +1,86 @@
+"""
+Test cases for the chainable DBStorage.query API
+"""
+from datetime import datetime, timedelta
+
+
+def create_courses(count):
+    from app.models.course import Course
+    base = datetime(2025, 1, 1)
+    courses = []
+    for i in range(count):
+        course = Course(title=f"Course {i}", status="published" if i % 2 else "draft",
+            communication_channel="https://discord.com/invite")
+        # two courses share every timestamp to exercise the id tie breaker
+        course.created_at = base + timedelta(minutes=i // 2)
+        course.save()
+        courses.append((course.created_at, course.id))
+    return sorted(courses)
+
+def test_query_always_returns_lists(app):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        assert Course.query().all() == []
+        create_courses(1)
+        assert isinstance(Course.query().all(), list)
+        assert len(Course.query().all()) == 1
+
+def test_query_filter_order_limit_offset(app):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        keys = create_courses(6)
+        courses = Course.query().order_by(Course.created_at, Course.id).offset(1).limit(3).all()
+        assert [course.id for course in courses] == [key[1] for key in keys[1:4]]
+        assert Course.query().filter(status="published").count() == 3
+        assert Course.query().filter(status=("published", "draft")).count() == 6
+
+def test_query_keyset_pagination(app):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        keys = create_courses(7)
+        for descending in (False, True):
+            order = (Course.created_at.desc(), Course.id.desc()) if descending \
+                else (Course.created_at, Course.id)
+            seen = []
+            page = Course.query().order_by(*order).limit(3).all()
+            while page:
+                seen.extend(course.id for course in page)
+                last = page[-1]
+                page = Course.query().order_by(*order)\
+                    .after(last.created_at, last.id).limit(3).all()
+            expected = [key[1] for key in keys]
+            assert seen == (list(reversed(expected)) if descending else expected)
+
+def test_query_keyset_pagination_with_mixed_directions(app):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        keys = create_courses(7)
+        order = (Course.created_at.desc(), Course.id)
+        seen = []
+        page = Course.query().order_by(*order).limit(3).all()
+        while page:
+            seen.extend(course.id for course in page)
+            last = page[-1]
+            page = Course.query().order_by(*order)\
+                .after(last.created_at, last.id).limit(3).all()
+        expected = sorted(keys, key=lambda key: (-key[0].timestamp(), key[1]))
+        assert seen == [key[1] for key in expected]
+
+def test_query_only_loads_requested_columns(app):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        create_courses(2)
+        course = Course.query().only("title").first()
+        assert set(course.to_dict().keys()) == {"id", "title"}
+
+def test_query_iter_streams_rows(app):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        create_courses(5)
+        assert len(list(Course.query().iter(batch_size=2))) == 5
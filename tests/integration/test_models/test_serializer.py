@@ -0,0 +1,62 @@
+"""
+Test cases for the column level serialization behind BaseModel.to_dict
+"""
+import enum
+from datetime import date, datetime
+
+from sqlalchemy import Enum, inspect
+from sqlalchemy.orm import defer
+
+from app.models.serializer import Serializer, converter_for, enum_value
+
+
+def test_to_dict_serializes_loaded_columns_only(app, create_course):
+    from app.models.cohort import Cohort
+    with app.test_request_context():
+        app.preprocess_request()
+        cohort = Cohort(name="Cohort-1", course_id=create_course["id"], start_date=date.today())
+        cohort.refresh()
+        cohort.course  # load the relationship
+
+        cohort_dict = cohort.to_dict()
+
+        assert "course" not in cohort_dict
+        assert "_sa_instance_state" not in cohort_dict
+        assert cohort_dict["name"] == "Cohort-1"
+        assert cohort_dict["start_date"] == date.today()
+        assert isinstance(cohort_dict["created_at"], datetime)
+
+def test_to_dict_include_and_exclude(app, create_course):
+    from app.models.course import Course
+    with app.test_request_context():
+        app.preprocess_request()
+        course = Course.search(id=create_course["id"])
+
+        assert set(course.to_dict(include={"id", "title"})) == {"id", "title"}
+        assert "title" not in course.to_dict(exclude=["title"])
+        assert course.to_dict(include={"id", "title"}, exclude={"title"}) == {"id": course.id}
+
+def test_to_dict_never_loads_deferred_columns(app, create_projects):
+    from app.models.project import AdminProject
+    from tests.utils import count_statements
+    with app.test_request_context():
+        app.preprocess_request()
+        projects = AdminProject.fetch(defer(AdminProject.markdown_content))
+
+        with count_statements() as statements:
+            dicts = [project.to_dict() for project in projects]
+
+        assert statements == []
+        assert all("markdown_content" not in project for project in dicts)
+
+def test_enum_columns_with_an_enum_class_are_converted():
+    class Level(enum.Enum):
+        WOOD = "wood"
+
+    assert converter_for(Enum(Level)) is enum_value
+    assert converter_for(Enum("wood", "gold")) is None
+    assert enum_value(Level.WOOD) == "wood"
+
+def test_serializer_follows_the_mapper_columns():
+    from app.models.course import Course
+    assert [key for key, _ in Serializer(Course).fields] == [attr.key for attr in inspect(Course).column_attrs]
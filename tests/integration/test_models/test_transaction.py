@@ -0,0 +1,99 @@
+"""
+Test cases for DBStorage.transaction and row locking
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql
+
+from tests.integration.test_models.test_ordering import create_admin_project, linked_ids
+
+
+@contextmanager
+def count_commits():
+    from app.models import storage
+    commits = []
+    listener = lambda conn: commits.append(conn)
+    event.listen(storage.engine, "commit", listener)
+    try:
+        yield commits
+    finally:
+        event.remove(storage.engine, "commit", listener)
+
+def test_insert_commits_once(app, admin, create_module):
+    with app.test_request_context():
+        app.preprocess_request()
+        course, module = create_module
+        p1 = create_admin_project(admin, course, module)
+        p2 = create_admin_project(admin, course, module, prev_project_id=p1)
+
+        with count_commits() as commits:
+            p3 = create_admin_project(admin, course, module, prev_project_id=p1)
+
+        assert len(commits) == 1
+        assert linked_ids(course["id"]) == [p1, p3, p2]
+
+def test_failed_insert_is_rolled_back(app, admin, create_module):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.project import AdminProject
+        from app.utils.error_extensions import NotFound
+        course, module = create_module
+        p1 = create_admin_project(admin, course, module)
+
+        with pytest.raises(NotFound):
+            create_admin_project(admin, course, module, prev_project_id="missing-project")
+
+        assert AdminProject.count(course_id=course["id"]) == 1
+        assert linked_ids(course["id"]) == [p1]
+
+def test_nested_transactions_commit_once(app, admin, create_module):
+    with app.test_request_context():
+        app.preprocess_request()
+        from flask import g
+        from app.models.project import AdminProject
+        course, module = create_module
+        p1 = create_admin_project(admin, course, module)
+        p2 = create_admin_project(admin, course, module, prev_project_id=p1)
+        p3 = create_admin_project(admin, course, module, prev_project_id=p2)
+
+        with count_commits() as commits:
+            with g.db_storage.transaction():
+                project = AdminProject.search(id=p3)
+                project.update(prev_project_id=None)
+                project.save()
+                with g.db_storage.transaction():
+                    project = AdminProject.search(id=p1)
+                    project.update(prev_project_id=p2)
+                    project.save()
+                assert commits == []
+
+        assert len(commits) == 1
+        assert linked_ids(course["id"]) == [p3, p2, p1]
+
+def test_exception_rolls_back_the_whole_block(app, admin, create_module):
+    with app.test_request_context():
+        app.preprocess_request()
+        from flask import g
+        from app.models.project import AdminProject
+        course, module = create_module
+        p1 = create_admin_project(admin, course, module)
+        p2 = create_admin_project(admin, course, module, prev_project_id=p1)
+
+        with pytest.raises(RuntimeError):
+            with g.db_storage.transaction():
+                project = AdminProject.search(id=p2)
+                project.update(prev_project_id=None)
+                project.save()
+                raise RuntimeError("abort")
+
+        assert linked_ids(course["id"]) == [p1, p2]
+
+def test_for_update_locks_rows(app):
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.project import AdminProject
+        stmt = AdminProject.query().filter(course_id="course-id").for_update().statement()
+
+        assert "FOR UPDATE" in str(stmt.compile(dialect=mysql.dialect()))
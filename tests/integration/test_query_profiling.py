@@ -0,0 +1,67 @@
+"""
+Test cases for the per request SQL instrumentation
+"""
+from app.utils.query_profiler import fingerprint
+
+
+def create_courses(app, count):
+    from app.models.course import Course
+    with app.test_request_context():
+        app.preprocess_request()
+        for i in range(count):
+            Course(title=f"Course {i}", status="published",
+                communication_channel="https://discord.com/invite").save()
+
+def test_fingerprint_ignores_parameter_values():
+    first = fingerprint("SELECT * FROM cohorts WHERE cohorts.id = %(id_1)s AND status = 'pending'")
+    second = fingerprint("SELECT *\n  FROM cohorts WHERE cohorts.id = %(id_1)s AND status = 'completed'")
+    assert first == second
+
+def test_fingerprint_collapses_in_lists():
+    first = fingerprint("SELECT * FROM students WHERE students.id IN (%(id_1_1)s, %(id_1_2)s)")
+    second = fingerprint("SELECT * FROM students WHERE students.id IN (%(id_1_1)s)")
+    assert first == second
+
+def test_profiling_disabled_by_default(app, client):
+    create_courses(app, 1)
+    response = client.get("/api/v1/course/all")
+
+    assert response.status_code == 200
+    assert "X-DB-Query-Count" not in response.headers
+
+def test_profiling_headers(app, client):
+    app.config["DB_QUERY_PROFILING"] = True
+    create_courses(app, 1)
+    response = client.get("/api/v1/course/all")
+
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Query-Count"]) > 0
+    assert float(response.headers["X-DB-Time-Ms"]) >= 0
+    assert response.headers["X-DB-N-Plus-One"] == "0"
+
+def test_profiling_logs_clean_requests(app, client, caplog):
+    app.config["DB_QUERY_PROFILING"] = True
+    create_courses(app, 1)
+    response = client.get("/api/v1/course/all")
+
+    assert response.status_code == 200
+    lines = [record for record in caplog.records if '"path": "/api/v1/course/all"' in record.getMessage()]
+    assert len(lines) == 1 and lines[0].levelname == "INFO"
+
+def test_profiling_flags_n_plus_one(app, client, caplog):
+    from app.models.course import Course
+
+    @app.route("/test/n-plus-one")
+    def n_plus_one():
+        for course in Course.all():
+            Course.search(id=course.id)
+        return "ok"
+
+    app.config["DB_QUERY_PROFILING"] = True
+    app.config["DB_N_PLUS_ONE_THRESHOLD"] = 2
+    create_courses(app, 4)
+    response = client.get("/test/n-plus-one")
+
+    assert response.status_code == 200
+    assert response.headers["X-DB-N-Plus-One"] == "1"
+    assert any('"n_plus_one": [{' in record.getMessage() for record in caplog.records)
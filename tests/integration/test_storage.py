@@ -0,0 +1,51 @@
+"""
+Test cases for the lazy, fork safe storage in app.models
+"""
+import os
+
+import pytest
+from sqlalchemy import text
+
+
+def test_storage_is_built_on_first_use():
+    from app.models import LazyStorage
+    storage = LazyStorage()
+
+    assert storage.loaded is False
+    assert storage.engine is not None
+    assert storage.loaded is True
+
+def test_after_fork_forgets_inherited_connections(app):
+    from app.models import storage
+    with storage.engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert storage.engine.pool.checkedin() >= 1
+
+    storage.after_fork()
+
+    assert storage.engine.pool.checkedin() == 0
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.course import Course
+        assert Course.count() == 0
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_opens_its_own_connections(app):
+    from app.models import storage
+    with storage.engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    parent_connections = storage.engine.pool.checkedin()
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            ok = storage.engine.pool.checkedin() == 0
+            with storage.engine.connect() as connection:
+                ok = ok and connection.execute(text("SELECT 1")).scalar() == 1
+        finally:
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert storage.engine.pool.checkedin() == parent_connections
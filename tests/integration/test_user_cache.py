@@ -0,0 +1,122 @@
+"""
+Test cases for the cached JWT user lookup
+"""
+import pytest
+
+from tests.utils import count_statements
+
+
+def user_selects(statements, table):
+    return [s for s in statements if s.lstrip().upper().startswith("SELECT") and f"FROM {table}" in s]
+
+@pytest.fixture
+def empty_user_cache():
+    from app.utils import user_cache
+    user_cache._users.clear()
+    yield
+    user_cache._users.clear()
+
+def login_headers(auth, student):
+    auth_r = auth.login(student.username, "test_password", "student")
+    return {"Authorization": f"Bearer {auth_r.json['data']['access_token']}"}
+
+def test_user_is_loaded_once_per_request(app, client, student, auth, empty_user_cache):
+    headers = login_headers(auth, student)
+    with count_statements() as statements:
+        response = client.get("/api/v1/student/count/completed", headers=headers)
+
+    assert response.status_code == 200
+    assert len(user_selects(statements, "students")) == 1
+
+def test_user_is_served_from_process_cache(app, client, student, auth, empty_user_cache):
+    app.config["USER_CACHE_TTL"] = 60
+    headers = login_headers(auth, student)
+    client.get("/api/v1/student/count/completed", headers=headers)
+
+    with count_statements() as statements:
+        response = client.get("/api/v1/student/count/completed", headers=headers)
+
+    assert response.status_code == 200
+    # only the token version is read, not the user row
+    selects = user_selects(statements, "students")
+    assert len(selects) == 1
+    assert "token_version" in selects[0] and "password" not in selects[0]
+
+def test_revocation_in_another_worker_is_seen(app, client, student, auth, empty_user_cache):
+    from sqlalchemy import text
+    from app.models import storage
+    app.config["USER_CACHE_TTL"] = 60
+    headers = login_headers(auth, student)
+    assert client.get("/api/v1/student/count/completed", headers=headers).status_code == 200
+
+    # another worker revokes the tokens: this process' cache is not told
+    with storage.engine.begin() as connection:
+        connection.execute(text("UPDATE students SET token_version = token_version + 1 WHERE id = :id"),
+                           {"id": student.id})
+
+    assert client.get("/api/v1/student/count/completed", headers=headers).status_code == 401
+    assert client.get("/api/v1/student/count/completed",
+                      headers=login_headers(auth, student)).status_code == 200
+
+def test_saving_a_user_invalidates_the_cache(app, client, student, auth, empty_user_cache):
+    app.config["USER_CACHE_TTL"] = 60
+    headers = login_headers(auth, student)
+    student_id = student.id
+    client.get("/api/v1/auth/basic_user_details", headers=headers)
+
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models.user import Student
+        user = Student.search(id=student_id)
+        user.update(first_name="Renamed")
+        user.save()
+
+    with count_statements() as statements:
+        response = client.get("/api/v1/auth/basic_user_details", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json["data"]["first_name"] == "Renamed"
+    assert len(user_selects(statements, "students")) == 1
+
+def test_expired_entries_are_reloaded(app, client, student, auth, empty_user_cache):
+    from app.utils import user_cache
+    app.config["USER_CACHE_TTL"] = 60
+    headers = login_headers(auth, student)
+    client.get("/api/v1/student/count/completed", headers=headers)
+    for key, (expires, values) in list(user_cache._users.items()):
+        user_cache._users[key] = (0, values)
+
+    with count_statements() as statements:
+        response = client.get("/api/v1/student/count/completed", headers=headers)
+
+    assert response.status_code == 200
+    assert len(user_selects(statements, "students")) == 1
+
+def test_cache_is_only_invalidated_by_a_commit(app, client, student, auth, empty_user_cache):
+    from app.utils import user_cache
+    app.config["USER_CACHE_TTL"] = 60
+    headers = login_headers(auth, student)
+    student_id = student.id
+    client.get("/api/v1/auth/basic_user_details", headers=headers)
+    key = ("student", student_id)
+
+    with app.test_request_context():
+        app.preprocess_request()
+        from app.models import storage
+        from app.models.user import Student
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                user = Student.search(id=student_id)
+                user.update(first_name="Renamed")
+                user.save()
+                # flushed only, other requests must not reload it yet
+                assert key in user_cache._users
+                raise RuntimeError("rolled back")
+        assert key in user_cache._users
+
+        with storage.transaction():
+            user = Student.search(id=student_id)
+            user.update(first_name="Renamed")
+            user.save()
+            assert key in user_cache._users
+        assert key not in user_cache._users
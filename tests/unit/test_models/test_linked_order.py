@@ -0,0 +1,114 @@
+"""
+Property based tests for app.models.ordering.order_linked
+and the position reads of PositionMixin
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from hypothesis import given, strategies as st
+
+from app.models.ordering import PositionMixin, order_linked
+
+
+@dataclass
+class Node:
+    id: str
+    prev_id: str = None
+    next_id: str = None
+    created_at: datetime = None
+    position: int = None
+
+
+class Positioned(PositionMixin):
+    @staticmethod
+    def sort_linked(nodes):
+        return order_linked(nodes, "prev_id", "next_id").nodes
+
+
+def make_chain(count):
+    base = datetime(2025, 1, 1)
+    nodes = [Node(id=f"n{i}", created_at=base + timedelta(minutes=i)) for i in range(count)]
+    for prev, node in zip(nodes, nodes[1:]):
+        prev.next_id = node.id
+        node.prev_id = prev.id
+    return nodes
+
+def ids(nodes):
+    return [node.id for node in nodes]
+
+
+@given(st.integers(min_value=1, max_value=60).flatmap(
+    lambda n: st.permutations(make_chain(n))))
+def test_any_permutation_of_a_chain_is_restored(shuffled):
+    expected = sorted(ids(shuffled), key=lambda node_id: int(node_id[1:]))
+    result = order_linked(shuffled, "prev_id", "next_id")
+
+    assert ids(result.nodes) == expected
+    assert result.orphans == []
+    assert result.has_cycle is False
+
+@given(st.data())
+def test_random_pointers_return_every_node_once_deterministically(data):
+    count = data.draw(st.integers(min_value=1, max_value=40))
+    nodes = make_chain(count)
+    pool = ids(nodes) + [None, "missing"]
+    for node in nodes:
+        node.prev_id = data.draw(st.sampled_from(pool))
+        node.next_id = data.draw(st.sampled_from(pool))
+    shuffled = data.draw(st.permutations(nodes))
+
+    result = order_linked(nodes, "prev_id", "next_id")
+
+    assert sorted(ids(result.nodes)) == sorted(ids(nodes))
+    assert ids(order_linked(shuffled, "prev_id", "next_id").nodes) == ids(result.nodes)
+    assert set(ids(result.orphans)) <= set(ids(result.nodes))
+
+@given(st.integers(min_value=2, max_value=40), st.data())
+def test_cycles_are_detected(count, data):
+    nodes = make_chain(count)
+    back_to = data.draw(st.integers(min_value=0, max_value=count - 1))
+    nodes[-1].next_id = nodes[back_to].id
+    if back_to == 0:
+        nodes[0].prev_id = nodes[-1].id
+
+    result = order_linked(data.draw(st.permutations(nodes)), "prev_id", "next_id")
+
+    assert result.has_cycle is True
+    assert sorted(ids(result.nodes)) == sorted(ids(nodes))
+
+@given(st.integers(min_value=3, max_value=40), st.data())
+def test_broken_chain_appends_orphans(count, data):
+    nodes = make_chain(count)
+    cut = data.draw(st.integers(min_value=1, max_value=count - 1))
+    nodes[cut - 1].next_id = None
+    nodes[cut].prev_id = "deleted-project"
+
+    result = order_linked(data.draw(st.permutations(nodes)), "prev_id", "next_id")
+
+    assert ids(result.nodes) == ids(nodes)
+    assert ids(result.orphans) == ids(nodes[cut:])
+    assert result.has_cycle is False
+
+@given(st.integers(min_value=1, max_value=40).flatmap(
+    lambda n: st.permutations(make_chain(n))))
+def test_positions_decide_the_order_over_the_pointers(shuffled):
+    # positions run against the pointers, as after a reorder
+    for node in shuffled:
+        node.position = -int(node.id[1:])
+    expected = sorted(ids(shuffled), key=lambda node_id: -int(node_id[1:]))
+
+    assert ids(Positioned.in_order(shuffled)) == expected
+    assert Positioned.head_of(shuffled).id == expected[0]
+    assert Positioned.tail_of(shuffled).id == expected[-1]
+
+@given(st.integers(min_value=2, max_value=40).flatmap(
+    lambda n: st.permutations(make_chain(n))))
+def test_rows_without_a_position_fall_back_to_the_pointers(shuffled):
+    for node in shuffled[1:]:
+        node.position = -int(node.id[1:])
+    expected = sorted(ids(shuffled), key=lambda node_id: int(node_id[1:]))
+
+    assert ids(Positioned.in_order(shuffled)) == expected
+    assert Positioned.head_of(shuffled).id == expected[0]
+    assert Positioned.tail_of(shuffled).id == expected[-1]
+    assert Positioned.head_of([]) is None
@@ -0,0 +1,27 @@
+"""
+Test cases for the declaration of response schemas
+"""
+import pytest
+
+from app.models.project import AdminProject
+from app.models.user import Mentor
+from app.utils.schemas import ResponseSchema
+
+
+def test_sensitive_columns_are_never_part_of_a_schema():
+    schema = ResponseSchema(Mentor)
+    assert "password" not in schema.fields
+    assert "password" not in schema.default
+    with pytest.raises(ValueError):
+        ResponseSchema(Mentor, default={"id", "password"})
+    with pytest.raises(ValueError):
+        ResponseSchema(Mentor, load={"password"})
+
+def test_excluded_columns_stay_allowed():
+    schema = ResponseSchema(AdminProject, exclude={"markdown_content"})
+    assert "markdown_content" in schema.fields
+    assert "markdown_content" not in schema.default
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(ValueError):
+        ResponseSchema(AdminProject, fields={"id", "author"})
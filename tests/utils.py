@@ -1,5 +1,8 @@
+from contextlib import contextmanager
 from datetime import date, timedelta
 
+from sqlalchemy import event
+
 def create_user(client, data):
     return client.post("/api/v1/auth/register", json=data)
 
@@ -64,4 +67,118 @@ def assign_mentor_to_cohorts(mentor: dict, cohorts: list[dict]) -> None:
     mentor = Mentor.search(id=mentor["id"])
     for cohort in cohorts:
         if not Cohort.search(id=cohort["id"]): continue
-        MentorCohort(mentor_id=mentor.id, cohort_id=cohort["id"]).save()
\ No newline at end of file
+        MentorCohort(mentor_id=mentor.id, cohort_id=cohort["id"]).save()
+
+def create_modules_with_projects(student, admin, modules_count, projects_per_module, submitted=1):
+    """Create published modules, each with released cohort projects for the
+    student's cohort. The student submits the first `submitted` projects of every module.
+    """
+    from app.models.module import Module
+    from app.models.project import AdminProject, CohortProject, StudentProject
+    for i in range(modules_count):
+        module = Module(title=f"Module {i}", course_id=student.course_id, status="published")
+        module.save()
+        module.refresh()
+        for j in range(projects_per_module):
+            admin_project = AdminProject(title=f"Project {i}-{j}", module_id=module.id,
+                author_id=admin.id, course_id=student.course_id, fa_duration=2,
+                sa_duration=1, release_range=3, status="published")
+            admin_project.refresh()
+            cohort_project = CohortProject(title=f"Project {i}-{j}", module_id=module.id,
+                author_id=admin.id, course_id=student.course_id, cohort_id=student.cohort_id,
+                project_pool_id=admin_project.id, status="released",
+                fa_start_date=date.today(), sa_start_date=date.today() + timedelta(days=2),
+                end_date=date.today() + timedelta(days=3))
+            cohort_project.refresh()
+            if j < submitted:
+                StudentProject(cohort_id=student.cohort_id, student_id=student.id,
+                    cohort_project_id=cohort_project.id, status="graded").save()
+
+@contextmanager
+def count_statements():
+    """Collect every SQL statement sent to the database inside the block"""
+    from app.models import storage
+    engine = storage.engine
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def full_table_scans(statement) -> list:
+    """
+        EXPLAIN `statement` and return the tables it reads with a
+        full table scan. Supports
+        MySQL (access type ALL, even when an index was available)
+        and SQLite (a SCAN step that uses no index). The calling
+        test is skipped on other databases.
+    """
+    import pytest
+    from app.models import storage
+    engine = storage.engine
+    sql = statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+
+    with engine.connect() as conn:
+        if engine.dialect.name == "mysql":
+            rows = conn.exec_driver_sql(f"EXPLAIN {sql}").mappings().all()
+            scanned = [row["table"] for row in rows if row["type"] == "ALL"]
+        elif engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+            details = [row[-1] for row in rows]
+            scanned = [detail.split()[1] for detail in details
+                       if detail.startswith("SCAN") and "USING" not in detail]
+        else:
+            pytest.skip(f"EXPLAIN is not supported for {engine.dialect.name}")
+    return scanned
+
+@contextmanager
+def stub_http_server(statuses=()):
+    """
+        Serve HTTP/1.1 with keep-alive on a free local port. Each POST
+        is answered with the next status of `statuses` (200 once they
+        run out) and recorded as (path, json body, client port) in
+        server.requests. Yields the server, its URL is server.url.
+    """
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    pending = list(statuses)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with lock:
+                server.requests.append((self.path, json.loads(body or b"null"), self.client_address[1]))
+                status = pending.pop(0) if pending else 200
+            data = json.dumps({"data": [{"code": "EM_104", "message": "Email request received"}]
+                               if status < 300 else [], "status": status}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    lock = threading.Lock()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()